@@ -1,43 +1,696 @@
-from ordered_set import OrderedSet
 from collections import OrderedDict
 from collections import defaultdict
+from collections import Counter
+from collections import deque
+from functools import reduce
+from operator import and_, itemgetter, or_
+from collections.abc import Mapping, Sequence
+from array import array
+from datetime import datetime
+import argparse
+import contextlib
 import csv
+import hashlib
+import heapq
+import io
+import json
+import locale
+import mmap
+from itertools import combinations, islice, repeat
+import os
+import pickle
+import re
+import threading
+import time
 
 import sys
 
-def parse_dataset(file_path):
+DEFAULT_BATCH_SIZE = 10000
+# Files written into each output directory; every CREATE TABLE batch is appended to the query file
+QUERY_OUTPUT_PATH = "query.txt"
+PARSED_OUTPUT_PATH = "outputl.txt"
+# Decomposed table names: "key" (key columns), "attributes" (all columns) or "numbered", after an optional prefix
+TABLE_NAMING = "key"
+TABLE_PREFIX = ""
+# Pool size for FD validation (None uses every CPU), the rows that make the pool worth starting,
+# and attempts added per failed batch job
+VALIDATION_WORKERS = None
+PARALLEL_VALIDATION_ROWS = 500000
+BATCH_RETRIES = 1
+# Distinct row keys a projection may hold in memory before it spills to disk
+PROJECTION_MEMORY_KEYS = 5000000
+# Values inspected per column by the type profiler (None inspects every distinct value)
+PROFILE_SAMPLE_SIZE = None
+# Decomposed table data: "insert", "copy" (PostgreSQL) or "csv", and rows per INSERT statement
+DATA_OUTPUT_PATH = "data.sql"
+DATA_FORMAT = "insert"
+INSERT_BATCH_SIZE = 1000
+WRITE_BUFFER_SIZE = 1 << 20
+# SQLite database the decomposed schema is loaded into (None skips the load) and rows per transaction
+SQLITE_OUTPUT_PATH = None
+SQLITE_TRANSACTION_ROWS = 100000
+# Machine-readable lossless-join / dependency-preservation report for each decomposition
+VERIFICATION_REPORT_PATH = "verification.json"
+# Widest table whose projected FDs are searched exactly; wider ones use the polynomial Tsou-Fischer split
+BCNF_EXACT_ATTRIBUTES = 12
+# Optional join dependencies for 5NF, one per line as "A, B | B, C | A, C" (ternary ones are always tried)
+JOIN_DEPENDENCIES_PATH = "jd.txt"
+# Memory bound of the service's analysis cache
+SERVICE_CACHE_BYTES = 64 << 20
+# Analysis state kept in the output directory between incremental runs
+INCREMENTAL_STATE_PATH = "state.pickle"
+# Where --benchmark writes its results
+BENCHMARK_OUTPUT_PATH = "benchmark.json"
+# Processes parse_dataset splits a large CSV across (None uses every CPU), and the size that makes it worth it
+PARSE_WORKERS = None
+PARALLEL_PARSE_BYTES = 64 << 20
+# Upper bound on the bytes one parse worker decodes at a time
+PARSE_CHUNK_BYTES = 64 << 20
+# Where --cache keeps parse results across invocations and how many entries it keeps
+PARSE_CACHE_DIR = os.environ.get('PARSER_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'parser-projectf')
+PARSE_CACHE_ENTRIES = 1000
+# Largest left-hand side FD discovery looks for unless told otherwise
+DISCOVERY_MAX_LHS = 3
+# Per-stage run report and cProfile output written by --report and --profile
+RUN_REPORT_PATH = "report.json"
+PROFILE_OUTPUT_PATH = "profile.pstats"
+
+class EncodedColumn(Sequence):
+    """
+    A column stored as an array of integer codes into a dictionary of its distinct values.
+
+    Low-cardinality columns then cost four bytes per row plus one string per
+    distinct value, and anything that only depends on the values (type
+    sniffing, atomicity checks) can look at the dictionary instead of every row.
+    """
+    __slots__ = ('codes', 'dictionary', 'lookup', 'profile')
+
+    def __init__(self, values=()):
+        self.codes = array('I')
+        self.dictionary = []
+        self.lookup = {}
+        self.profile = None
+        self.extend(values)
+
+    @classmethod
+    def from_codes(cls, codes, parent):
+        """
+        Build a column from new codes that index into the dictionary of parent (shared, not copied).
+        """
+        column = cls.__new__(cls)
+        column.codes = codes
+        column.dictionary = parent.dictionary
+        column.lookup = parent.lookup
+        column.profile = parent.profile
+        return column
+
+    def extend(self, values):
+        codes = self.codes
+        dictionary = self.dictionary
+        lookup = self.lookup
+        distinct = len(dictionary)
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(dictionary)
+                dictionary.append(value)
+            codes.append(code)
+        if len(dictionary) != distinct:
+            # New values may widen the column type
+            self.profile = None
+
+    def append(self, value):
+        self.extend((value,))
+
+    @property
+    def cardinality(self):
+        return len(self.dictionary)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.dictionary[code] for code in self.codes[index]]
+        return self.dictionary[self.codes[index]]
+
+    def __iter__(self):
+        return map(self.dictionary.__getitem__, self.codes)
+
+    def __repr__(self):
+        return f"EncodedColumn({len(self)} rows, {self.cardinality} distinct)"
+
+
+class ColumnStore(Mapping):
+    """
+    A parsed table: column names mapped to EncodedColumn objects.
+
+    It reads like the dict of lists parse_dataset used to return. Projections
+    share the parent's column objects instead of copying them.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = OrderedDict(columns or ())
+
+    @classmethod
+    def from_batches(cls, batches):
+        store = cls()
+        for batch in batches:
+            for column, values in batch.items():
+                if column not in store.columns:
+                    store.columns[column] = EncodedColumn()
+                store.columns[column].extend(values)
+        return store
+
+    @property
+    def row_count(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def project(self, attributes):
+        """
+        Return a zero-copy view of the given columns.
+        """
+        return ColumnStore((attr, self.columns[attr]) for attr in attributes)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return f"ColumnStore({self.row_count} rows: {', '.join(self.columns)})"
+
+
+def distinct_values(values):
+    """
+    Return the distinct values of a column, read straight from the dictionary when it is encoded.
+    """
+    if isinstance(values, EncodedColumn):
+        return values.dictionary
+    return set(values)
+
+def project_distinct(dataset, attributes, max_keys=PROJECTION_MEMORY_KEYS):
     """
-    Parse the input dataset (CSV file) and store it in a Python dictionary.
+    Project a table onto some attributes and eliminate duplicate rows.
+
+    Rows are deduplicated in one pass by hashing their encoded keys. When more
+    than max_keys distinct keys turn up, the row numbers are hash-partitioned
+    into temporary files and each partition is deduplicated on its own, so
+    the hash set never holds much more than max_keys entries. Either way the
+    output keeps the first occurrence of each row, in input order.
+
+    Args:
+        dataset (ColumnStore or dict): The parent table.
+        attributes (list): The columns to keep.
+        max_keys (int): The in-memory limit on distinct keys.
+
+    Returns:
+        ColumnStore: The distinct rows, with dictionaries shared with the parent.
+    """
+    if not isinstance(dataset, ColumnStore):
+        dataset = ColumnStore.from_batches([{attr: dataset[attr] for attr in attributes}])
+    parents = [dataset[attr] for attr in attributes]
+    codes = [parent.codes for parent in parents]
+    keys = codes[0] if len(codes) == 1 else zip(*codes)
+
+    seen = set()
+    kept = array('Q')
+    for row, key in enumerate(keys):
+        if key not in seen:
+            seen.add(key)
+            kept.append(row)
+            if len(seen) > max_keys:
+                break
+    else:
+        return _gather_rows(attributes, parents, kept)
+
+    # Release the in-memory key set before spilling
+    seen = None
+    return _gather_rows(attributes, parents, heapq.merge(*_deduplicate_partitions(codes, dataset.row_count, max_keys)))
+
+def _deduplicate_partitions(codes, row_count, max_keys):
+    """
+    Spill row numbers to hash-partitioned temporary files and deduplicate each partition.
+
+    Returns:
+        list: One ascending array of first-occurrence row numbers per partition.
+    """
+    partitions = min(256, max(2, -(-row_count // max_keys)))
+    row_key = (lambda row: codes[0][row]) if len(codes) == 1 else (lambda row: tuple(column[row] for column in codes))
+    kept = []
+    import tempfile
+    with tempfile.TemporaryDirectory(prefix='projection-') as spill_dir:
+        paths = [os.path.join(spill_dir, f'{i}.bin') for i in range(partitions)]
+        files = [open(path, 'wb') for path in paths]
+        buffers = [array('Q') for _ in range(partitions)]
+        try:
+            for row in range(row_count):
+                partition = hash(row_key(row)) % partitions
+                buffer = buffers[partition]
+                buffer.append(row)
+                if len(buffer) >= 65536:
+                    buffer.tofile(files[partition])
+                    del buffer[:]
+            for file, buffer in zip(files, buffers):
+                buffer.tofile(file)
+        finally:
+            for file in files:
+                file.close()
+
+        for path in paths:
+            rows = array('Q')
+            with open(path, 'rb') as file:
+                rows.frombytes(file.read())
+            seen = set()
+            first_rows = array('Q')
+            for row in rows:
+                key = row_key(row)
+                if key not in seen:
+                    seen.add(key)
+                    first_rows.append(row)
+            kept.append(first_rows)
+    return kept
+
+def _gather_rows(attributes, parents, rows):
+    """
+    Build a ColumnStore from the given row numbers of the parent columns.
+    """
+    codes = [array('I') for _ in parents]
+    parent_codes = [parent.codes for parent in parents]
+    for row in rows:
+        for column, parent in zip(codes, parent_codes):
+            column.append(parent[row])
+    return ColumnStore((attr, EncodedColumn.from_codes(column, parent))
+                       for attr, column, parent in zip(attributes, codes, parents))
+
+def parse_dataset(file_path, workers=PARSE_WORKERS):
+    """
+    Parse the input dataset (CSV file) into a dictionary-encoded column store.
+
+    Files of at least PARALLEL_PARSE_BYTES are parsed by parse_dataset_parallel
+    when more than one worker is available; the result is the same either way.
+    The store is filled batch by batch, so memory grows with the distinct
+    values rather than the raw text, but the whole table is held: every code
+    takes four bytes. scan_dataset checks a file of any size in bounded
+    memory instead.
 
     Args:
         file_path (str): The path to the CSV file containing the dataset.
+        workers (int): Parse processes (defaults to the CPU count); 1 always reads serially.
 
     Returns:
-        dict: A dictionary where keys are column names and values are lists of data.
+        ColumnStore: A mapping where keys are column names and values are encoded columns.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and os.path.isfile(file_path) and os.path.getsize(file_path) >= PARALLEL_PARSE_BYTES:
+        return parse_dataset_parallel(file_path, workers)
+    return ColumnStore.from_batches(stream_dataset(file_path))
+
+def _count_quotes(file_path, start, end):
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return mapped[start:end].count(b'"')
+
+def _record_end(mapped, position, odd, end):
+    """
+    Find the first newline at or after position that ends a record, given the quote parity at position.
+
+    A newline inside a quoted field follows an odd number of quotes; doubled
+    quotes inside a field cancel out, so parity alone tells the two apart.
+
+    Returns:
+        int: The offset just past that newline, or end when there is none.
+    """
+    while True:
+        newline = mapped.find(b'\n', position, end)
+        if newline < 0:
+            return end
+        odd ^= mapped[position:newline].count(b'"') & 1
+        if not odd:
+            return newline + 1
+        position = newline + 1
+
+def _parse_chunk(file_path, start, end, positions, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Parse the records in bytes [start, end) of a CSV file into chunk-local encoded columns.
+
+    Returns:
+        list: One (dictionary, codes) pair per column in positions.
+    """
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # Decode like open() does, so values match the serial reader
+        text = mapped[start:end].decode(locale.getpreferredencoding(False))
+    width = max(positions) + 1 if positions else 0
+    columns = [EncodedColumn() for _ in positions]
+    batch = [[] for _ in positions]
+    for row in csv.reader(io.StringIO(text, newline='')):
+        if not row:
+            continue
+        if len(row) < width:
+            row += [''] * (width - len(row))
+        for values, position in zip(batch, positions):
+            values.append(row[position])
+        if len(batch[0]) >= batch_size:
+            for column, values in zip(columns, batch):
+                column.extend(values)
+            batch = [[] for _ in positions]
+    for column, values in zip(columns, batch):
+        column.extend(values)
+    return [(column.dictionary, column.codes) for column in columns]
+
+def parse_dataset_parallel(file_path, workers=None, chunk_bytes=PARSE_CHUNK_BYTES):
+    """
+    Parse a large CSV file on a process pool, with the same result as the serial reader.
+
+    The file is memory-mapped and cut into chunks at record boundaries: the
+    workers first count the quotes in each nominal chunk, which gives the
+    quote parity at every cut, and each cut is then moved to the next newline
+    outside a quoted field. The workers parse their chunks into chunk-local
+    dictionaries; the chunks are merged in file order, so the global
+    dictionaries and the rows come out in the serial reader's order. Like
+    the csv module's default dialect, the split assumes quotes only appear
+    around fields or doubled inside them.
+
+    Args:
+        file_path (str): The path to the CSV file containing the dataset.
+        workers (int): Pool size (defaults to the CPU count).
+        chunk_bytes (int): The largest chunk one worker decodes at a time.
+
+    Returns:
+        ColumnStore: A mapping where keys are column names and values are encoded columns.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        header_end = _record_end(mapped, 0, 0, size)
+        columns = next(csv.reader(io.StringIO(mapped[:header_end].decode(locale.getpreferredencoding(False)),
+                                              newline='')), [])
+        # Repeated column names keep the last column, as dict(zip(columns, values)) does
+        positions = {name: position for position, name in enumerate(columns)}
+        store = ColumnStore((name, EncodedColumn()) for name in positions)
+        if header_end >= size or not positions:
+            return store
+
+        count = max(workers * 4, -(-(size - header_end) // chunk_bytes))
+        cuts = [header_end + (size - header_end) * i // count for i in range(count + 1)]
+        with ProcessPoolExecutor(workers) as pool:
+            quotes = list(pool.map(_count_quotes, repeat(file_path), cuts[:-1], cuts[1:]))
+            bounds = [header_end]
+            odd = 0
+            for cut, quote_count in zip(cuts[1:-1], quotes):
+                odd ^= quote_count & 1
+                if cut > bounds[-1]:
+                    bounds.append(_record_end(mapped, cut, odd, size))
+            bounds.append(size)
+            bounds = sorted(set(bounds))
+            chunks = pool.map(_parse_chunk, repeat(file_path), bounds[:-1], bounds[1:],
+                              repeat(list(positions.values())))
+
+            for chunk in chunks:
+                for column, (dictionary, codes) in zip(store.columns.values(), chunk):
+                    lookup, merged = column.lookup, column.dictionary
+                    remap = []
+                    for value in dictionary:
+                        code = lookup.get(value)
+                        if code is None:
+                            code = lookup[value] = len(merged)
+                            merged.append(value)
+                        remap.append(code)
+                    if all(code == local for local, code in enumerate(remap)):
+                        column.codes.extend(codes)
+                    else:
+                        column.codes.extend(array('I', map(remap.__getitem__, codes)))
+    return store
+
+def stream_dataset(file_path, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Read the input dataset (CSV file) as a stream of fixed-size column batches.
+
+    Only one batch is held in memory at a time, so files larger than RAM can
+    be scanned. Blank lines are skipped, as csv.DictReader skips them; a
+    row of empty fields (",") is a row of empty values. A header-only file
+    yields a single empty batch so callers still see the column names.
+
+    Args:
+        file_path (str): The path to the CSV file containing the dataset.
+        batch_size (int): The maximum number of rows per batch.
+
+    Yields:
+        dict: Column names mapped to lists of at most batch_size values.
     """
-    dataset = {}
-    
     try:
         with open(file_path, 'r', newline='') as file:
-            csv_reader = csv.DictReader(file)
-            
-            # Get the column names from the first row of the CSV
-            columns = csv_reader.fieldnames
-            
-            for column in columns:
-                dataset[column] = []
-            
+            csv_reader = csv.reader(file)
+            columns = next(csv_reader, [])
+            width = len(columns)
+            batch = [[] for _ in columns]
+            emitted = False
             for row in csv_reader:
-                for column, value in row.items():
-                    dataset[column].append(value)
-    
+                if not row:
+                    continue
+                if len(row) < width:
+                    row += [''] * (width - len(row))
+                for values, value in zip(batch, row):
+                    values.append(value)
+                if width and len(batch[0]) >= batch_size:
+                    yield dict(zip(columns, batch))
+                    emitted = True
+                    batch = [[] for _ in columns]
+            if (width and batch[0]) or not emitted:
+                yield dict(zip(columns, batch))
+
     except FileNotFoundError:
         print("Error: File not found.")
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
-    return dataset
+def file_fingerprint(file_path, block_size=65536):
+    """
+    Identify a file's contents cheaply: its size and mtime plus hashes of its first and last blocks.
+    """
+    status = os.stat(file_path)
+    with open(file_path, 'rb') as file:
+        head = file.read(block_size)
+        file.seek(max(0, status.st_size - block_size))
+        tail = file.read(block_size)
+    return {'path': os.path.abspath(file_path), 'size': status.st_size, 'mtime_ns': status.st_mtime_ns,
+            'head': hashlib.sha256(head).hexdigest(), 'tail': hashlib.sha256(tail).hexdigest(),
+            'newline': tail[-1:] in (b'\n', b'\r')}
+
+def appended_offset(file_path, fingerprint, block_size=65536):
+    """
+    Check whether a file is the fingerprinted one with bytes appended.
+
+    Only the fingerprinted head and tail blocks are re-read, so the check costs
+    two block reads however large the file is.
+
+    Returns:
+        int: The offset the appended bytes start at (the file size when nothing
+        was appended), or None when the file was rewritten.
+    """
+    size = fingerprint['size']
+    if os.path.abspath(file_path) != fingerprint['path'] or os.stat(file_path).st_size < size:
+        return None
+    with open(file_path, 'rb') as file:
+        head = file.read(min(block_size, size))
+        file.seek(max(0, size - block_size))
+        tail = file.read(size - max(0, size - block_size))
+        following = file.read(2)
+    if hashlib.sha256(head).hexdigest() != fingerprint['head'] or hashlib.sha256(tail).hexdigest() != fingerprint['tail']:
+        return None
+    if following and not fingerprint['newline']:
+        # Bytes appended to an unterminated last line would change that row rather than add one
+        if following[:1] not in (b'\n', b'\r'):
+            return None
+        return size + (2 if following == b'\r\n' else 1)
+    return size
+
+def stream_appended_rows(file_path, offset, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Read the rows appended to a CSV file after offset as column batches, skipping blank lines.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        offset (int): Where the previously read part of the file ended.
+        columns (list): The column names from the file's header.
+        batch_size (int): The maximum number of rows per batch.
+
+    Yields:
+        dict: Column names mapped to lists of at most batch_size values.
+    """
+    width = len(columns)
+    with open(file_path, 'r', newline='') as file:
+        file.seek(offset)
+        batch = [[] for _ in columns]
+        for row in csv.reader(file):
+            if not row:
+                continue
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            for values, value in zip(batch, row):
+                values.append(value)
+            if len(batch[0]) >= batch_size:
+                yield dict(zip(columns, batch))
+                batch = [[] for _ in columns]
+        if width and batch[0]:
+            yield dict(zip(columns, batch))
+
+def scan_dataset(file_path, functional_dependencies=(), batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Sniff column types, check 1NF atomicity and validate FDs in one streaming pass.
+
+    Memory is bounded by the batch size plus, per FD, one entry for every
+    distinct left-hand side value seen so far; the table itself is never
+    held, so this is how --check handles inputs larger than RAM.
+
+    Args:
+        file_path (str): The path to the CSV file containing the dataset.
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        batch_size (int): The maximum number of rows per batch.
+
+    Returns:
+        dict: Row count, column names, "is_1nf", per-column "data_types" and
+        per-FD "violations" (violating row count and sample row numbers).
+    """
+    report = {'rows': 0, 'columns': [], 'is_1nf': True, 'data_types': {}, 'violations': {}}
+    profiles = {}
+    model = None
+    indexes = []
+    for batch in stream_dataset(file_path, batch_size):
+        if model is None:
+            report['columns'] = list(batch.keys())
+            model = compile_dependencies(functional_dependencies, batch.keys())
+            for fd in model.fds:
+                lhs, rhs = model.names(fd.lhs), model.names(fd.rhs)
+                name = f"{', '.join(lhs)} -> {', '.join(rhs)}"
+                report['violations'][name] = {'rows': 0, 'samples': []}
+                indexes.append((lhs, rhs, {}, report['violations'][name]))
+
+        for column, values in batch.items():
+            values = set(values)
+            profiles.setdefault(column, ColumnProfile()).update(values)
+            if report['is_1nf'] and any(',' in value for value in values):  # Assuming atomic values don't have commas
+                report['is_1nf'] = False
+
+        for lhs, rhs, index, violation in indexes:
+            if not all(attr in batch for attr in lhs + rhs):
+                continue
+            lhs_values = zip(*(batch[attr] for attr in lhs))
+            rhs_values = zip(*(batch[attr] for attr in rhs))
+            for row, (key, dependent) in enumerate(zip(lhs_values, rhs_values), report['rows'] + 1):
+                if index.setdefault(key, dependent) != dependent:
+                    violation['rows'] += 1
+                    if len(violation['samples']) < 5:
+                        violation['samples'].append(row)
+
+        report['rows'] += len(next(iter(batch.values()), []))
+    report['data_types'] = {column: profile.sql_type for column, profile in profiles.items()}
+    return report
+
+def _count_violations(columns, lhs, rhs, samples, first=None, start=0):
+    """
+    Group rows by their lhs codes and count the rows whose rhs codes differ from the group's first row.
+
+    Passing the first dict of an earlier call and the row to resume from
+    checks only the rows after start against the groups already seen.
+
+    Returns:
+        tuple: (violating row count, list of up to samples violating row indexes)
+    """
+    lhs_codes = [columns[attr][start:] if start else columns[attr] for attr in lhs]
+    rhs_codes = [columns[attr][start:] if start else columns[attr] for attr in rhs]
+    keys = lhs_codes[0] if len(lhs_codes) == 1 else zip(*lhs_codes)
+    dependents = rhs_codes[0] if len(rhs_codes) == 1 else zip(*rhs_codes)
+    if first is None:
+        first = {}
+    violating = 0
+    sample_rows = []
+    for row, (key, dependent) in enumerate(zip(keys, dependents), start):
+        if first.setdefault(key, dependent) != dependent:
+            violating += 1
+            if len(sample_rows) < samples:
+                sample_rows.append(row)
+    return violating, sample_rows
+_shared_columns = {}
+def _attach_shared_columns(handles):
+    """
+    Pool initializer: map the encoded columns published by the parent process.
+    """
+    from multiprocessing import shared_memory
+    for attr, (name, length) in handles.items():
+        block = shared_memory.SharedMemory(name=name)
+        _shared_columns[attr] = (block, block.buf.cast('I')[:length])
+def _validate_shared_fd(lhs, rhs, samples):
+    columns = {attr: codes for attr, (_, codes) in _shared_columns.items()}
+    return _count_violations(columns, lhs, rhs, samples)
+def validate_functional_dependencies(dataset, functional_dependencies, workers=None, samples=5):
+    """
+    Check every functional dependency against the rows of the dataset.
+
+    For each FD X -> Y the rows are grouped by X and every row whose Y differs
+    from its group's first row is counted as a violation. The FDs are spread
+    over a process pool; the encoded columns are published once in shared
+    memory, so workers read them in place instead of receiving pickled copies.
+    Tables under PARALLEL_VALIDATION_ROWS rows are checked in-process, where
+    they finish before a pool would have started.
+
+    Args:
+        dataset (ColumnStore or dict): The loaded table.
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        workers (int): Pool size (defaults to the CPU count); 1 validates in-process.
+        samples (int): How many violating rows to report per FD.
+
+    Returns:
+        dict: "X -> Y" mapped to {"rows": violating row count, "samples": list of
+        row dicts restricted to the FD's attributes}.
+    """
+    if not isinstance(dataset, ColumnStore):
+        dataset = ColumnStore.from_batches([dataset])
+    model = compile_dependencies(functional_dependencies, dataset.keys())
+    checks = []
+    for fd in model.fds:
+        lhs, rhs = model.names(fd.lhs), model.names(fd.rhs)
+        if all(attr in dataset for attr in lhs + rhs):
+            checks.append((f"{', '.join(lhs)} -> {', '.join(rhs)}", lhs, rhs))
+        else:
+            print(f"Skipping {', '.join(lhs)} -> {', '.join(rhs)}: attribute not in dataset")
+
+    workers = min(workers or os.cpu_count() or 1, len(checks))
+    if workers <= 1 or dataset.row_count < PARALLEL_VALIDATION_ROWS:
+        columns = {attr: column.codes for attr, column in dataset.items()}
+        results = [_count_violations(columns, lhs, rhs, samples) for _, lhs, rhs in checks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        used = {attr for _, lhs, rhs in checks for attr in lhs + rhs}
+        blocks = []
+        try:
+            handles = {}
+            for attr in used:
+                codes = dataset[attr].codes
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(codes) * codes.itemsize))
+                blocks.append(block)
+                block.buf[:len(codes) * codes.itemsize] = codes.tobytes()
+                handles[attr] = (block.name, len(codes))
+            with ProcessPoolExecutor(workers, initializer=_attach_shared_columns, initargs=(handles,)) as pool:
+                futures = [pool.submit(_validate_shared_fd, lhs, rhs, samples) for _, lhs, rhs in checks]
+                results = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
 
+    report = {}
+    for (name, lhs, rhs), (violating, sample_rows) in zip(checks, results):
+        report[name] = {
+            'rows': violating,
+            'samples': [{attr: dataset[attr][row] for attr in lhs + rhs} for row in sample_rows],
+        }
+    return report
 def parse_functional_dependencies(file_path):
     """
     Parse functional dependencies from a text file.
@@ -60,524 +713,2473 @@ def parse_functional_dependencies(file_path):
     return dependencies
 
 def parse_mvd_dependencies(file_path):
-    with open(file_path, 'r') as file:
-        lines = [line.strip() for line in file]
-    
-    mvd_dependencies = {}
-    for mvd in lines:
-        determinant, dependent = mvd.split(" ->> ")
-        determinant_str = str(determinant.split(", "))
-        mvd_dependencies.setdefault(determinant_str, []).append(dependent)
-
-    return mvd_dependencies
-def get_composite_keys():
     """
-    Prompt the user for composite/composite keys.
+    Parse multivalued dependencies such as "StudentID ->> Course" from a text file.
+     Args:
+        file_path (str): The path to the text file containing multivalued dependencies.
     Returns:
-        list: List of composite/composite keys entered by the user.
+        list: A list of multivalued dependencies.
+    """
+    dependencies = []
+    try:
+        with open(file_path, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    dependencies.append(line)
+    except FileNotFoundError:
+        print("Error: Multivalued dependencies file not found.")
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+    return dependencies
+def find_candidate_keys(functional_dependencies, attributes, limit=None):
     """
-    keys = input("Enter composite/composite keys (comma-separated): ").strip().split(',')
-    return [key.strip() for key in keys]
+    Discover the candidate keys of a schema from its functional dependencies.
 
+    Attributes that never appear on a right-hand side belong to every key and
+    attributes that appear only on right-hand sides belong to none; FDs whose
+    left-hand side the relation can never reach (say, one naming a column it
+    does not have) never fire, so they count for neither. The rest
+    are searched level by level, extending each non-key set with higher
+    attributes outside its cached closure and skipping supersets of keys
+    already found.
 
-def closure(attributes, functional_dependencies):
-    closure_attributes = set(attributes)
-    changed = True
-    
-    while changed:
-        changed = False
-        for fd in functional_dependencies:
-            lhs, rhs = fd.split('->')
-            if set(lhs).issubset(closure_attributes) and rhs not in closure_attributes:
-                closure_attributes.add(rhs)
-                changed = True
-                
-    return closure_attributes
-def is_superkey(lhs, keys):
-    return set(lhs).issuperset(set(keys))
-def has_transitive_dependency(candidate_keys, functional_dependencies):
-    # First, find all prime and non-prime attributes
-    prime_attributes = set()
-    for key in candidate_keys:
-        prime_attributes.update(key)
+    Args:
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        attributes (iterable): The attribute names of the schema.
+        limit (int): Stop once this many keys have been found (None for all).
 
-    non_prime_attributes = set(parsed_data.keys()) - prime_attributes
+    Returns:
+        list: Candidate keys, each a list of attribute names, smallest first.
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    all_attributes = model.mask(attributes)
+    reachable = model.closure_mask(all_attributes)
+    lhs_attributes = 0
+    rhs_attributes = 0
+    for fd in model.fds:
+        if fd.lhs & ~reachable:
+            continue
+        lhs_attributes |= fd.lhs
+        rhs_attributes |= fd.rhs & ~fd.lhs
 
-    # Now, build a mapping of direct dependencies for each attribute
-    attribute_dependencies = {attr: set() for attr in non_prime_attributes}
-    for fd in functional_dependencies:
-        lhs, rhs = fd.split('->')
-        lhs = set(lhs.strip().split(','))
-        rhs = set(rhs.strip().split(','))
+    core = all_attributes & ~rhs_attributes
+    candidates = list(iter_bits(all_attributes & lhs_attributes & rhs_attributes))
+    keys = []
+    level = {core: model.closure_mask(core)}
+    while level:
+        next_level = {}
+        for attrs, attrs_closure in level.items():
+            if any(attrs & key == key for key in keys):
+                continue
+            if attrs_closure & all_attributes == all_attributes:
+                keys.append(attrs)
+                if limit is not None and len(keys) >= limit:
+                    return [model.names(key) for key in keys]
+                continue
+            for bit in candidates:
+                if 1 << bit <= attrs & ~core or attrs_closure >> bit & 1:
+                    continue
+                extended = attrs | 1 << bit
+                if extended in next_level or any(extended & key == key for key in keys):
+                    continue
+                next_level[extended] = model.closure_mask(attrs_closure | 1 << bit)
+        level = next_level
+    return [model.names(key) for key in keys]
 
-        # If the LHS is not a superkey and RHS has non-prime attributes, add the dependency
-        if not is_superkey(lhs, candidate_keys) and rhs.issubset(non_prime_attributes):
-            for attr in lhs:
-                attribute_dependencies[attr].update(rhs)
 
-    # Check for transitive dependencies
-    for attr in attribute_dependencies:
-        for dependent in attribute_dependencies[attr]:
-            if dependent in attribute_dependencies and attribute_dependencies[dependent]:
-                # Found a transitive dependency: attr -> dependent -> something else
-                return True
-    return False
-def get_normal_form_choice(parsed_data, functional_dependencies, choice,mvd):
+def parse_fd(fd):
     """
-    Get the user's choice of the highest normal form to reach.
+    Split a dependency string such as "A, B -> C, D" or "A ->> C" into its sides.
+
+    Args:
+        fd (str): The functional or multivalued dependency.
 
     Returns:
-        str: The user's choice (e.g., "1NF", "2NF", "3NF").
+        tuple: (lhs, rhs) lists of attribute names.
     """
-    #return choice
-    # Assuming functional dependencies are given in the form of strings like "A, B -> C"
-    # This means A and B together determine C.
-    if choice=="1NF":
-        if check_1nf(parsed_data):
-            print("Data is in 1NF")     
-        else:
-            print("dataset not in 1NF")
-            generate_1nf_queries(parsed_data)
+    lhs, rhs = re.split(r'->>?', fd)
+    lhs = [attr.strip() for attr in lhs.split(',') if attr.strip()]
+    rhs = [attr.strip() for attr in rhs.split(',') if attr.strip()]
+    return lhs, rhs
 
-    elif choice== "2NF":
-        # To convert to 2NF, we need to check if the dataset is already in 1NF
-        # and there are no partial dependencies.
 
-        is_1nf = True
+def iter_bits(mask):
+    """
+    Yield the positions of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
 
-        # Check if all columns have atomic values (1NF check)
-        for column, values in parsed_data.items():
-            for value in values:
-                if ',' in value:  # Assuming atomic values don't have commas
-                    is_1nf = False
-                    break
 
-        if is_1nf:
-            # Check for partial dependencies
-            for fd in functional_dependencies:
-                lhs, rhs = fd.split('->')
-                lhs = lhs.strip().split(',')
-                rhs = rhs.strip()
-                # If lhs is not a superkey, it indicates a partial dependency
-                if not set(lhs).issuperset(set(parsed_data.keys())):
-                    is_1nf = False
-                    break
+class FunctionalDependency:
+    """
+    A compiled functional dependency: both sides are attribute bit masks.
+    """
+    __slots__ = ('lhs', 'rhs')
 
-        if is_1nf:
-            return "dataset in 2NF"
-        else:
-            decomposed_tables=decomposition_2nf(parsed_data, functional_dependencies, composite_keys)
-            
-            return decomposed_tables
-    elif choice=="3NF":
-        print('checking 3NF conditions')
-        is_1nf = True
-
-        # Check if all columns have atomic values (1NF check)
-        for column, values in parsed_data.items():
-            for value in values:
-                if ',' in value:  # Assuming atomic values don't have commas
-                    is_1nf = False
-                    break
+    def __init__(self, lhs, rhs):
+        self.lhs = lhs
+        self.rhs = rhs
 
-        is_2nf = True
-        if is_1nf:
-            # Check for partial dependencies
-            for fd in functional_dependencies:
-                lhs, rhs = fd.split('->')
-                lhs = lhs.strip().split(',')
-                rhs = rhs.strip()
-                # If lhs is not a superkey, it indicates a partial dependency
-                if not set(lhs).issuperset(set(parsed_data.keys())):
-                    is_2nf = False
-                    break
-            output_query_path = "query.txt"
-        return generate_3NF_queries(parsed_data, functional_dependencies,output_query_path)
-    # Add more cases for higher normal forms if needed.
-    #return chosen_normal_form
-    elif choice=="BCNF":
-        input_relation=decompose_to_3nf(parsed_data, functional_dependencies, composite_keys)
-        #input_relations = [
-    #{'relation_name': 'students_table', 'attributes': ['StudentID', 'FirstName', 'LastName'], 'data': [
-     #   {"StudentID": 101, "FirstName": "John", "LastName": "Doe"},
-      # {"StudentID": 103, "FirstName": "Arindam", "LastName": "Khanda"},
-       # {"StudentID": 104, "FirstName": "Jose", "LastName": "Franklin"},
-        #{"StudentID": 105, "FirstName": "Ada", "LastName": "Lovelace"}
-    #]},
-
-    #{'relation_name': 'courses_table', 'attributes': ['Course', 'CourseStart', 'CourseEnd', 'Professor'], 'data': [
-     #   {"Course": "Math101", "CourseStart": "1/1/2023", "CourseEnd": "5/30/2023", "Professor": "Dr.Smith"},
-      #  {"Course": "CS101", "CourseStart": "2/1/2023", "CourseEnd": "6/15/2023", "Professor": "Dr.Jones"},
-       # {"Course": "Bio101", "CourseStart": "3/1/2023", "CourseEnd": "7/20/2023", "Professor": "Dr.Watson"}
-    #]},
-
-    #{'relation_name': 'enrollments_table', 'attributes': ['StudentID', 'Course', 'classRoom'], 'data': [
-     #   {"StudentID": 101, "Course": "Math101", "classRoom": "M1"},
-      #  {"StudentID": 101, "Course": "CS101", "classRoom": "C1"},
-       # {"StudentID": 102, "Course": "Math101", "classRoom": "M1"},
-        #{"StudentID": 102, "Course": "CS101", "classRoom": "C2"},
-        #{"StudentID": 103, "Course": "CS101", "classRoom": "C1"},
-        #{"StudentID": 104, "Course": "Bio101", "classRoom": "B1"},
-        #{"StudentID": 105, "Course": "CS101", "classRoom": "C1"}
-    #]}]
-        
-        # Perform decomposition
-        decomposed_tables = decompose_to_bcnf(input_relation, functional_dependencies)
-
-        # Output the decomposed relations
-        for idx, decomposed_table in enumerate(decomposed_tables):
-            print(f"Decomposed relation {idx + 1}: {decomposed_table}")
-            if is_bcnf(decomposed_table, functional_dependencies): 
-                print("Decomposed relation is in BCNF.")
-            else:
-                print("Decomposed relation is not in BCNF.")
-        return decomposed_tables
-    elif choice=="4NF":
-     #write something here
-     decomposed_tables=decompose_to_4NF(parsed_data, mvd)
-     
-    elif choice=="5NF":
-        return 1
-        #here too    
+    def __eq__(self, other):
+        return isinstance(other, FunctionalDependency) and self.lhs == other.lhs and self.rhs == other.rhs
 
-def determine_data_type(values): #for query generator function
-    # Assuming values is a list of column values
-    for value in values:
-        try:
-            int(value)  # Attempt to convert to integer
-            return "INT"
-        except ValueError:
-            try:
-                float(value)  # Attempt to convert to float
-                return "FLOAT"
-            except ValueError:
-                pass
-
-    return "VARCHAR(255)"  # Default to VARCHAR if neither int nor float
-def determine_data_type2(value):
-    # Determine the data type based on the value
-    if isinstance(value, int):
-        return "INT"
-    elif isinstance(value, float):
-        return "FLOAT"
-    else:
-        return f"VARCHAR({len(str(value))})"
-def check_1nf(dataset):
-    is_1nf = True
+    def __hash__(self):
+        return hash((self.lhs, self.rhs))
 
-    # Check if all columns have atomic values (1NF check)
-    for column, values in parsed_data.items():
-        for value in values:
-            if ',' in value:  # Assuming atomic values don't have commas
-                is_1nf = False
-                break
-    return is_1nf
+    def __repr__(self):
+        return f"FunctionalDependency({self.lhs:#x} -> {self.rhs:#x})"
 
-def generate_1nf_queries(dataset):
-    queries = []
 
-    # Create a table for each column
-    for column, values in dataset.items():
-        data_type = determine_data_type(values)
-        query = f"CREATE TABLE {column} (\n"
-        query += f"{column} {data_type} PRIMARY KEY"
-        query += ");"
-        queries.append(query)
-    with open(output_query_path, 'a') as query_file:
-        query_file.write("\n1NF Queries:\n")
-        query_file.write('\n'.join(queries))
-    return queries
+class DependencyModel:
+    """
+    Functional dependencies of one schema, parsed once into bit masks.
 
-def decomposition_2nf(dataset, functional_dependencies, composite_keys):
-    decomposed_tables = []
-    # Create a dictionary to store the attributes for each table
-    table_attributes = {}
-    list_lhs=[]
-    list_rhs=[]
-    for fd in functional_dependencies:
-        lhs, rhs = fd.split('->')
-        lhs = lhs.strip().split(',')
-        rhs = rhs.strip().replace(" ", "").split(',')
-        list_lhs+=lhs 
-        list_rhs.append(rhs)
-    list(OrderedSet(list_lhs))
-    #print(list_lhs)
-    #print(list_rhs)
-    for id in list_lhs:
-        if id not in composite_keys:
-            for list1 in list_rhs:
-                if id in list1:
-                    k=list_lhs.index(id)
-                    list1+=list_rhs[k]
-                    list_lhs.remove(id)
-                    list_rhs.pop(k)
-    #print(list_lhs)
-    #print(list_rhs)
-    if(len(list_lhs)==len(list_rhs)):
-        for i in range(len(list_lhs)):
-            result=[]
-            key1=''.join(str(e) for e in list_lhs[i])
-            result.append(key1)
-            for item in list_rhs[i]:
-                result.append(item)
-            print(result)
-            table_name = input(f"Enter a new table name for {', '.join(str(e) for e in result)}: ")
-            if table_name not in table_attributes:
-                table_attributes[table_name] = OrderedSet()
-            table_attributes[table_name].update(OrderedSet(result))
-
-    for table_name, attributes in table_attributes.items():
-        attributes = list(attributes)
-        # Create the decomposed tables with attribute values from the original table
-        decomposed_table = {}
-        for attr in attributes:
-            decomposed_table[attr] = dataset[attr]
-        decomposed_tables.append({table_name: decomposed_table})
-    print("decomposed table is: \t")
-    print(decomposed_tables)
-    generate_query(table_attributes,dataset) #generate queries for decomposed tables
-    return decomposed_tables
-
-def decompose_to_3nf(dataset, functional_dependencies, candidate_keys):
-    queries = []
-    decomposed_tables = []
-    # Create a dictionary to store the attributes for each table
-    table_attributes = OrderedDict()
-
-    # Separate each functional dependency into left-hand side (LHS) and right-hand side (RHS)
-    fd_lhs = []
-    fd_rhs = []
-    for fd in functional_dependencies:
-        lhs, rhs = fd.split('->')
-        lhs = set(lhs.strip().split(','))
-        rhs = set(rhs.strip().split(','))
-        fd_lhs.append(lhs)
-        fd_rhs.append(rhs)
-
-    prime_attributes = set()
-    for key in candidate_keys:
-        prime_attributes.update(key)
-
-    non_prime_attributes = set(parsed_data.keys()) - prime_attributes
-    # Remove transitive dependencies
-    for i, (lhs, rhs) in enumerate(zip(fd_lhs, fd_rhs)):
-        if lhs.issubset(non_prime_attributes) and rhs.issubset(non_prime_attributes):
-            fd_lhs.pop(i)
-            fd_rhs.pop(i)
- 
-    # Now create tables for the 3NF decomposition
-    for lhs, rhs in zip(fd_lhs, fd_rhs):
-        # Create a new table with the LHS as the key and RHS as the attributes
-        key = ''.join(sorted(lhs))
-        attributes = lhs.union(rhs)
-        table_name = input(f"Enter a new table name for {', '.join(attributes)}: ")
-        if table_name not in table_attributes:
-            table_attributes[table_name] = OrderedDict.fromkeys(attributes)
-    
-    # Assign attributes to the tables
-    for table_name, attributes in table_attributes.items():
-        decomposed_table = {}
+    Every attribute maps to a bit position, so an attribute set is a plain int
+    and subset/superset tests are single integer operations. Closures use the
+    counter-and-worklist algorithm (Beeri-Bernstein): every FD keeps a count of
+    left-hand side attributes not yet in the closure and fires when the count
+    reaches zero, so one call is linear in the size of the FD set.
+
+    Multivalued dependencies are kept alongside as (lhs, rhs) mask pairs; they
+    take no part in closures. A frozen model rejects unknown attribute names
+    and new dependencies, so it is never written to and can be shared between
+    threads.
+    """
+
+    def __init__(self, functional_dependencies, attributes=(), multivalued_dependencies=()):
+        self.frozen = False
+        self.attributes = []
+        self.bits = {}
+        # For every bit position, the FDs whose left-hand side contains it
+        self.watchers = []
         for attr in attributes:
-            decomposed_table[attr] = dataset.get(attr.strip(), [])
-        decomposed_tables.append({table_name: decomposed_table})
-    
-    print("Decomposed table is: \t")
-    print(decomposed_tables)
-    # Generate queries for decomposed tables
-    return generate_query(table_attributes, dataset)
+            self._bit(attr)
 
+        self.fds = []
+        self.lhs_sizes = []
+        self.unconditional = []
+        for fd in functional_dependencies:
+            lhs, rhs = parse_fd(fd)
+            self.add(FunctionalDependency(self.mask(lhs), self.mask(rhs)))
 
-def generate_3NF_queries(dataset, functional_dependencies,output_query_path):
-    queries = []
-    decomposed_tables = {}
-    table_attributes = {}
-    
-    # Step 1: Split the functional dependencies
-    fds = {}  # {lhs: [list of rhs]}
-    for fd in functional_dependencies:
-        lhs, rhs = fd.split('->')
-        lhs = lhs.strip()
-        rhs = rhs.strip().replace(" ", "").split(',')
-        if lhs in fds:
-            fds[lhs].extend(rhs)
-        else:
-            fds[lhs] = rhs
-    
-    # Step 2: Decompose based on non-transitive dependencies
-    for lhs, rhs in fds.items():
-        if lhs not in table_attributes.keys():
-            table_attributes[lhs] = [lhs] + rhs
-        else:
-            table_attributes[lhs].extend(rhs)
-
-    # Step 3: Generate SQL queries based on decomposition
-    for table_name, attributes in table_attributes.items():
-        data_types = [determine_data_type(dataset[col.strip()]) for col in attributes]
-        new_table = f"CREATE TABLE {table_name} (\n"
-        new_table += ',\n'.join(f'{col.strip()} {data_type}' for col, data_type in zip(attributes, data_types))
-        new_table += f",\nPRIMARY KEY ({attributes[0].strip()})"
-        new_table += ');\n'
-        queries.append(new_table)
-        decomposed_tables[table_name] = attributes
-    
-    with open(output_query_path, 'a') as query_file:
-        query_file.write("\n3NF Queries:\n")
-        query_file.write('\n'.join(queries))
+        self.mvds = []
+        for mvd in multivalued_dependencies:
+            self.add_mvd(mvd)
 
-    print(f"Data has been written to {output_query_path}")
-    print("Decomposed tables are:")
-    for table, cols in decomposed_tables.items():
-        print(f"{table}: {', '.join(cols)}")
+    @classmethod
+    def from_fds(cls, attributes, fds):
+        """
+        Build a model directly from compiled FunctionalDependency objects.
+        """
+        model = cls([], attributes)
+        for fd in fds:
+            model.add(fd)
+        return model
 
-    return decomposed_tables
+    def add(self, fd):
+        """
+        Append a compiled FD and index its left-hand side.
+        """
+        if self.frozen:
+            raise ValueError("Cannot add a dependency to a frozen DependencyModel")
+        i = len(self.fds)
+        self.fds.append(fd)
+        size = 0
+        for bit in iter_bits(fd.lhs):
+            self.watchers[bit].append(i)
+            size += 1
+        self.lhs_sizes.append(size)
+        if size == 0:
+            self.unconditional.append(i)
 
-def is_bcnf(relation, functional_dependencies):
-    for fd in functional_dependencies:
-        lhs, rhs = fd.split('->')
-        lhs = lhs.strip().split(',')
-        rhs = rhs.strip()
-        
-        if set(lhs).issubset(set(relation.keys())) and rhs not in relation.keys():
-            return False
-    return True
-
-def decompose_to_bcnf(input_relation, functional_dependencies):
-    decomposed_relations = []
-
-    for relation_info in input_relation:
-        relation_name = relation_info['relation_name']
-        attributes = relation_info['attributes']
-        data = relation_info['data']
-        non_trivial_fds = [fd for fd in functional_dependencies if fd.split('->')[0] != fd.split('->')[1]]
-
-        closure_attributes = closure(attributes, non_trivial_fds)
-        if len(closure_attributes) == len(attributes):
-            decomposed_relations.append({'relation_name': relation_name, 'attributes': attributes, 'data': data})
-        else:
-            new_relations = []
-            for entry in data:
-                key = tuple(entry[attr] for attr in attributes)
-                new_relations.append({attr: entry[attr] for attr in closure_attributes})
-              
-            decomposed_relations.append({'relation_name': relation_name, 'attributes': list(closure_attributes), 'data': new_relations})
-            # Generate and write SQL queries to the output file
-        output_query_path = "query.txt"
-        generate_bcnf_query(decomposed_relations, output_query_path)
-
-    return decomposed_relations
-    
-#def decompose_to_4NF(relation, mvd, ck):
-    # Implement 4NF decomposition algorithm here
-    
-    # Initialize a list to store the decomposed relations
-    #decomposed_relations = [relation]
+    def add_mvd(self, mvd):
+        """
+        Append a multivalued dependency given as a string or an (lhs, rhs) mask pair.
+        """
+        if isinstance(mvd, str):
+            lhs, rhs = parse_fd(mvd)
+            mvd = (self.mask(lhs), self.mask(rhs))
+        if mvd not in self.mvds:
+            if self.frozen:
+                raise ValueError("Cannot add a dependency to a frozen DependencyModel")
+            self.mvds.append(mvd)
 
-    # Iterate over each MVD
-    #for X, Y in mvd:
-        # Check if X is a superkey (candidate key) for the relation
-       # if set(X).issuperset(set(ck)):
-            # Create a new relation with attributes in Y
-           # new_relation = list(set(Y))
-            # Add the new relation to the list of decomposed relations
-           # decomposed_relations.append(new_relation)
-            # Remove attributes in Y from the original relation
-            #relation = [attr for attr in relation if attr not in Y]
-            #return decomposed_relations
-def decompose_to_4NF(relation, mvd_dependencies):
-    decomposed_tables = [relation]
-    
-    for mvd in mvd_dependencies:
-        X, Y = mvd.split(" ->> ")
-        X = set(X.split(', '))
-        Y = set(Y.split(', '))
-        
-        # Create two new tables
-        table1 = {attr: [] for attr in X | Y}
-        table2 = {attr: [] for attr in X | (set(relation.keys()) - Y)}
-        
-        # Distribute data into new tables based on the MVD
-        for tuple_data in relation:
-            if all(tuple_data[attr] in table1[attr] for attr in X):
-                for attr in X:
-                    table1[attr].append(tuple_data[attr])
-                for attr in Y:
-                    table1[attr].append(tuple_data[attr])
-            else:
-                for attr in X:
-                    table2[attr].append(tuple_data[attr])
-                for attr in set(relation.keys()) - Y:
-                    table2[attr].append(tuple_data[attr])
-        
-        # Remove attributes that are now in table1
-        for attr in X | Y:
-            del relation[attr]
-        
-        # Remove attributes that are now in table2
-        for attr in X | (set(relation.keys()) - Y):
-            del relation[attr]
-        
-        decomposed_tables.append(table1)
-        decomposed_tables.append(table2)
-    
-    return decomposed_tables
+    def freeze(self):
+        """
+        Make the model read-only: later calls never register names or dependencies.
+        """
+        self.frozen = True
+        return self
 
-    
-def generate_bcnf_query(decomposed_tables, output_query_path):
-    queries = []
-    for idx, table_info in enumerate(decomposed_tables):
-        table_name = table_info['relation_name']
-        attributes = table_info['attributes']
-        data = table_info['data']
+    def _bit(self, attr):
+        bit = self.bits.get(attr)
+        if bit is None:
+            if self.frozen:
+                raise KeyError(f"Unknown attribute {attr!r}")
+            bit = len(self.attributes)
+            self.bits[attr] = bit
+            self.attributes.append(attr)
+            self.watchers.append([])
+        return bit
 
-        # Skip tables with no data
-        if not data:
-            continue
+    @property
+    def all_mask(self):
+        return (1 << len(self.attributes)) - 1
 
-        # Sample a value to determine data type
-        sample_values = {attr: data[0][attr] for attr in attributes}
+    def mask(self, attributes):
+        """
+        Encode attribute names as a bit mask, registering names seen for the first time.
 
-        data_types = [determine_data_type2(sample_values[attr]) for attr in attributes]
+        Raises:
+            KeyError: When the model is frozen and a name is unknown.
+        """
+        mask = 0
+        for attr in attributes:
+            mask |= 1 << self._bit(attr)
+        return mask
 
-        create_table_query = f"CREATE TABLE {table_name} (\n"
-        create_table_query += ',\n'.join([f'{attr} {data_type}' for attr, data_type in zip(attributes, data_types)])
-        create_table_query += f",\nPRIMARY KEY ({attributes[0]})"
-        create_table_query += ');\n'
+    def names(self, mask):
+        """
+        Decode a bit mask into attribute names, in schema order.
+        """
+        return [self.attributes[bit] for bit in iter_bits(mask)]
 
-        queries.append(create_table_query)
-    # Write queries to a file
+    def closure_mask(self, mask, disabled=None):
+        """
+        Compute the closure of an attribute bit mask.
 
-    with open(output_query_path, 'a') as query_file:
-        query_file.write("\nBCNF Queries:\n")
-        query_file.write('\n'.join(queries))
+        Args:
+            mask (int): The attributes to close.
+            disabled (list): Optional flags indexed like self.fds; flagged FDs are ignored.
 
+        Returns:
+            int: The bit mask of every attribute determined by the input.
+        """
+        counters = self.lhs_sizes[:]
+        if disabled is not None:
+            counters = [-1 if off else count for count, off in zip(counters, disabled)]
+        worklist = list(iter_bits(mask))
+        for i in self.unconditional:
+            if counters[i] < 0:
+                continue
+            new = self.fds[i].rhs & ~mask
+            mask |= new
+            worklist.extend(iter_bits(new))
+
+        while worklist:
+            for i in self.watchers[worklist.pop()]:
+                counters[i] -= 1
+                if counters[i] == 0:
+                    new = self.fds[i].rhs & ~mask
+                    if new:
+                        mask |= new
+                        worklist.extend(iter_bits(new))
+        return mask
+
+    def closure(self, attributes):
+        """
+        Compute the closure of a set of attribute names.
+        """
+        return set(self.names(self.closure_mask(self.mask(attributes))))
+
+    def is_superkey(self, lhs, attributes):
+        target = self.mask(attributes)
+        return self.closure_mask(self.mask(lhs)) & target == target
+
+
+def compile_dependencies(functional_dependencies, attributes=(), multivalued_dependencies=()):
+    """
+    Return a DependencyModel for the given FDs, reusing one that is already compiled.
+    """
+    if isinstance(functional_dependencies, DependencyModel):
+        for mvd in multivalued_dependencies:
+            functional_dependencies.add_mvd(mvd)
+        return functional_dependencies
+    return DependencyModel(functional_dependencies, attributes, multivalued_dependencies)
+
+
+def closure(attributes, functional_dependencies):
+    return compile_dependencies(functional_dependencies).closure(attributes)
+def is_superkey(lhs, keys):
+    """
+    Check whether lhs contains one of the candidate keys (a single key may be passed as a list of names).
+    """
+    if keys and all(isinstance(key, str) for key in keys):
+        keys = [keys]
+    return any(set(lhs).issuperset(key) for key in keys)
+def key_mask(model, keys):
+    """
+    Encode keys as one bit mask; each key may be an attribute name or a list of names.
+    """
+    mask = 0
+    for key in keys:
+        mask |= model.mask([key] if isinstance(key, str) else key)
+    return mask
+def has_partial_dependency(model, candidate_keys, attributes):
+    """
+    Check whether a non-prime attribute depends on a proper subset of a candidate key.
+    """
+    keys = [key_mask(model, [key]) for key in candidate_keys]
+    non_prime_attributes = model.mask(attributes) & ~key_mask(model, candidate_keys)
+    for fd in model.fds:
+        dependents = model.closure_mask(fd.lhs) & non_prime_attributes & ~fd.lhs
+        if dependents and any(fd.lhs & key == fd.lhs and fd.lhs != key for key in keys):
+            return True
+    return False
+def has_transitive_dependency(candidate_keys, functional_dependencies, attributes):
+    # First, find all prime and non-prime attributes
+    model = compile_dependencies(functional_dependencies, attributes)
+    all_attributes = model.mask(attributes)
+    prime_attributes = key_mask(model, candidate_keys)
+    non_prime_attributes = all_attributes & ~prime_attributes
+
+    # Now, build a mapping of direct dependencies for each non-prime attribute bit
+    attribute_dependencies = {bit: 0 for bit in iter_bits(non_prime_attributes)}
+    for fd in model.fds:
+        # If the LHS is not a superkey and RHS has non-prime attributes, add the dependency
+        if model.closure_mask(fd.lhs) & all_attributes != all_attributes and not fd.rhs & ~non_prime_attributes:
+            for bit in iter_bits(fd.lhs & non_prime_attributes):
+                attribute_dependencies[bit] |= fd.rhs
+
+    # Check for transitive dependencies
+    for bit, dependents in attribute_dependencies.items():
+        for dependent in iter_bits(dependents):
+            if attribute_dependencies.get(dependent):
+                # Found a transitive dependency: attr -> dependent -> something else
+                return True
+    return False
+def minimal_cover(functional_dependencies, attributes=()):
+    """
+    Compute a minimal cover of the functional dependencies.
+
+    Right-hand sides are split into single attributes, extraneous left-hand
+    side attributes are removed and redundant FDs are dropped. Closures of
+    reduced left-hand sides are memoized, since every split FD of one
+    determinant tests the same subsets.
+
+    Args:
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        attributes (iterable): The attribute names of the schema.
+
+    Returns:
+        list: FunctionalDependency objects over the model's bit positions.
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    closures = {}
+
+    def cached_closure(mask):
+        if mask not in closures:
+            closures[mask] = model.closure_mask(mask)
+        return closures[mask]
+
+    reduced = OrderedDict()
+    for fd in model.fds:
+        for bit in iter_bits(fd.rhs & ~fd.lhs):
+            lhs = fd.lhs
+            for lhs_bit in iter_bits(fd.lhs):
+                smaller = lhs & ~(1 << lhs_bit)
+                if cached_closure(smaller) >> bit & 1:
+                    lhs = smaller
+            reduced[FunctionalDependency(lhs, 1 << bit)] = None
+
+    cover = DependencyModel.from_fds(model.attributes, list(reduced))
+    disabled = [False] * len(cover.fds)
+    for i, fd in enumerate(cover.fds):
+        disabled[i] = True
+        if not cover.closure_mask(fd.lhs, disabled) & fd.rhs:
+            disabled[i] = False
+    return [fd for fd, off in zip(cover.fds, disabled) if not off]
+def synthesize_3nf(functional_dependencies, attributes, candidate_keys=None):
+    """
+    Build a lossless, dependency-preserving 3NF decomposition (Bernstein synthesis).
+
+    One table is made per determinant of the minimal cover, tables contained in
+    another are dropped and a key table is added when no table holds a
+    candidate key.
+
+    Returns:
+        list: (key, attributes) tuples of attribute name lists, key columns first.
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    all_attributes = model.mask(attributes)
+    groups = OrderedDict()
+    for fd in minimal_cover(model):
+        groups[fd.lhs] = groups.get(fd.lhs, fd.lhs) | fd.rhs
+
+    tables = [(lhs, attrs) for lhs, attrs in groups.items()
+              if not any(other != attrs and attrs & other == attrs for other in groups.values())]
+    if not any(model.closure_mask(attrs) & all_attributes == all_attributes for _, attrs in tables):
+        if candidate_keys is None:
+            candidate_keys = find_candidate_keys(model, attributes, limit=1)
+        key = model.mask(candidate_keys[0])
+        tables.append((key, key))
+    return [(model.names(lhs), model.names(lhs) + model.names(attrs & ~lhs)) for lhs, attrs in tables]
+def _refine_partition(classes, codes):
+    """
+    Split every class of a stripped partition by the codes of one more column, dropping singletons.
+    """
+    refined = []
+    code_of = codes.__getitem__
+    for rows in classes:
+        if len(rows) == 2:
+            if code_of(rows[0]) == code_of(rows[1]):
+                refined.append(rows)
+            continue
+        groups = {}
+        for row, code in zip(rows, map(code_of, rows)):
+            group = groups.get(code)
+            if group is None:
+                groups[code] = [row]
+            else:
+                group.append(row)
+        refined.extend(array('I', group) for group in groups.values() if len(group) > 1)
+    return refined
+def _partition_error(classes):
+    """
+    Rows minus classes of a stripped partition; X -> A holds exactly when X and X + A score the same.
+    """
+    return sum(map(len, classes)) - len(classes)
+def _refined_error(classes, codes):
+    """
+    The error _refine_partition's result would have, counted without building it.
+    """
+    code_of = codes.__getitem__
+    return sum(len(rows) - len(set(map(code_of, rows))) for rows in classes)
+def _dependency_error(classes, codes):
+    """
+    Count the rows that must be removed for the partition's attributes to determine the column (g3 numerator).
+    """
+    removed = 0
+    code_of = codes.__getitem__
+    for rows in classes:
+        removed += len(rows) - max(Counter(map(code_of, rows)).values())
+    return removed
+def discover_functional_dependencies(dataset, max_error=0.0, max_lhs=DISCOVERY_MAX_LHS):
+    """
+    Mine the minimal functional dependencies that hold in a dataset (TANE).
+
+    The attribute lattice is searched level by level over stripped partitions,
+    each built by refining a parent partition with one more column's codes.
+    Exact FDs are recognised by comparing partition errors, so the g3 error
+    is only measured when an approximate FD is allowed.
+    Right-hand side candidate sets prune the search, and (for exact FDs)
+    superkeys are dropped once their remaining dependencies are emitted.
+    Nodes left without candidates are never partitioned, and a node whose
+    new column is already determined by a found FD reuses its parent's
+    partition. Constant columns (every column of a one-row table) are
+    determined by the empty set; that FD is not reported, nor are the
+    larger ones it implies, so such columns end up in every key.
+
+    The search is exponential in the number of columns and every partition
+    costs a pass over the rows it still holds, so max_lhs bounds it by
+    default; left-hand sides that long found in a sample of rows are mostly
+    coincidences anyway. Even bounded, expect on one core about 10-20 s for
+    20,000 rows of 15-20 low-cardinality columns and about 10 s for 100,000
+    rows of 10; unbounded, the same tables can take minutes. Wide tables are
+    out of reach: 20,000 random rows of 30 columns take over two minutes and
+    200,000 do not finish in ten, which is why the command line only mines
+    FDs when asked (--discover).
+
+    Args:
+        dataset (ColumnStore or dict): The loaded table.
+        max_error (float): The largest fraction of rows (g3 error) an
+            approximate FD may violate; 0.0 keeps only exact FDs.
+        max_lhs (int): The most left-hand side attributes to look for; None searches the whole lattice.
+
+    Returns:
+        list: FD strings such as "A, B -> C", one per minimal dependency.
+    """
+    if not isinstance(dataset, ColumnStore):
+        dataset = ColumnStore.from_batches([dataset])
+    attributes = list(dataset.keys())
+    codes = [dataset[attr].codes for attr in attributes]
+    row_count = dataset.row_count
+    limit = int(max_error * row_count)
+    all_attributes = (1 << len(attributes)) - 1
+    found = []
+
+    def emit(lhs, bit):
+        if not lhs:
+            # A constant column: no table could be keyed on the empty set, so it is left to the key table
+            return
+        found.append(f"{', '.join(attributes[b] for b in iter_bits(lhs))} -> {attributes[bit]}")
+
+    def determines(lhs, bit):
+        if lhs | 1 << bit in errors:
+            return errors[lhs] == errors[lhs | 1 << bit]
+        return not _dependency_error(previous[lhs], codes[bit])
+
+    def partition(node, parent, bit, last):
+        if last:
+            # The last level is only tested, never refined further, so its errors suffice
+            errors[node] = _refined_error(parent, codes[bit])
+            return None
+        classes = _refine_partition(parent, codes[bit])
+        errors[node] = _partition_error(classes)
+        return classes
+
+    # The empty set partitions all rows into one class
+    previous = {0: [array('I', range(row_count))] if row_count > 1 else []}
+    errors = {0: _partition_error(previous[0])}
+    cplus = {0: all_attributes}
+    level = {1 << bit: partition(1 << bit, previous[0], bit, max_lhs == 0) for bit in range(len(attributes))}
+    # Bits that the FDs found so far make each node determine
+    implied = dict.fromkeys(level, 0)
+    determined = {}
+    size = 1
+    while level:
+        # Compute the dependencies with a left-hand side one attribute smaller than each node
+        for node in level:
+            candidates = all_attributes
+            for bit in iter_bits(node):
+                candidates &= cplus.get(node & ~(1 << bit), 0)
+            for bit in iter_bits(node & candidates):
+                lhs = node & ~(1 << bit)
+                if errors[lhs] == errors[node]:
+                    error = 0
+                elif limit:
+                    error = _dependency_error(previous[lhs], codes[bit])
+                else:
+                    continue
+                if error <= limit:
+                    emit(lhs, bit)
+                    candidates &= ~(1 << bit)
+                    if error == 0:
+                        candidates &= node
+                        determined[lhs] = determined.get(lhs, 0) | 1 << bit
+            cplus[node] = candidates
+
+        # Prune nodes without candidates, and superkeys once their dependencies are emitted.
+        # Superkeys are kept when mining approximate FDs, whose left-hand sides may cross them.
+        for node in list(level):
+            if not cplus[node]:
+                del level[node]
+            elif not errors[node] and not limit:
+                if max_lhs is None or size <= max_lhs:
+                    for bit in iter_bits(cplus[node] & ~node):
+                        if not any(determines(node & ~(1 << b), bit) for b in iter_bits(node)):
+                            emit(node, bit)
+                del level[node]
+
+        if max_lhs is not None and size > max_lhs:
+            break
+        if not limit:
+            for node in level:
+                for bit in iter_bits(node):
+                    implied[node] |= implied.get(node & ~(1 << bit), 0) | determined.get(node & ~(1 << bit), 0)
+        # Generate the next level from pairs of nodes sharing all but their highest attribute
+        blocks = defaultdict(list)
+        for node in level:
+            blocks[node & ~(1 << (node.bit_length() - 1))].append(node)
+        next_level = {}
+        for nodes in blocks.values():
+            nodes.sort()
+            for i, first in enumerate(nodes):
+                for second in nodes[i + 1:]:
+                    node = first | second
+                    subsets = [node & ~(1 << bit) for bit in iter_bits(node)]
+                    if not all(subset in level for subset in subsets):
+                        continue
+                    # A node without right-hand side candidates would be pruned at once
+                    if not reduce(and_, (cplus[subset] for subset in subsets)):
+                        continue
+                    bit = second.bit_length() - 1
+                    if implied.get(first, 0) >> bit & 1:
+                        # first -> bit already holds, so adding bit splits no class
+                        errors[node] = errors[first]
+                        next_level[node] = level[first]
+                    else:
+                        next_level[node] = partition(node, level[first], bit, size == max_lhs)
+                    implied[node] = 0
+        previous = level
+        level = next_level
+        size += 1
+    return found
+def get_normal_form_choice(parsed_data, functional_dependencies, choice, mvd=(), jd=(), candidate_keys=None,
+                           output_dir='.', normalizer=None):
+    """
+    Normalize a dataset to the chosen normal form, report the outcome and write its output files.
+
+    Args:
+        parsed_data (ColumnStore): The encoded columns.
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        choice (str): The normal form to reach: "1NF", "2NF", "3NF", "BCNF", "4NF" or "5NF".
+        mvd (list): Multivalued dependency strings.
+        jd (list): Join dependencies as lists of components.
+        candidate_keys (list): Keys to use instead of the ones derived from the FDs.
+        output_dir (str): Directory for query.txt, the table data and verification.json.
+        normalizer (Normalizer): Naming options (defaults to a Normalizer()).
+
+    Returns:
+        NormalizationResult: The decomposed tables, their DDL and the verification report.
+    """
+    schema = Schema(parsed_data.keys(), functional_dependencies, mvd, jd, candidate_keys)
+    result = (normalizer or Normalizer()).normalize(parsed_data, schema, choice)
+    print_result(result)
+    for kind, path in result.write(output_dir).items():
+        print(f"{kind.capitalize()} written to {path}")
+    return result
+
+NUMBER_PATTERN = re.compile(r'[+-]?(\d+)(?:\.(\d+))?')
+DATE_FORMATS = ((re.compile(r'\d{4}-\d{1,2}-\d{1,2}'), '%Y-%m-%d'),
+                (re.compile(r'\d{1,2}/\d{1,2}/\d{4}'), '%m/%d/%Y'))
+NULL_VALUES = ('', 'NULL', 'null')
+# Column kinds in widening order; DATE only widens to VARCHAR
+INT, BIGINT, DECIMAL, DATE, VARCHAR = range(5)
+
+class ColumnProfile:
+    """
+    The tightest SQL type covering every value of a column seen so far.
+
+    Values are folded in with update(), so a profile can be built over a whole
+    column, a sample or a stream of batches.
+    """
+    __slots__ = ('kind', 'max_length', 'integer_digits', 'scale', 'nullable')
+
+    def __init__(self, values=()):
+        self.kind = None
+        self.max_length = 0
+        self.integer_digits = 0
+        self.scale = 0
+        self.nullable = False
+        self.update(values)
+
+    def update(self, values):
+        for value in values:
+            if value in NULL_VALUES:
+                self.nullable = True
+                continue
+            if len(value) > self.max_length:
+                self.max_length = len(value)
+            if self.kind == VARCHAR:
+                continue
+            number = NUMBER_PATTERN.fullmatch(value)
+            if number and not (len(number.group(1)) > 1 and number.group(1)[0] == '0'):
+                if self.kind == DATE:
+                    self.kind = VARCHAR
+                    continue
+                integer, fraction = number.groups()
+                self.integer_digits = max(self.integer_digits, len(integer))
+                if fraction:
+                    kind = DECIMAL
+                    self.scale = max(self.scale, len(fraction))
+                elif -2**31 <= int(value) < 2**31:
+                    kind = INT
+                elif -2**63 <= int(value) < 2**63:
+                    kind = BIGINT
+                else:
+                    kind = DECIMAL
+                self.kind = kind if self.kind is None else max(self.kind, kind)
+            elif self.kind in (None, DATE) and _is_date(value):
+                self.kind = DATE
+            else:
+                self.kind = VARCHAR
+
+    def not_null(self):
+        """
+        Return the profile of the same values as a NOT NULL (key) column.
+
+        A key column keeps its null markers as text, so a column that holds
+        any is typed VARCHAR wide enough for them.
+        """
+        profile = ColumnProfile()
+        for slot in self.__slots__:
+            setattr(profile, slot, getattr(self, slot))
+        if self.nullable:
+            profile.nullable = False
+            profile.kind = VARCHAR
+            profile.max_length = max([self.max_length] + [len(value) for value in NULL_VALUES])
+        return profile
+
+    @property
+    def sql_type(self):
+        if self.kind == INT:
+            return "INT"
+        if self.kind == BIGINT:
+            return "BIGINT"
+        if self.kind == DECIMAL:
+            return f"DECIMAL({self.integer_digits + self.scale},{self.scale})"
+        if self.kind == DATE:
+            return "DATE"
+        if self.kind == VARCHAR:
+            return f"VARCHAR({self.max_length})"
+        return "VARCHAR(255)"  # Default when the column holds only nulls
+
+def _is_date(value):
+    for pattern, date_format in DATE_FORMATS:
+        if pattern.fullmatch(value):
+            try:
+                datetime.strptime(value, date_format)
+                return True
+            except ValueError:
+                return False
+    return False
+
+def profile_column(values):
+    """
+    Profile a column in one pass over its distinct values (or a bounded sample of them).
+
+    Encoded columns are profiled from their dictionary and the result is cached
+    on the column, so every query generator reuses it.
+
+    Returns:
+        ColumnProfile: The column's SQL type and nullability.
+    """
+    if isinstance(values, EncodedColumn):
+        if values.profile is None:
+            values.profile = ColumnProfile(values.dictionary[:PROFILE_SAMPLE_SIZE])
+        return values.profile
+    if PROFILE_SAMPLE_SIZE is not None:
+        values = values[:PROFILE_SAMPLE_SIZE]
+    return ColumnProfile(set(values))
+
+def determine_data_type(values): #for query generator function
+    return profile_column(values).sql_type
+
+def column_definition(column, values):
+    """
+    Render a column for CREATE TABLE, e.g. "Course VARCHAR(7) NOT NULL".
+    """
+    profile = profile_column(values)
+    return f"{column} {profile.sql_type}" + ("" if profile.nullable else " NOT NULL")
+def check_1nf(dataset):
+    is_1nf = True
+
+    # Check if all columns have atomic values (1NF check)
+    for column, values in dataset.items():
+        for value in distinct_values(values):
+            if ',' in value:  # Assuming atomic values don't have commas
+                is_1nf = False
+                break
+    return is_1nf
+
+def generate_1nf_queries(dataset, output_query_path=None):
+    queries = []
+
+    # Create a table for each column
+    for column, values in dataset.items():
+        data_type = determine_data_type(values)
+        query = f"CREATE TABLE {column} (\n"
+        query += f"{column} {data_type} PRIMARY KEY"
+        query += ");"
+        queries.append(query)
+    if output_query_path:
+        with open(output_query_path, 'a') as query_file:
+            query_file.write("\n1NF Queries:\n")
+            query_file.write('\n'.join(queries))
+    return queries
+
+def table_name(key, attributes, taken, rule=None, prefix=None):
+    """
+    Name a decomposed table deterministically.
+
+    Args:
+        key (list): The table's key columns.
+        attributes (list): All of the table's columns.
+        taken (collection): Names already given out; a clash gets a "_2", "_3", ... suffix.
+        rule (str): "key", "attributes" or "numbered" (defaults to TABLE_NAMING).
+        prefix (str): Prepended with an underscore when set (defaults to TABLE_PREFIX).
+
+    Returns:
+        str: The table name.
+    """
+    rule = rule or TABLE_NAMING
+    prefix = TABLE_PREFIX if prefix is None else prefix
+    if rule == "key":
+        name = '_'.join(key)
+    elif rule == "attributes":
+        name = '_'.join(attributes)
+    elif rule == "numbered":
+        name = f"table{len(taken) + 1}"
+    else:
+        raise ValueError(f"Unknown table naming rule: {rule}")
+    if prefix:
+        name = f"{prefix}_{name}"
+    candidate, suffix = name, 2
+    while candidate in taken:
+        candidate, suffix = f"{name}_{suffix}", suffix + 1
+    return candidate
+
+def second_nf_decomposition(functional_dependencies, attributes, candidate_keys):
+    """
+    Group the attributes into 2NF tables, one per determinant.
+
+    Every FD starts a group of its determinant and dependents; a group whose
+    determinant is not part of a key is folded into a group holding that
+    determinant, so transitive dependents stay with their chain. As in
+    synthesize_3nf, a key table is added when no table holds a candidate key,
+    so the tables join back losslessly.
+
+    Returns:
+        list: (key, attributes) tuples of attribute name lists, key columns first.
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    keys = key_mask(model, candidate_keys)
+    # One [determinant, attributes] group per FD
+    groups = [[fd.lhs, fd.lhs | fd.rhs] for fd in model.fds]
+    # Fold a group whose non-key determinant is held by another group into that group
+    for group in list(groups):
+        if not group[0] & ~keys:
+            continue
+        for other in groups:
+            if other is not group and not group[0] & ~other[1]:
+                other[1] |= group[1]
+                groups.remove(group)
+                break
+
+    # Groups sharing a determinant share a table
+    tables = OrderedDict()
+    for lhs, group in groups:
+        # A dict keeps the columns in order without duplicates
+        tables.setdefault(lhs, dict.fromkeys(model.names(lhs))).update(dict.fromkeys(model.names(group & ~lhs)))
+    tables = [(model.names(lhs), list(table)) for lhs, table in tables.items()]
+    all_attributes = model.mask(attributes)
+    if not any(model.closure_mask(model.mask(table)) & all_attributes == all_attributes for _, table in tables):
+        if not candidate_keys:
+            candidate_keys = find_candidate_keys(model, attributes, limit=1)
+        key = model.names(key_mask(model, candidate_keys[:1]))
+        tables.append((key, key))
+    return tables
+
+def decomposition_2nf(dataset, functional_dependencies, composite_keys, output_dir='.'):
+    """
+    Decompose the dataset into 2NF tables and write their DDL, data and verification report.
+    """
+    return _write_normal_form(dataset, functional_dependencies, "2NF", output_dir, composite_keys)
+
+def decompose_to_3nf(dataset, functional_dependencies, candidate_keys, output_dir='.'):
+    """
+    Synthesize 3NF tables around the given candidate keys and write their DDL, data and verification report.
+    """
+    if candidate_keys and all(isinstance(key, str) for key in candidate_keys):
+        candidate_keys = [candidate_keys]
+    return _write_normal_form(dataset, functional_dependencies, "3NF", output_dir, candidate_keys or None)
+
+def generate_3NF_queries(dataset, functional_dependencies, output_query_path):
+    """
+    Synthesize 3NF tables and write their DDL, data and verification report next to output_query_path.
+    """
+    return _write_normal_form(dataset, functional_dependencies, "3NF", os.path.dirname(output_query_path) or '.')
+
+def _write_normal_form(dataset, functional_dependencies, normal_form, output_dir, candidate_keys=None, join_dependencies=()):
+    result = Normalizer().normalize(dataset, Schema(dataset.keys(), functional_dependencies, (), join_dependencies,
+                                                    candidate_keys), normal_form)
+    result.write(output_dir)
+    return result
+
+def _cached_closure(model, closures, mask):
+    if mask not in closures:
+        closures[mask] = model.closure_mask(mask)
+    return closures[mask]
+
+def _determined_pair(model, relation, closures):
+    """
+    Find attributes A != B of a relation with A in the closure of relation - {A, B}.
+
+    A relation without such a pair is in BCNF (Tsou-Fischer), so the test rules
+    a relation in with |S|^2 closures. A pair does not prove a violation,
+    though: K -> A, B, C yields pairs while (K, A, B, C) is in BCNF.
+
+    Returns:
+        tuple: The (A, B) bit positions, or None when no pair exists.
+    """
+    bits = list(iter_bits(relation))
+    for a in bits:
+        for b in bits:
+            if a != b and _cached_closure(model, closures, relation & ~(1 << a) & ~(1 << b)) >> a & 1:
+                return a, b
+    return None
+
+def bcnf_violation(model, relation, closures=None):
+    """
+    Find the left-hand side of an FD that violates BCNF inside a subrelation.
+
+    The pair test answers most relations in polynomial time; only when it finds a
+    pair are the subsets of the relation searched, smallest first and skipping
+    supersets of superkeys, since deciding BCNF for a projection is coNP-complete.
+
+    Args:
+        model (DependencyModel): The compiled FDs of the whole schema.
+        relation (int): The subrelation's attribute mask.
+        closures (dict): Closure cache shared across subrelations.
+
+    Returns:
+        int: The violating left-hand side mask, or None when the relation is in BCNF.
+    """
+    if closures is None:
+        closures = {}
+    if _determined_pair(model, relation, closures) is None:
+        return None
+    bits = list(iter_bits(relation))
+    superkeys = []
+    for size in range(1, len(bits) - 1):
+        for combination in combinations(bits, size):
+            lhs = sum(1 << bit for bit in combination)
+            if any(lhs & key == key for key in superkeys):
+                continue
+            determined = _cached_closure(model, closures, lhs) & relation
+            if determined == relation:
+                superkeys.append(lhs)
+            elif determined != lhs:
+                return lhs
+    return None
+
+def bcnf_witness(model, relation, closures=None):
+    """
+    Look for a BCNF violation of a wide subrelation in polynomial time.
+
+    For every pair A, B with A in the closure of S - {A, B}, S - {A, B} is
+    shrunk to a minimal determinant X of A; X is a witness when X+ does not
+    cover S. Pairs already explained by a superkey determinant found earlier are
+    skipped. Only witnesses are ever split on, so a relation in BCNF is never
+    split, but a violation whose minimal determinants the greedy shrink does
+    not reach can be missed (the exact test is exponential).
+
+    Returns:
+        int: The left-hand side mask of a violating FD, or None when none was found.
+    """
+    if closures is None:
+        closures = {}
+    bits = list(iter_bits(relation))
+    superkeys = []
+    for a in bits:
+        for b in bits:
+            rest = relation & ~(1 << a) & ~(1 << b)
+            if a == b or any(key & rest == key and determined >> a & 1 for key, determined in superkeys):
+                continue
+            if not _cached_closure(model, closures, rest) >> a & 1:
+                continue
+            if _cached_closure(model, closures, rest) & relation != relation:
+                return rest
+            lhs = rest
+            for bit in iter_bits(rest):
+                if _cached_closure(model, closures, lhs & ~(1 << bit)) >> a & 1:
+                    lhs &= ~(1 << bit)
+            determined = _cached_closure(model, closures, lhs)
+            if determined & relation != relation:
+                return lhs
+            superkeys.append((lhs, determined))
+    return None
+
+def relation_key(model, relation, closures=None):
+    """
+    Shrink a subrelation's attributes to one of its keys under the schema's FDs.
+    """
+    if closures is None:
+        closures = {}
+    key = relation
+    for bit in iter_bits(relation):
+        if _cached_closure(model, closures, key & ~(1 << bit)) & relation == relation:
+            key &= ~(1 << bit)
+    return key
+
+def bcnf_decomposition(functional_dependencies, attributes):
+    """
+    Decompose a schema into BCNF.
+
+    Starting from the 3NF synthesis tables, a table S with a violating FD X -> Y
+    is split into X+ & S and X + (S - X+). Declared FDs are tried first, then the
+    projected ones via bcnf_violation; tables wider than BCNF_EXACT_ATTRIBUTES are
+    searched with bcnf_witness instead, so no table ever needs its 2^|S|
+    projected FDs. One closure cache serves every subrelation.
+
+    Returns:
+        list: (key, attributes) tuples of attribute name lists, key columns first.
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    closures = {}
+    pending = deque(model.mask(table) for _, table in synthesize_3nf(model, attributes))
+    relations = []
+    while pending:
+        relation = pending.popleft()
+        if _determined_pair(model, relation, closures) is None:
+            relations.append(relation)
+            continue
+        lhs = next((fd.lhs for fd in model.fds if fd.lhs & relation == fd.lhs
+                    and _cached_closure(model, closures, fd.lhs) & relation not in (fd.lhs, relation)), None)
+        if lhs is None:
+            if bin(relation).count('1') <= BCNF_EXACT_ATTRIBUTES:
+                lhs = bcnf_violation(model, relation, closures)
+            else:
+                lhs = bcnf_witness(model, relation, closures)
+        if lhs is None:
+            relations.append(relation)
+            continue
+        determined = _cached_closure(model, closures, lhs) & relation
+        pending.append(determined)
+        pending.append(relation & ~determined | lhs)
+
+    tables = []
+    for relation in relations:
+        if relation in tables or any(other != relation and relation & other == relation for other in relations):
+            continue
+        tables.append(relation)
+    result = []
+    for relation in tables:
+        key = relation_key(model, relation, closures)
+        result.append((model.names(key), model.names(key) + model.names(relation & ~key)))
+    return result
+
+def is_bcnf(relation, functional_dependencies):
+    """
+    Check that every non-trivial FD that holds inside the relation has a superkey on its left side.
+    """
+    model = compile_dependencies(functional_dependencies)
+    attributes = model.mask(relation['attributes'] if 'attributes' in relation else relation.keys())
+    return bcnf_violation(model, attributes) is None
+
+def decompose_to_bcnf(dataset, functional_dependencies, output_dir='.'):
+    """
+    Decompose the dataset into BCNF tables and write their DDL, data and verification report.
+    """
+    return _write_normal_form(dataset, functional_dependencies, "BCNF", output_dir)
+    
+#def decompose_to_4NF(relation, mvd, ck):
+    # Implement 4NF decomposition algorithm here
+    
+    # Initialize a list to store the decomposed relations
+    #decomposed_relations = [relation]
+
+    # Iterate over each MVD
+    #for X, Y in mvd:
+        # Check if X is a superkey (candidate key) for the relation
+       # if set(X).issuperset(set(ck)):
+            # Create a new relation with attributes in Y
+           # new_relation = list(set(Y))
+            # Add the new relation to the list of decomposed relations
+           # decomposed_relations.append(new_relation)
+            # Remove attributes in Y from the original relation
+            #relation = [attr for attr in relation if attr not in Y]
+            #return decomposed_relations
+def _row_keys(dataset, attributes):
+    """
+    Iterate over the encoded key of every row on some attributes: a bare code for one attribute, else a tuple.
+    """
+    columns = [dataset[attr].codes for attr in attributes]
+    if not columns:
+        return repeat((), dataset.row_count)
+    if len(columns) == 1:
+        return iter(columns[0])
+    return zip(*columns)
+
+def mvd_holds(dataset, lhs, rhs, rest):
+    """
+    Check the multivalued dependency lhs ->> rhs on the projection of a dataset onto lhs + rhs + rest.
+
+    Rows are grouped on lhs in one pass. Within a group the dependency holds
+    exactly when its distinct (rhs, rest) pairs number |distinct rhs| x
+    |distinct rest|, so the cross product is counted, never materialized.
+
+    Args:
+        dataset (ColumnStore): The encoded columns.
+        lhs (list): The determinant attribute names.
+        rhs (list): The dependent attribute names.
+        rest (list): The remaining attribute names of the relation.
+
+    Returns:
+        bool: True if the dependency holds on the data.
+    """
+    groups = {}
+    for x, y, z in zip(_row_keys(dataset, lhs), _row_keys(dataset, rhs), _row_keys(dataset, rest)):
+        group = groups.get(x)
+        if group is None:
+            group = groups[x] = (set(), set(), set())
+        group[0].add(y)
+        group[1].add(z)
+        group[2].add((y, z))
+    return all(len(ys) * len(zs) == len(pairs) for ys, zs, pairs in groups.values())
+
+def fourth_nf_decomposition(dataset, functional_dependencies):
+    """
+    Decompose a dataset's schema into 4NF.
+
+    The BCNF tables are split further on every declared MVD or FD X ->> Y whose
+    X is not a superkey of the table, whose Y and remainder Z are non-trivial
+    there, and which holds on the table's rows. X + Y and X + Z then rejoin
+    losslessly, and both halves are examined again.
+
+    Args:
+        dataset (ColumnStore): The encoded columns.
+        functional_dependencies (list): FD strings or a compiled DependencyModel carrying the MVDs.
+
+    Returns:
+        list: (key, attributes) tuples of attribute name lists, key columns first.
+    """
+    model = compile_dependencies(functional_dependencies, dataset.keys())
+    closures = {}
+    candidates = model.mvds + [(fd.lhs, fd.rhs) for fd in model.fds]
+    pending = deque(model.mask(table) for _, table in bcnf_decomposition(model, dataset.keys()))
+    # MVDs already rejected on a table's data are not checked again
+    rejected = set()
+    relations = []
+    while pending:
+        relation = pending.popleft()
+        for lhs, rhs in candidates:
+            dependent = rhs & relation & ~lhs
+            rest = relation & ~lhs & ~dependent
+            if lhs & relation != lhs or not dependent or not rest or (relation, lhs, dependent) in rejected:
+                continue
+            if _cached_closure(model, closures, lhs) & relation == relation:
+                continue
+            if mvd_holds(dataset, model.names(lhs), model.names(dependent), model.names(rest)):
+                pending.append(lhs | dependent)
+                pending.append(lhs | rest)
+                break
+            rejected.add((relation, lhs, dependent))
+        else:
+            relations.append(relation)
+
+    result = []
+    for relation in relations:
+        if any(other != relation and relation & other == relation for other in relations):
+            continue
+        key = relation_key(model, relation, closures)
+        if (model.names(key), model.names(key) + model.names(relation & ~key)) not in result:
+            result.append((model.names(key), model.names(key) + model.names(relation & ~key)))
+    return result
+
+def decompose_to_4NF(dataset, functional_dependencies, output_dir='.'):
+    """
+    Decompose the dataset into 4NF tables and write their DDL, data and verification report.
+
+    The MVDs travel in the compiled DependencyModel passed as functional_dependencies.
+    """
+    return _write_normal_form(dataset, functional_dependencies, "4NF", output_dir)
+
+def parse_join_dependencies(file_path):
+    """
+    Parse join dependencies from a text file, one per line with components separated by "|".
+
+    A line such as "Agent, Company | Company, Product | Agent, Product" states
+    that the relation is the join of those three projections.
+
+    Returns:
+        list: One list of components (lists of attribute names) per join dependency.
+    """
+    dependencies = []
+    try:
+        with open(file_path, 'r') as file:
+            for line in file:
+                components = [[attr.strip() for attr in component.split(',') if attr.strip()]
+                              for component in line.split('|')]
+                components = [component for component in components if component]
+                if components:
+                    dependencies.append(components)
+    except FileNotFoundError:
+        print("Error: Join dependencies file not found.")
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+    return dependencies
+
+def hash_join(relations):
+    """
+    Natural-join (attributes, rows) relations with a pipelined hash join.
+
+    The smallest relation drives the join and every other one is hashed on the
+    attributes it shares with those before it, chosen greedily by overlap. A
+    relation adding no attributes of its own is folded into the step that binds
+    them, as a set intersection, instead of filtering that step's output row by
+    row. Output rows are produced depth-first, so only the hash tables are held
+    in memory and a caller can stop consuming at any point.
+
+    Args:
+        relations (list): (attributes, rows) pairs; rows are tuples aligned with the attributes.
+            Rows must be distinct.
+
+    Returns:
+        tuple: (joined attributes, generator of joined row tuples)
+    """
+    remaining = sorted(relations, key=lambda relation: len(relation[1]))
+    first_attributes, first_rows = remaining.pop(0)
+    attributes = list(first_attributes)
+    plan = []
+    while remaining:
+        joined = set(attributes)
+        relation = max(remaining, key=lambda relation: len(joined.intersection(relation[0])))
+        remaining.remove(relation)
+        relation_attributes, rows = relation
+        new = [attr for attr in relation_attributes if attr not in joined]
+        joined.update(new)
+        # Relations covered by the attributes bound so far that include every new one
+        filters = [other for other in remaining if new and joined.issuperset(other[0]) and set(new) <= set(other[0])]
+        step = []
+        for step_attributes, step_rows in [relation] + filters:
+            shared = [i for i, attr in enumerate(step_attributes) if attr not in new]
+            extra = [step_attributes.index(attr) for attr in new]
+            index = defaultdict(set)
+            for row in step_rows:
+                index[tuple(row[i] for i in shared)].add(tuple(row[i] for i in extra))
+            step.append(([attributes.index(step_attributes[i]) for i in shared], index))
+            if step_attributes is not relation_attributes:
+                remaining.remove((step_attributes, step_rows))
+        plan.append(step)
+        attributes.extend(new)
+
+    empty = frozenset()
+
+    def extend(row, step):
+        if step == len(plan):
+            yield row
+            return
+        matches = None
+        for positions, index in plan[step]:
+            found = index.get(tuple(row[i] for i in positions), empty)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return
+        for extra in matches:
+            yield from extend(row + extra, step + 1)
+
+    def rows():
+        for row in first_rows:
+            yield from extend(tuple(row), 0)
+
+    return attributes, rows()
+
+def _pair_join_size(left, right):
+    """
+    Count the rows of the join of two (attributes, rows) relations from their group sizes on the shared attributes.
+    """
+    shared = [attr for attr in left[0] if attr in right[0]]
+    if not shared:
+        return len(left[1]) * len(right[1])
+    sizes = [Counter(map(itemgetter(*(attributes.index(attr) for attr in shared)), rows))
+             for attributes, rows in (left, right)]
+    return sum(count * sizes[1].get(key, 0) for key, count in sizes[0].items())
+
+def join_dependency_holds(dataset, components):
+    """
+    Check a join dependency against the data without materializing the join.
+
+    The join of the projections always contains the projection onto their
+    union, so the dependency holds exactly when both have the same size. The
+    join of any two projections covering the union bounds the full join from
+    above and its size follows from group counts, so such a pair no larger than
+    the projection settles the question in linear time. Otherwise the
+    projections are hash-joined on their encoded columns and counting stops at
+    the first row past that size: a spurious tuple.
+
+    Args:
+        dataset (ColumnStore): The encoded columns.
+        components (list): Lists of attribute names.
+
+    Returns:
+        bool: True if the data is the join of its projections onto the components.
+    """
+    union = list(OrderedDict.fromkeys(attr for component in components for attr in component))
+    if any(len(component) == len(union) for component in components):
+        return True
+    expected = len(set(zip(*(dataset[attr].codes for attr in union))))
+    relations = [(component, set(zip(*(dataset[attr].codes for attr in component)))) for component in components]
+    for left, right in combinations(relations, 2):
+        if len(set(left[0]) | set(right[0])) == len(union) and _pair_join_size(left, right) <= expected:
+            return True
+    _, rows = hash_join(relations)
+    return sum(1 for _ in islice(rows, expected + 1)) == expected
+
+def ternary_join_dependencies(attributes):
+    """
+    Enumerate the cyclic join dependencies *(R - A, R - B, R - C) of a relation, one per attribute triple.
+    """
+    return [[[attr for attr in attributes if attr != left] for left in triple]
+            for triple in combinations(attributes, 3)]
+
+def _implied_by_keys(model, relation, components, closures):
+    """
+    Check whether a join dependency follows from a relation's keys (Fagin's membership test).
+
+    Components whose intersection is a superkey of the relation are merged
+    until no pair is left; the dependency is implied when one covers the relation.
+    """
+    components = list(components)
+    merged = True
+    while merged:
+        merged = False
+        for left, right in combinations(components, 2):
+            if _cached_closure(model, closures, left & right) & relation == relation:
+                components.remove(left)
+                components.remove(right)
+                components.append(left | right)
+                merged = True
+                break
+    return any(component & relation == relation for component in components)
+
+def fifth_nf_decomposition(dataset, functional_dependencies, join_dependencies=()):
+    """
+    Decompose a dataset's schema into 5NF.
+
+    The 4NF tables are split into the components of any join dependency that
+    holds on their rows and is not implied by their keys. Declared join
+    dependencies covering a table are tried first; the ternary ones are only
+    enumerated for all-key tables, since on a keyed table they mostly hold by
+    coincidence of small data. Every component is examined again.
+
+    Args:
+        dataset (ColumnStore): The encoded columns.
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        join_dependencies (list): Declared join dependencies as lists of components.
+
+    Returns:
+        tuple: ((key, attributes) tuples key columns first, the join dependencies applied)
+    """
+    model = compile_dependencies(functional_dependencies, dataset.keys())
+    closures = {}
+    declared = [[model.mask(component) for component in components] for components in join_dependencies]
+    pending = deque(model.mask(table) for _, table in fourth_nf_decomposition(dataset, model))
+    relations = []
+    applied = []
+    while pending:
+        relation = pending.popleft()
+        candidates = [components for components in declared
+                      if reduce(or_, components, 0) == relation and relation not in components]
+        if relation_key(model, relation, closures) == relation:
+            candidates += [[model.mask(component) for component in components]
+                           for components in ternary_join_dependencies(model.names(relation))]
+        for components in candidates:
+            if _implied_by_keys(model, relation, components, closures):
+                continue
+            if join_dependency_holds(dataset, [model.names(component) for component in components]):
+                pending.extend(components)
+                applied.append([model.names(component) for component in components])
+                break
+        else:
+            relations.append(relation)
+
+    result = []
+    for relation in relations:
+        if any(other != relation and relation & other == relation for other in relations):
+            continue
+        key = relation_key(model, relation, closures)
+        if (model.names(key), model.names(key) + model.names(relation & ~key)) not in result:
+            result.append((model.names(key), model.names(key) + model.names(relation & ~key)))
+    return result, applied
+
+def decompose_to_5NF(dataset, functional_dependencies, join_dependencies=(), output_dir='.'):
+    """
+    Decompose the dataset into 5NF tables and write their DDL, data and verification report.
+    """
+    return _write_normal_form(dataset, functional_dependencies, "5NF", output_dir, None, join_dependencies)
+
+    
+def create_table_query(name, attributes, key, data):
+    """
+    Render the CREATE TABLE statement of a table, typing each column from its profile in data.
+
+    Key columns are always NOT NULL (see ColumnProfile.not_null).
+    """
+    columns = []
+    for attr in attributes:
+        profile = profile_column(data[attr])
+        if attr in key:
+            profile = profile.not_null()
+        columns.append(f"{attr} {profile.sql_type}" + ("" if profile.nullable else " NOT NULL"))
+    query = f"CREATE TABLE {name} (\n"
+    query += ',\n'.join(columns)
+    query += f",\nPRIMARY KEY ({', '.join(key)})"
+    return query + ');\n'
+
+def generate_bcnf_query(decomposed_tables, output_query_path, normal_form="BCNF"):
+    queries = []
+    for idx, table_info in enumerate(decomposed_tables):
+        # Skip tables with no data
+        if not table_info['data']:
+            continue
+        queries.append(create_table_query(table_info['relation_name'], table_info['attributes'],
+                                          table_info.get('key', table_info['attributes'][:1]), table_info['data']))
+    # Write queries to a file
+
+    with open(output_query_path, 'a') as query_file:
+        query_file.write(f"\n{normal_form} Queries:\n")
+        query_file.write('\n'.join(queries))
+
+    print(f"Data has been written to {output_query_path}")
+    return queries
+
+
+def generate_query(table_attributes,dataset,keys=None,output_query_path=QUERY_OUTPUT_PATH):  #function to generate queries for decomposed tables
+    queries = []
+    # Generate CREATE TABLE queries, typing every attribute from its column profile
+    for name, attributes in table_attributes.items():
+        attributes = [col.strip() for col in attributes]
+        key = keys[name] if keys and name in keys else attributes[:1]
+        queries.append(create_table_query(name, attributes, [col.strip() for col in key], dataset))
+    write_to_query_file(queries, output_query_path)
     print(f"Data has been written to {output_query_path}")
+    return queries
+
+def _normalize_value(value, profile):
+    """
+    Return the value as it should be loaded (ISO dates), or None for a null.
+
+    Only columns whose profile is nullable load nulls; the null markers of a
+    NOT NULL column are kept as text.
+    """
+    if profile.nullable and value in NULL_VALUES:
+        return None
+    if profile.kind == DATE and '/' in value:
+        return datetime.strptime(value, '%m/%d/%Y').strftime('%Y-%m-%d')
+    return value
+
+def _sql_literal(value, profile):
+    value = _normalize_value(value, profile)
+    if value is None:
+        return "NULL"
+    if profile.kind in (INT, BIGINT, DECIMAL):
+        return value
+    return "'" + value.replace("'", "''") + "'"
+
+def _copy_field(value, profile):
+    value = _normalize_value(value, profile)
+    if value is None:
+        return "\\N"
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def _csv_field(value, profile):
+    value = _normalize_value(value, profile)
+    return '' if value is None else value
+
+def _rendered_rows(table, render):
+    """
+    Yield the table's rows with every value rendered once per distinct value.
+    """
+    columns = []
+    for values in table.values():
+        profile = profile_column(values)
+        if isinstance(values, EncodedColumn):
+            rendered = [render(value, profile) for value in values.dictionary]
+            columns.append(map(rendered.__getitem__, values.codes))
+        else:
+            columns.append(render(value, profile) for value in values)
+    return zip(*columns)
+
+def write_table_data(file, table_name, table, data_format=DATA_FORMAT, batch_size=INSERT_BATCH_SIZE, header=True):
+    """
+    Stream one table's rows to an open file as bulk-load statements or CSV.
+
+    Args:
+        file: A text file opened for writing.
+        table_name (str): The target table.
+        table (ColumnStore or dict): The table's columns.
+        data_format (str): "insert" for multi-row INSERT batches, "copy" for a
+            PostgreSQL COPY ... FROM stdin block, or "csv" for a header plus rows.
+        batch_size (int): Rows per INSERT statement.
+        header (bool): Whether CSV output starts with the column names.
+
+    Returns:
+        int: The number of rows written.
+    """
+    columns = ', '.join(table.keys())
+    written = 0
+    if data_format == "insert":
+        rows = _rendered_rows(table, _sql_literal)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            file.write(f"INSERT INTO {table_name} ({columns}) VALUES\n")
+            file.write(',\n'.join(f"({', '.join(row)})" for row in batch))
+            file.write(";\n")
+            written += len(batch)
+    elif data_format == "copy":
+        file.write(f"COPY {table_name} ({columns}) FROM stdin;\n")
+        for row in _rendered_rows(table, _copy_field):
+            file.write('\t'.join(row) + '\n')
+            written += 1
+        file.write("\\.\n")
+    elif data_format == "csv":
+        csv_writer = csv.writer(file)
+        if header:
+            csv_writer.writerow(table.keys())
+        for row in _rendered_rows(table, _csv_field):
+            csv_writer.writerow(row)
+            written += 1
+    else:
+        raise ValueError(f"Unknown data format: {data_format}")
+    return written
+
+def write_decomposed_data(decomposed_tables, output_path=DATA_OUTPUT_PATH, data_format=DATA_FORMAT, batch_size=INSERT_BATCH_SIZE):
+    """
+    Write the rows of every decomposed table for bulk loading.
+
+    INSERT and COPY output goes to one script at output_path; CSV output goes
+    to one <table>.csv file per table inside the output_path directory.
+
+    Args:
+        decomposed_tables (dict): Table names mapped to their columns.
+        output_path (str): The script file, or the directory for CSV files.
+        data_format (str): "insert", "copy" or "csv".
+        batch_size (int): Rows per INSERT statement.
+    """
+    if data_format == "csv":
+        os.makedirs(output_path, exist_ok=True)
+        for table_name, table in decomposed_tables.items():
+            path = os.path.join(output_path, f"{table_name}.csv")
+            with open(path, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+                write_table_data(file, table_name, table, data_format, batch_size)
+    else:
+        with open(output_path, 'w', buffering=WRITE_BUFFER_SIZE) as file:
+            for table_name, table in decomposed_tables.items():
+                write_table_data(file, table_name, table, data_format, batch_size)
+
+def load_into_sqlite(database_path, queries, tables, dataset=None, transaction_rows=SQLITE_TRANSACTION_ROWS):
+    """
+    Create the decomposed schema in SQLite, bulk-load its rows and check the join is lossless.
+
+    The database runs in WAL mode with synchronous writes off while loading;
+    rows go in through executemany, transaction_rows at a time per
+    transaction. When the source dataset is given, the tables are joined back
+    together in SQL on their shared columns and the distinct joined rows are
+    counted against the distinct source rows. The join compares with IS, so
+    empty values, which load as NULL, still match each other.
+
+    Args:
+        database_path (str): The SQLite database file.
+        queries (list): CREATE TABLE statements for the tables.
+        tables (dict): Table names mapped to their columns.
+        dataset (ColumnStore or dict): The source table, for the lossless-join check.
+        transaction_rows (int): Rows inserted per transaction.
+
+    Returns:
+        dict: Rows per table, load time and throughput, and the join check results.
+    """
+    import sqlite3
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA cache_size=-65536")
+        for table_name in tables:
+            connection.execute(f"DROP TABLE IF EXISTS {table_name}")
+        for query in queries:
+            connection.execute(query)
+
+        report = {'tables': {}, 'rows': 0}
+        start = time.perf_counter()
+        for table_name, table in tables.items():
+            insert = f"INSERT INTO {table_name} ({', '.join(table.keys())}) VALUES ({', '.join('?' * len(table))})"
+            rows = _rendered_rows(table, _normalize_value)
+            loaded = 0
+            while True:
+                batch = list(islice(rows, transaction_rows))
+                if not batch:
+                    break
+                connection.execute("BEGIN")
+                connection.executemany(insert, batch)
+                connection.execute("COMMIT")
+                loaded += len(batch)
+            report['tables'][table_name] = loaded
+            report['rows'] += loaded
+        report['seconds'] = time.perf_counter() - start
+        report['rows_per_second'] = report['rows'] / report['seconds'] if report['seconds'] else 0.0
+
+        if dataset is not None and tables:
+            attributes = list(OrderedDict.fromkeys(attr for table in tables.values() for attr in table.keys()))
+            report['source_rows'] = project_distinct(dataset, attributes).row_count
+            report['joined_rows'] = connection.execute(
+                f"SELECT COUNT(*) FROM ({_join_query(tables)})").fetchone()[0]
+            report['lossless'] = report['joined_rows'] == report['source_rows']
+        return report
+    finally:
+        connection.close()
+
+def _join_query(tables):
+    """
+    Render a SELECT DISTINCT of every column over the tables joined on their shared columns.
+
+    The tables are ordered so each one shares a column with those before it.
+    A NATURAL JOIN would drop rows whose shared columns are NULL, so every
+    shared column is compared NULL-safely with IS against the first table
+    that holds it.
+    """
+    remaining = list(tables)
+    first = remaining.pop(0)
+    source = {attr: first for attr in tables[first].keys()}
+    query = first
+    while remaining:
+        table_name = next((name for name in remaining if source.keys() & tables[name].keys()), remaining[0])
+        remaining.remove(table_name)
+        shared = [attr for attr in tables[table_name].keys() if attr in source]
+        conditions = ' AND '.join(f"{table_name}.{attr} IS {source[attr]}.{attr}" for attr in shared)
+        query += f" JOIN {table_name} ON {conditions or '1'}"
+        for attr in tables[table_name].keys():
+            source.setdefault(attr, table_name)
+    return f"SELECT DISTINCT {', '.join(f'{table_name}.{attr}' for attr, table_name in source.items())} FROM {query}"
+
+def chase_lossless_join(attributes, components, functional_dependencies, join_dependencies=()):
+    """
+    Decide whether a decomposition is a lossless join by chasing its tableau.
+
+    The tableau has one row per component, holding the distinguished symbol 0
+    in the component's columns and a fresh symbol elsewhere. Each FD X -> Y
+    hashes the rows by their X symbols and equates the Y symbols within each
+    bucket (the distinguished symbol wins), using one union-find over all
+    symbols. Each MVD X ->> Y adds, for every two rows agreeing on X, the row
+    taking X + Y from the first and the rest from the second. Each join
+    dependency over T adds a row, fresh outside T, for every T-tuple in the join
+    of the rows' projections that no row has yet. The join is lossless once some
+    row is entirely distinguished.
+
+    Returns:
+        tuple: (lossless, number of chase rounds)
+    """
+    model = compile_dependencies(functional_dependencies, attributes)
+    relation = model.mask(attributes)
+    columns = list(iter_bits(relation))
+    width = len(model.attributes)
+    rows = []
+    for i, component in enumerate(components):
+        mask = model.mask(component)
+        rows.append([0 if mask >> bit & 1 else i * width + bit + 1 for bit in range(width)])
+    fds = [(list(iter_bits(fd.lhs)), list(iter_bits(fd.rhs & relation & ~fd.lhs)))
+           for fd in model.fds if not fd.lhs & ~relation]
+    mvds = [(list(iter_bits(lhs)), lhs | rhs) for lhs, rhs in model.mvds if not lhs & ~relation]
+    jds = [[list(iter_bits(model.mask(component))) for component in components] for components in join_dependencies]
+    fresh = len(rows) * width + 1
+    parent = {}
+
+    def find(symbol):
+        root = symbol
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while symbol != root:
+            parent[symbol], symbol = root, parent[symbol]
+        return root
+
+    def lossless():
+        return any(all(find(row[bit]) == 0 for bit in columns) for row in rows)
+
+    rounds = 0
+    changed = True
+    while changed and not lossless():
+        changed = False
+        rounds += 1
+        for lhs, rhs in fds:
+            buckets = defaultdict(list)
+            for row in rows:
+                buckets[tuple(find(row[bit]) for bit in lhs)].append(row)
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                for bit in rhs:
+                    symbols = {find(row[bit]) for row in bucket}
+                    if len(symbols) > 1:
+                        target = min(symbols)
+                        for symbol in symbols - {target}:
+                            parent[symbol] = target
+                        changed = True
+        for lhs, taken in mvds:
+            seen = {tuple(find(symbol) for symbol in row) for row in rows}
+            buckets = defaultdict(list)
+            for row in rows:
+                buckets[tuple(find(row[bit]) for bit in lhs)].append(row)
+            for bucket in buckets.values():
+                for first in bucket:
+                    for second in bucket:
+                        row = [first[bit] if taken >> bit & 1 else second[bit] for bit in range(width)]
+                        normalized = tuple(find(symbol) for symbol in row)
+                        if normalized not in seen:
+                            seen.add(normalized)
+                            rows.append(row)
+                            changed = True
+        for components in jds:
+            joined_attributes, joined = hash_join([(component, {tuple(find(row[bit]) for bit in component) for row in rows})
+                                                   for component in components])
+            seen = {tuple(find(row[bit]) for bit in joined_attributes) for row in rows}
+            for symbols in list(joined):
+                if symbols in seen:
+                    continue
+                seen.add(symbols)
+                row = list(range(fresh, fresh + width))
+                fresh += width
+                for bit, symbol in zip(joined_attributes, symbols):
+                    row[bit] = symbol
+                rows.append(row)
+                changed = True
+    return lossless(), rounds
+
+def lost_dependencies(components, functional_dependencies):
+    """
+    Find the FDs a decomposition does not preserve (restricted-closure test).
+
+    For X -> Y, Z starts at X and repeatedly absorbs closure(Z & R) & R for
+    every component R; the FD is preserved when Y ends up inside Z. No
+    projected FD set is ever built, and closures are memoized across FDs.
+
+    Returns:
+        list: FunctionalDependency objects that are not preserved.
+    """
+    model = compile_dependencies(functional_dependencies)
+    masks = [model.mask(component) for component in components]
+    closures = {}
+    lost = []
+    for fd in model.fds:
+        reach = fd.lhs
+        changed = True
+        while changed and fd.rhs & ~reach:
+            changed = False
+            for mask in masks:
+                inside = reach & mask
+                if inside not in closures:
+                    closures[inside] = model.closure_mask(inside)
+                gained = closures[inside] & mask & ~reach
+                if gained:
+                    reach |= gained
+                    changed = True
+                    if not fd.rhs & ~reach:
+                        break
+        if fd.rhs & ~reach:
+            lost.append(fd)
+    return lost
+
+def verify_decomposition(attributes, components, functional_dependencies, report_path=None, join_dependencies=()):
+    """
+    Check a decomposition for a lossless join and dependency preservation.
+
+    Args:
+        attributes (iterable): The attributes of the original relation.
+        components (dict): Table names mapped to their attribute lists.
+        functional_dependencies (list): FD strings or a compiled DependencyModel.
+        report_path (str): Optional JSON file the report is written to.
+        join_dependencies (list): Join dependencies known to hold, as lists of components.
+
+    Returns:
+        dict: "lossless", "chase_rounds", "dependency_preserving",
+        "lost_dependencies" (as "X -> Y" strings), "tables" and "seconds".
+    """
+    start = time.perf_counter()
+    model = compile_dependencies(functional_dependencies, attributes)
+    lossless, rounds = chase_lossless_join(attributes, list(components.values()), model, join_dependencies)
+    lost = lost_dependencies(list(components.values()), model)
+    report = {
+        'lossless': lossless,
+        'chase_rounds': rounds,
+        'dependency_preserving': not lost,
+        'lost_dependencies': [f"{', '.join(model.names(fd.lhs))} -> {', '.join(model.names(fd.rhs))}" for fd in lost],
+        'tables': {name: list(attrs) for name, attrs in components.items()},
+        'seconds': time.perf_counter() - start,
+    }
+    if report_path:
+        with open(report_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
+
+class ParseCache:
+    """
+    Parse results pickled on disk, keyed by the paths, sizes and mtimes of the files they came from.
+
+    Editing an input (or this script) changes the key, so a stale entry is
+    never read; old entries are pruned, least recently written first, once
+    there are more than max_entries. Entries that cannot be read or written
+    count as misses, and a cache without a directory never hits. Unpickling
+    runs arbitrary code, so only entries owned by the current user in a
+    directory no one else can write to are read.
+    """
+
+    def __init__(self, directory=PARSE_CACHE_DIR, max_entries=PARSE_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(kind, paths, *extra):
+        """
+        Build the key of a parse result from the files it was read from and any other inputs.
+        """
+        # Pickles refer to classes by module, so a script run and an import keep separate entries
+        parts = [kind, __name__]
+        for path in (__file__,) + tuple(paths):
+            if path and os.path.exists(path):
+                status = os.stat(path)
+                parts.append([os.path.abspath(path), status.st_size, status.st_mtime_ns])
+            else:
+                parts.append(path)
+        parts.extend(extra)
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _trusted(status):
+        if not hasattr(os, 'getuid'):
+            return True
+        return status.st_uid == os.getuid() and not status.st_mode & 0o022
+
+    def get(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, key + '.pickle'), 'rb') as file:
+                if not (self._trusted(os.stat(self.directory)) and self._trusted(os.fstat(file.fileno()))):
+                    return None
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def put(self, key, value):
+        if not self.directory:
+            return
+        temporary = os.path.join(self.directory, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.makedirs(self.directory, 0o700, exist_ok=True)
+            with open(temporary, 'wb', opener=lambda path, flags: os.open(path, flags, 0o600)) as file:
+                pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, os.path.join(self.directory, key + '.pickle'))
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.pickle')]
+            if len(entries) > self.max_entries:
+                entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+                for entry in entries[:len(entries) - self.max_entries]:
+                    os.remove(entry.path)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            # Caching is best effort: a read-only directory or an unpicklable value only costs the speed-up
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
+
+    def cached(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+
+class StageRecorder:
+    """
+    Record the wall time, CPU time, allocations and sizes of each pipeline stage of one run.
+
+    Stages are entered with "with recorder.stage(name, rows=...) as stage:";
+    counts known only at the end can be added to the yielded dict. Used as a
+    context manager the recorder traces allocations (tracemalloc) and, with a
+    profile path, runs cProfile over the whole run. Stages must not nest, as
+    each one resets the traced peak.
+    """
+
+    def __init__(self, profile_path=None, trace_memory=True):
+        self.stages = []
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.profiler = None
+        self.started = None
+        self.elapsed = None
+
+    def __enter__(self):
+        # Profiling and tracing are only imported by runs that ask for them
+        import cProfile
+        import tracemalloc
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        else:
+            self.trace_memory = False
+        if self.profile_path:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.started = (time.perf_counter(), time.process_time())
+        return self
+
+    def _since_start(self):
+        return time.perf_counter() - self.started[0], time.process_time() - self.started[1]
+
+    def __exit__(self, *exc_info):
+        self.elapsed = self._since_start()
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        return False
+
+    @contextlib.contextmanager
+    def stage(self, name, **counts):
+        import tracemalloc
+        counts = dict(name=name, **counts)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield counts
+        finally:
+            counts['seconds'] = time.perf_counter() - start
+            counts['cpu_seconds'] = time.process_time() - cpu
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                counts['allocated_bytes'] = current - before
+                counts['peak_bytes'] = peak - before
+            self.stages.append(counts)
+
+    def report(self, top=20, **details):
+        """
+        Assemble the run report: the given details, every stage, totals and the profile's hottest functions.
+
+        Called while the recorder is still running, the totals are the time so
+        far and the profile, which is only written on exit, is left out.
+        """
+        report = dict(details, stages=self.stages)
+        if self.started:
+            report['seconds'], report['cpu_seconds'] = self.elapsed or self._since_start()
+        if self.profiler and self.elapsed:
+            import pstats
+            statistics = pstats.Stats(self.profile_path)
+            functions = sorted(statistics.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            report['profile'] = {'path': self.profile_path, 'functions': [
+                {'function': f"{os.path.basename(file)}:{line}({function})", 'calls': calls,
+                 'own_seconds': own, 'cumulative_seconds': cumulative}
+                for (file, line, function), (_, calls, own, cumulative, _) in functions]}
+        return report
+
+
+class _NullRecorder:
+    """
+    A recorder that records nothing; stages cost one context manager each.
+    """
+    stages = ()
+
+    def stage(self, name, **counts):
+        return contextlib.nullcontext(counts)
 
+NULL_RECORDER = _NullRecorder()
 
-def generate_query(table_attributes,dataset):  #function to generate queries for decomposed tables
-    queries = []
-    # Generate CREATE TABLE queries
-    for table_name, attributes in table_attributes.items():
-        attributes = list(attributes)
-        #print(attributes)
-        # Determine data types for attributes
-        data_types = [determine_data_type(dataset[col.strip()]) for col in attributes]
-
-        # Create the new table
-        new_table = f"CREATE TABLE {table_name} (\n"
-        new_table += ',\n'.join(f'{col.strip()} {data_type}' for col, data_type in zip(attributes, data_types))
-        new_table += f",\nPRIMARY KEY ({attributes[0].strip()})"
-        new_table += ');\n'
-        queries.append(new_table)
-    output_query_path = "query.txt"
-    write_to_query_file(queries,output_query_path)
-    print(f"Data has been written to {output_query_path}")
 
-def find_highest_normal_form(dataset, functional_dependencies):
-    # Implement the logic to find the highest normal form here.
-    # This part depends on your specific project requirements.
+def check_dependency_attributes(attributes, functional_dependencies=(), multivalued_dependencies=(),
+                                join_dependencies=(), candidate_keys=None):
+    """
+    Check that every dependency and key only names attributes of the relation.
+
+    Raises:
+        ValueError: Naming the unknown attributes, in the order they first appear.
+    """
+    known = set(attributes)
+    named = []
+    if isinstance(functional_dependencies, DependencyModel):
+        named += functional_dependencies.attributes
+        functional_dependencies = ()
+    for fd in list(functional_dependencies) + list(multivalued_dependencies):
+        if isinstance(fd, str):
+            lhs, rhs = parse_fd(fd)
+            named += lhs + rhs
+    named += [attr for components in join_dependencies for component in components for attr in component]
+    named += [attr for key in candidate_keys or () for attr in ([key] if isinstance(key, str) else key)]
+    unknown = [attr for attr in OrderedDict.fromkeys(named) if attr not in known]
+    if unknown:
+        raise ValueError(f"Unknown attributes: {', '.join(unknown)}")
+
+
+class Schema:
+    """
+    A relation's attributes and dependencies, compiled once.
+
+    The DependencyModel is built and frozen in the constructor, so it is only
+    read afterwards and one Schema can back any number of concurrent
+    normalizations. Candidate keys are derived on first use unless they are
+    given; concurrent first uses may both derive them, with the same result.
+    Dependencies or keys naming attributes the relation does not have raise
+    ValueError (see check_dependency_attributes).
+    """
+
+    def __init__(self, attributes, functional_dependencies=(), multivalued_dependencies=(), join_dependencies=(),
+                 candidate_keys=None):
+        self.attributes = list(attributes)
+        check_dependency_attributes(self.attributes, functional_dependencies, multivalued_dependencies,
+                                    join_dependencies, candidate_keys)
+        self.model = compile_dependencies(functional_dependencies, self.attributes, multivalued_dependencies).freeze()
+        self.join_dependencies = [[list(component) for component in components] for components in join_dependencies]
+        self._candidate_keys = candidate_keys
+
+    @classmethod
+    def from_files(cls, attributes, fd_path, mvd_path=None, jd_path=None, candidate_keys=None):
+        """
+        Read a schema's dependencies from the CLI's text files; missing optional files are skipped.
+        """
+        return cls(attributes, parse_functional_dependencies(fd_path),
+                   parse_mvd_dependencies(mvd_path) if mvd_path else (),
+                   parse_join_dependencies(jd_path) if jd_path else (), candidate_keys)
+
+    @property
+    def candidate_keys(self):
+        if self._candidate_keys is None:
+            self._candidate_keys = find_candidate_keys(self.model, self.attributes)
+        return self._candidate_keys
+
+    def __repr__(self):
+        return f"Schema({', '.join(self.attributes)}; {len(self.model.fds)} FDs, {len(self.model.mvds)} MVDs)"
+
+
+class Table:
+    """
+    One decomposed table: its name, key, columns and distinct rows.
+    """
+    __slots__ = ('name', 'key', 'attributes', 'data')
+
+    def __init__(self, name, key, attributes, data):
+        self.name = name
+        self.key = key
+        self.attributes = attributes
+        self.data = data
+
+    def __repr__(self):
+        return f"Table({self.name}: {', '.join(self.attributes)}; key {', '.join(self.key)}; {self.data.row_count} rows)"
+
+
+def _key_columns_not_null(tables):
+    """
+    Give every column that is part of some table's key a NOT NULL profile in every table holding it.
+
+    Its empty values are then loaded as text wherever the column appears, so
+    primary keys never hold NULL and the tables still join on them. The
+    tables get new column stores; the projected columns are not modified.
+    """
+    nullable = {attr for table in tables for attr in table.key if profile_column(table.data[attr]).nullable}
+    if not nullable:
+        return
+    for table in tables:
+        columns = []
+        for attr, column in table.data.items():
+            if attr in nullable:
+                column = EncodedColumn.from_codes(column.codes, column)
+                column.profile = profile_column(table.data[attr]).not_null()
+            columns.append((attr, column))
+        table.data = ColumnStore(columns)
+
+
+class NormalizationResult:
+    """
+    The outcome of normalizing one dataset.
+
+    Attributes:
+        normal_form (str): The normal form that was asked for.
+        satisfied (bool): True when the dataset already was in that normal form.
+        tables (list): The decomposed Table objects (empty when nothing was decomposed).
+        queries (list): CREATE TABLE statements.
+        verification (dict): verify_decomposition's report, or None without tables.
+        candidate_keys (list): The keys the decomposition used.
+        join_dependencies (list): The join dependencies a 5NF decomposition applied.
+        sqlite_report (dict): load_into_sqlite's report from the last write() with a database, or None.
+    """
+
+    def __init__(self, dataset, normal_form, satisfied, tables, queries, verification, candidate_keys,
+                 join_dependencies=()):
+        self.dataset = dataset
+        self.normal_form = normal_form
+        self.satisfied = satisfied
+        self.tables = tables
+        self.queries = queries
+        self.verification = verification
+        self.candidate_keys = candidate_keys
+        self.join_dependencies = join_dependencies
+        self.sqlite_report = None
+
+    def to_dict(self):
+        """
+        Summarize the result as JSON-serializable data (the table rows are left out).
+        """
+        return {
+            'normal_form': self.normal_form,
+            'satisfied': self.satisfied,
+            'candidate_keys': self.candidate_keys,
+            'tables': [{'name': table.name, 'key': table.key, 'attributes': table.attributes,
+                        'rows': table.data.row_count} for table in self.tables],
+            'queries': self.queries,
+            'verification': self.verification,
+            'join_dependencies': self.join_dependencies,
+        }
+
+    def write(self, output_dir='.', data_format=DATA_FORMAT, batch_size=INSERT_BATCH_SIZE, sqlite_path=None,
+              transaction_rows=SQLITE_TRANSACTION_ROWS, recorder=NULL_RECORDER):
+        """
+        Write the result's files into a directory.
+
+        The DDL is appended to query.txt under a "<normal form> Queries:" header,
+        the table rows go to data.sql (or one CSV per table under data/) and the
+        report to verification.json; with sqlite_path the tables are also loaded
+        into that database and load_into_sqlite's throughput and lossless-join
+        report is kept in sqlite_report. Each file is a stage of recorder.
+
+        Returns:
+            dict: The paths written, keyed by "queries", "data", "verification" and "sqlite".
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        written = {}
+        if self.queries:
+            written['queries'] = os.path.join(output_dir, QUERY_OUTPUT_PATH)
+            with recorder.stage('write_queries', queries=len(self.queries)), open(written['queries'], 'a') as query_file:
+                query_file.write(f"\n{self.normal_form} Queries:\n")
+                query_file.write('\n'.join(self.queries))
+        tables = {table.name: table.data for table in self.tables}
+        rows = sum(table.data.row_count for table in self.tables)
+        if tables:
+            written['data'] = os.path.join(output_dir, "data" if data_format == "csv" else DATA_OUTPUT_PATH)
+            with recorder.stage('write_decomposed_data', tables=len(tables), rows=rows, format=data_format):
+                write_decomposed_data(tables, written['data'], data_format, batch_size)
+        if self.verification:
+            written['verification'] = os.path.join(output_dir, VERIFICATION_REPORT_PATH)
+            with open(written['verification'], 'w') as report_file:
+                json.dump(self.verification, report_file, indent=2)
+        if sqlite_path and tables:
+            with recorder.stage('load_into_sqlite', tables=len(tables), rows=rows):
+                self.sqlite_report = load_into_sqlite(sqlite_path, self.queries, tables, self.dataset,
+                                                      transaction_rows)
+            written['sqlite'] = sqlite_path
+        return written
+
+
+class Normalizer:
+    """
+    Decompose datasets into a target normal form without module state or output files.
+
+    A Normalizer only holds its table naming options, so one instance can serve
+    any number of threads: every call receives its dataset and Schema and
+    returns a NormalizationResult, which the caller may write() or inspect.
+    """
+
+    def __init__(self, naming=TABLE_NAMING, table_prefix=TABLE_PREFIX, verify=True):
+        self.naming = naming
+        self.table_prefix = table_prefix
+        self.verify = verify
+
+    def plan(self, dataset, schema, normal_form):
+        """
+        Decide the decomposition without projecting any rows.
+
+        Returns:
+            tuple: (satisfied, (key, attributes) tuples, join dependencies applied)
+        """
+        model = schema.model
+        if normal_form == "1NF":
+            return check_1nf(dataset), [], []
+        if normal_form == "2NF":
+            if check_1nf(dataset) and not has_partial_dependency(model, schema.candidate_keys, schema.attributes):
+                return True, [], []
+            return False, second_nf_decomposition(model, schema.attributes, schema.candidate_keys), []
+        if normal_form == "3NF":
+            return False, synthesize_3nf(model, schema.attributes, schema.candidate_keys), []
+        if normal_form == "BCNF":
+            return False, bcnf_decomposition(model, schema.attributes), []
+        if normal_form == "4NF":
+            return False, fourth_nf_decomposition(dataset, model), []
+        if normal_form == "5NF":
+            decomposition, applied = fifth_nf_decomposition(dataset, model, schema.join_dependencies)
+            return False, decomposition, applied
+        raise ValueError(f"Unknown normal form: {normal_form}")
+
+    def normalize(self, dataset, schema, normal_form, recorder=NULL_RECORDER):
+        """
+        Decompose a dataset, project its tables, render their DDL and verify the result.
+
+        Args:
+            dataset (ColumnStore): The encoded columns.
+            schema (Schema): The dataset's attributes and dependencies.
+            normal_form (str): "1NF", "2NF", "3NF", "BCNF", "4NF" or "5NF".
+            recorder (StageRecorder): Records planning, projection, DDL and verification as stages.
+
+        Returns:
+            NormalizationResult: The tables, DDL and verification report.
+        """
+        with recorder.stage('decompose', normal_form=normal_form, rows=dataset.row_count,
+                            attributes=len(schema.attributes)) as stage:
+            satisfied, decomposition, applied = self.plan(dataset, schema, normal_form)
+            stage['tables'] = len(decomposition)
+        tables = []
+        with recorder.stage('project_distinct', tables=len(decomposition)) as stage:
+            for key, attributes in decomposition:
+                name = table_name(key, attributes, [table.name for table in tables], self.naming, self.table_prefix)
+                tables.append(Table(name, key, attributes, project_distinct(dataset, attributes)))
+            stage['rows'] = sum(table.data.row_count for table in tables)
+            _key_columns_not_null(tables)
+        with recorder.stage('create_table_query', tables=len(tables)):
+            queries = generate_1nf_queries(dataset) if normal_form == "1NF" and not satisfied else []
+            queries += [create_table_query(table.name, table.attributes, table.key, table.data) for table in tables]
+        verification = None
+        if tables and self.verify:
+            with recorder.stage('verify_decomposition', tables=len(tables)):
+                verification = verify_decomposition(schema.attributes,
+                                                    {table.name: table.attributes for table in tables},
+                                                    schema.model, None, applied)
+        return NormalizationResult(dataset, normal_form, satisfied, tables, queries, verification,
+                                   schema.candidate_keys, applied)
+
+
+def print_result(result):
+    """
+    Report a NormalizationResult on the console the way the command line always has.
+    """
+    if result.satisfied:
+        print(f"Data is in {result.normal_form}")
+    elif not result.tables:
+        print(f"dataset not in {result.normal_form}")
+    for idx, table in enumerate(result.tables):
+        print(f"Decomposed relation {idx + 1}: {table}")
+    if result.verification:
+        print(f"Lossless join: {result.verification['lossless']},"
+              f" dependency preserving: {result.verification['dependency_preserving']}")
+
+def schema_fingerprint(attributes, functional_dependencies=(), multivalued_dependencies=(), join_dependencies=(),
+                       *extra):
+    """
+    Hash a schema canonically: FD order, duplicates and the order of names within a side do not matter.
+
+    Args:
+        attributes (list): The attribute names, in table order.
+        functional_dependencies (list): FD strings.
+        multivalued_dependencies (list): MVD strings.
+        join_dependencies (list): Join dependencies as lists of components.
+        extra: Anything else the cached value depends on, such as the target normal form.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    def canonical(dependencies):
+        return sorted({(tuple(sorted(lhs)), tuple(sorted(rhs))) for lhs, rhs in map(parse_fd, dependencies)})
+
+    payload = [list(attributes), canonical(functional_dependencies), canonical(multivalued_dependencies),
+               sorted(sorted(tuple(sorted(component)) for component in components) for components in join_dependencies),
+               list(extra)]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+class SchemaCache:
+    """
+    A thread-safe LRU cache bounded by the approximate size of its values in bytes.
+
+    Values are sized by their JSON encoding unless a size is given; the least
+    recently used entries are evicted once the total exceeds max_bytes.
+    """
 
-    # For demonstration, we'll just return the chosen normal form.
-    return 0
+    def __init__(self, max_bytes=SERVICE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, size=None):
+        """
+        Return the cached value for key, computing and storing it on a miss (outside the lock).
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, size(value) if callable(size) else size)
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.size, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class NormalizationService:
+    """
+    Answer normalization requests from a warm process, caching every analysis by schema fingerprint.
+
+    A request is a JSON object with "attributes", "functional_dependencies" and
+    optionally "multivalued_dependencies", "join_dependencies", "candidate_keys",
+    "normal_form" and "data" (a CSV path readable by the service). Compiled
+    schemas, candidate keys, minimal covers, closures and decompositions are
+    cached under the fingerprint of what they depend on, so an unchanged
+    schema is analyzed once. Requests with "data" also get DDL and a
+    verification report; the CSV's path, size and mtime join the fingerprint.
+    """
+
+    def __init__(self, cache_bytes=SERVICE_CACHE_BYTES, normalizer=None):
+        self.cache = SchemaCache(cache_bytes)
+        self.normalizer = normalizer or Normalizer()
+
+    def _schema(self, request):
+        fingerprint = schema_fingerprint(request['attributes'], request.get('functional_dependencies', ()),
+                                         request.get('multivalued_dependencies', ()),
+                                         request.get('join_dependencies', ()), request.get('candidate_keys'))
+
+        def compile_schema():
+            schema = Schema(request['attributes'], request.get('functional_dependencies', ()),
+                            request.get('multivalued_dependencies', ()), request.get('join_dependencies', ()),
+                            request.get('candidate_keys'))
+            schema.candidate_keys
+            return schema
+
+        # Compiled schemas are not JSON; weigh them by their dependency count instead
+        schema = self.cache.get_or_compute(('schema', fingerprint), compile_schema,
+                                           lambda schema: 256 * (len(schema.model.fds) + len(schema.attributes) + 1))
+        return fingerprint, schema
+
+    def analyze(self, request):
+        """
+        Report a schema's candidate keys, minimal cover and the highest normal form its FDs allow.
+        """
+        fingerprint, schema = self._schema(request)
+
+        def analysis():
+            model = schema.model
+            return {'fingerprint': fingerprint, 'candidate_keys': schema.candidate_keys,
+                    'minimal_cover': [f"{', '.join(model.names(fd.lhs))} -> {', '.join(model.names(fd.rhs))}"
+                                      for fd in minimal_cover(model)],
+                    'normal_form': schema_normal_form(schema)}
+
+        return self.cache.get_or_compute(('analysis', fingerprint), analysis)
+
+    def closure(self, request):
+        """
+        Compute the closure of request["closure_of"] under the schema's FDs.
+
+        Raises:
+            ValueError: When closure_of names attributes the schema does not have.
+        """
+        fingerprint, schema = self._schema(request)
+        names = sorted(request['closure_of'])
+        unknown = [name for name in names if name not in schema.model.bits]
+        if unknown:
+            raise ValueError(f"Unknown attributes: {', '.join(unknown)}")
+        return self.cache.get_or_compute(
+            ('closure', fingerprint, tuple(names)),
+            lambda: {'fingerprint': fingerprint, 'attributes': names,
+                     'closure': schema.model.names(schema.model.closure_mask(schema.model.mask(names)))})
+
+    def normalize(self, request):
+        """
+        Decompose a schema into request["normal_form"], projecting and verifying the data when a CSV is given.
+        """
+        fingerprint, schema = self._schema(request)
+        normal_form = request.get('normal_form', "3NF")
+        data_path = request.get('data')
+        if data_path:
+            status = os.stat(data_path)
+            key = ('normalize', fingerprint, normal_form, data_path, status.st_size, status.st_mtime_ns)
+            return self.cache.get_or_compute(key, lambda: dict(
+                self.normalizer.normalize(parse_dataset(data_path), schema, normal_form).to_dict(),
+                fingerprint=fingerprint))
+
+        def plan():
+            if normal_form == "2NF":
+                satisfied = not has_partial_dependency(schema.model, schema.candidate_keys, schema.attributes)
+                decomposition = [] if satisfied else second_nf_decomposition(schema.model, schema.attributes,
+                                                                            schema.candidate_keys)
+            elif normal_form in ("3NF", "BCNF"):
+                satisfied, decomposition, _ = self.normalizer.plan(None, schema, normal_form)
+            else:
+                raise ValueError(f"{normal_form} depends on the rows; pass \"data\"")
+            names = []
+            tables = []
+            for key, attributes in decomposition:
+                names.append(table_name(key, attributes, names, self.normalizer.naming, self.normalizer.table_prefix))
+                tables.append({'name': names[-1], 'key': key, 'attributes': attributes})
+            return {'fingerprint': fingerprint, 'normal_form': normal_form, 'satisfied': satisfied,
+                    'candidate_keys': schema.candidate_keys, 'tables': tables}
+
+        return self.cache.get_or_compute(('normalize', fingerprint, normal_form), plan)
+
+    def stats(self, request=None):
+        return self.cache.stats()
+
+
+def serve(service, host="127.0.0.1", port=8765):
+    """
+    Serve a NormalizationService over HTTP until interrupted.
+
+    POST /analyze, /normalize and /closure take a JSON request body and answer
+    with JSON; GET /stats reports the cache. Errors come back as {"error": ...}
+    with status 400. Each connection is handled on its own thread.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    routes = {'/analyze': service.analyze, '/normalize': service.normalize, '/closure': service.closure,
+              '/stats': service.stats}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _dispatch(self, request):
+            route = routes.get(self.path)
+            if route is None:
+                return self._respond(404, {'error': f"unknown path {self.path}"})
+            try:
+                self._respond(200, route(request))
+            except Exception as e:
+                # Whatever the analysis trips over came from the request, so the client hears about it
+                self._respond(400, {'error': f"{type(e).__name__}: {e}"})
+
+        def do_GET(self):
+            self._dispatch({})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError as e:
+                return self._respond(400, {'error': f"invalid JSON: {e}"})
+            self._dispatch(request)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving normalization requests on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def schema_normal_form(schema):
+    """
+    Find the highest of 2NF, 3NF and BCNF a schema satisfies from its FDs alone (1NF is assumed).
+
+    Checking the declared FDs is enough for the whole relation: 3NF needs every
+    dependent of a non-superkey determinant to be prime, BCNF needs every
+    non-trivial determinant to be a superkey.
+    """
+    model = schema.model
+    everything = model.mask(schema.attributes)
+    if has_partial_dependency(model, schema.candidate_keys, schema.attributes):
+        return "1NF"
+    prime = key_mask(model, schema.candidate_keys)
+    violations = [fd for fd in model.fds if fd.rhs & everything & ~fd.lhs
+                  and model.closure_mask(fd.lhs) & everything != everything]
+    if any(fd.rhs & everything & ~fd.lhs & ~prime for fd in violations):
+        return "2NF"
+    return "3NF" if violations else "BCNF"
+
+def find_highest_normal_form(dataset, functional_dependencies):
+    """
+    Find the highest normal form up to BCNF the dataset satisfies ("0NF" when a column holds lists).
+    """
+    if not check_1nf(dataset):
+        return "0NF"
+    return schema_normal_form(Schema(dataset.keys(), functional_dependencies))
 
 def write_to_text_file(data, output_file):
     """
@@ -596,44 +3198,1045 @@ def write_to_query_file(queries,output_file):
 
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python your_script.py input_dataset.csv functional_dependencies.txt")
+NORMAL_FORMS = ["1NF", "2NF", "3NF", "BCNF", "4NF", "5NF"]
+
+def build_argument_parser():
+    """
+    Describe the command line: one CSV with its dependency files, a job file, or a directory of CSVs.
+    """
+    parser = argparse.ArgumentParser(
+        description="Normalize a CSV table from its functional dependencies and emit the decomposed schema.",
+        epilog="Invoked many times, \"python -m parser-Projectf\" (from this directory or with it on PYTHONPATH) "
+               "starts faster than running the file, as Python then reuses the compiled bytecode.")
+    parser.add_argument('dataset', nargs='?', help="input CSV file")
+    parser.add_argument('functional_dependencies', nargs='?', help="functional dependencies, one \"A, B -> C\" per line")
+    parser.add_argument('mvd', nargs='?', help="multivalued dependencies, one \"A ->> B\" per line")
+    parser.add_argument('--jd', help="join dependencies for 5NF, one \"A, B | B, C | A, C\" per line")
+    parser.add_argument('--job', help="JSON or YAML job file with one job or {\"defaults\": ..., \"jobs\": [...]}")
+    parser.add_argument('--directory', help="normalize every <name>.csv with its <name>.fd.txt in this directory")
+    parser.add_argument('-n', '--normal-form', choices=NORMAL_FORMS, help="highest normal form to reach")
+    parser.add_argument('--keys', action='append', help="candidate key as comma-separated columns (repeatable)")
+    parser.add_argument('--naming', choices=["key", "attributes", "numbered"], help="table naming rule")
+    parser.add_argument('--table-prefix', help="prefix for decomposed table names")
+    parser.add_argument('-o', '--output-dir', help="directory for query, data and report files")
+    parser.add_argument('--data-format', choices=["insert", "copy", "csv"], help="format of the table data")
+    parser.add_argument('--sqlite', help="SQLite database to load the decomposed tables into")
+    parser.add_argument('--workers', type=int, help="worker processes for a batch of tables (default: CPU count)")
+    parser.add_argument('--retries', type=int, help=f"extra attempts for a failed table (default: {BATCH_RETRIES})")
+    parser.add_argument('--report', nargs='?', const=True, metavar='PATH',
+                        help=f"time each stage and write a JSON run report (default: {RUN_REPORT_PATH} in the output directory)")
+    parser.add_argument('--profile', nargs='?', const=True, metavar='PATH',
+                        help=f"profile the run with cProfile (default: {PROFILE_OUTPUT_PATH} in the output directory)")
+    parser.add_argument('--check', action='store_true',
+                        help="only check column types, 1NF and the declared FDs in one streaming pass (exit 1 if violated)")
+    parser.add_argument('--discover', action='store_true',
+                        help="mine the FDs from the data when none are given (slow: see discover_functional_dependencies)")
+    parser.add_argument('--cache', action='store_true',
+                        help=f"reuse parsed dependencies and profiles from earlier runs (cached in {PARSE_CACHE_DIR})")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"reuse the analysis saved in the output directory ({INCREMENTAL_STATE_PATH}) and redo only what changed")
+    parser.add_argument('--serve', metavar='[HOST:]PORT', help="run the HTTP/JSON normalization service")
+    parser.add_argument('--cache-mb', type=int, help="memory bound of the service cache in MB")
+    parser.add_argument('--benchmark', metavar='PRESET|FILE',
+                        help=f"time every stage on synthetic relations: {', '.join(BENCHMARK_PRESETS)} or a JSON scenario list")
+    parser.add_argument('--benchmark-baseline', help="earlier benchmark results to compare against")
+    return parser
+
+def load_job_file(path):
+    """
+    Read a JSON or YAML job file into a list of jobs.
+
+    The file holds either one job or {"defaults": {...}, "jobs": [...]}, where
+    every job inherits the defaults. A job may also name a "directory" of CSVs
+    instead of one "data" file. Job keys: data, fds, mvds, jds, keys,
+    normal_form, naming, table_prefix, output_dir, data_format, sqlite,
+    incremental, report, profile, cache, cache_dir, discover. Relative paths are resolved against the job file's directory.
+
+    Returns:
+        list: One dict per table to normalize.
+    """
+    with open(path, 'r') as file:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("Error: PyYAML is required for YAML job files; use JSON instead.")
+            config = yaml.safe_load(file) or {}
+        else:
+            config = json.load(file)
+
+    base = os.path.dirname(os.path.abspath(path))
+    defaults = config.get('defaults', {}) if 'jobs' in config else {}
+    entries = config['jobs'] if 'jobs' in config else [config]
+    jobs = []
+    for entry in entries:
+        job = dict(defaults, **entry)
+        for field in ('data', 'fds', 'mvds', 'jds', 'directory', 'output_dir', 'sqlite', 'report', 'profile'):
+            if isinstance(job.get(field), str):
+                job[field] = os.path.join(base, job[field])
+        if job.get('directory'):
+            jobs.extend(directory_jobs(job.pop('directory'), job))
+        else:
+            jobs.append(job)
+    return jobs
+
+def directory_jobs(directory, options):
+    """
+    Pair every <name>.csv in a directory with <name>.fd.txt and, if present, <name>.mvd.txt and <name>.jd.txt.
+
+    Each table gets its own output directory, <output_dir>/<name>, and the table name prefix defaults to <name>.
+    """
+    jobs = []
+    for entry in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(entry)
+        if extension.lower() != '.csv':
+            continue
+        job = dict(options, data=os.path.join(directory, entry))
+        for field, suffix in (('fds', '.fd.txt'), ('mvds', '.mvd.txt'), ('jds', '.jd.txt')):
+            candidate = os.path.join(directory, stem + suffix)
+            if os.path.exists(candidate):
+                job[field] = candidate
+        job['output_dir'] = os.path.join(options.get('output_dir') or 'normalized', stem)
+        job.setdefault('table_prefix', stem)
+        jobs.append(job)
+    return jobs
+
+def check_job(job):
+    """
+    Check a job's CSV against its declared FDs in one streaming pass, without loading the table.
+
+    Prints the column types, the 1NF check and every violated FD.
+
+    Returns:
+        dict: scan_dataset's report.
+    """
+    for field, kind in (('data', "Data"), ('fds', "Functional dependencies")):
+        if job.get(field) and not os.path.isfile(job[field]):
+            raise FileNotFoundError(f"{kind} file not found: {job[field]}")
+    functional_dependencies = parse_functional_dependencies(job['fds']) if job.get('fds') else []
+    check_dependency_attributes(next(stream_dataset(job['data'], 1), {}).keys(), functional_dependencies)
+    report = scan_dataset(job['data'], functional_dependencies)
+    print(f"Scanned {report['rows']} rows of {job['data']}: {', '.join(report['columns'])}")
+    print(f"Column types: {report['data_types']}")
+    print(f"1NF: {report['is_1nf']}")
+    for fd, violation in report['violations'].items():
+        if violation['rows']:
+            print(f"Warning: {fd} is violated by {violation['rows']} rows, e.g. rows {violation['samples']}")
+    return report
+
+def run_job(job):
+    """
+    Normalize one table as described by a job dict and write its outputs.
+
+    With "report" (true or a path) every stage is timed, its allocations
+    traced and a JSON run report written (report.json in the output
+    directory by default); with "profile" the run is also profiled with
+    cProfile. Tracing allocations slows a run several times over, so
+    "trace_memory": false leaves it out. Without either nothing is measured.
+
+    Returns:
+        NormalizationResult: The decomposition of the job's table.
+
+    Raises:
+        FileNotFoundError: If the job's CSV file or a dependency file it names does not exist.
+        ValueError: If its dependencies name columns the CSV file does not have.
+    """
+    for field, kind in (('data', "Data"), ('fds', "Functional dependencies"), ('mvds', "Multivalued dependencies"),
+                        ('jds', "Join dependencies")):
+        # A mistyped dependency file would otherwise be read as no dependencies at all
+        if job.get(field) and not os.path.isfile(job[field]):
+            raise FileNotFoundError(f"{kind} file not found: {job[field]}")
+    runner = run_incremental_job if job.get('incremental') else _run_job
+    output_dir = job.get('output_dir') or '.'
+    if not job.get('report') and not job.get('profile'):
+        return runner(job, NULL_RECORDER)
+    os.makedirs(output_dir, exist_ok=True)
+    profile = job.get('profile')
+    recorder = StageRecorder(os.path.join(output_dir, PROFILE_OUTPUT_PATH) if profile is True else profile,
+                             job.get('trace_memory', True))
+    with recorder:
+        result = runner(job, recorder)
+    report_path = job.get('report')
+    report_path = os.path.join(output_dir, RUN_REPORT_PATH) if report_path in (True, None) else report_path
+    with open(report_path, 'w') as report_file:
+        json.dump(recorder.report(data=job['data'], normal_form=job['normal_form'], result=result.to_dict()),
+                  report_file, indent=2)
+    print(f"Run report written to {report_path}")
+    return result
+
+def _join_dependencies_path(job):
+    """
+    Returns:
+        str: The job's join dependency file, by default jd.txt next to its FD file or, without one, its CSV file.
+    """
+    if job.get('jds'):
+        return job['jds']
+    return os.path.join(os.path.dirname(job.get('fds') or job['data']), JOIN_DEPENDENCIES_PATH)
+
+def _run_job(job, recorder):
+    output_dir = job.get('output_dir') or '.'
+    # With "cache", everything derived from unchanged input files is reused from earlier invocations
+    cache = ParseCache(job.get('cache_dir') or PARSE_CACHE_DIR if job.get('cache') else None)
+    data_path, fd_path = job['data'], job.get('fds')
+    with recorder.stage('parse_dataset', bytes=os.path.getsize(data_path)) as stage:
+        parsed_data = parse_dataset(data_path, job.get('parse_workers', PARSE_WORKERS))
+        stage.update(rows=parsed_data.row_count, attributes=len(parsed_data))
+    with recorder.stage('profile_columns', attributes=len(parsed_data)):
+        # Profiled before projecting, so the decomposed tables inherit the profiles
+        profiles = cache.cached(cache.key('profiles', [data_path], PROFILE_SAMPLE_SIZE),
+                                lambda: {column: profile_column(values) for column, values in parsed_data.items()})
+        for column, profile in profiles.items():
+            parsed_data[column].profile = profile
+    with recorder.stage('parse_functional_dependencies') as stage:
+        functional_dependencies = cache.cached(cache.key('fds', [fd_path]),
+                                               lambda: parse_functional_dependencies(fd_path)) if fd_path else []
+        stage['dependencies'] = len(functional_dependencies)
+    check_dependency_attributes(parsed_data.keys(), functional_dependencies)
+    if not functional_dependencies and not job.get('discover'):
+        print("Warning: no functional dependencies given; pass --discover to mine them from the data")
+    elif not functional_dependencies:
+        # No documented dependencies: mine them from the data instead
+        with recorder.stage('discover_functional_dependencies', rows=parsed_data.row_count) as stage:
+            functional_dependencies = cache.cached(cache.key('discovered', [data_path], DISCOVERY_MAX_LHS),
+                                                   lambda: discover_functional_dependencies(parsed_data))
+            stage['dependencies'] = len(functional_dependencies)
+        print(f"Discovered functional dependencies: {functional_dependencies}")
+    else:
+        # Declared dependencies that the data contradicts would produce wrong tables
+        with recorder.stage('validate_functional_dependencies', rows=parsed_data.row_count,
+                            dependencies=len(functional_dependencies)) as stage:
+            violations = cache.cached(cache.key('violations', [data_path, fd_path]),
+                                      lambda: validate_functional_dependencies(
+                                          parsed_data, functional_dependencies,
+                                          job.get('validation_workers', VALIDATION_WORKERS)))
+            stage['violated'] = sum(1 for violation in violations.values() if violation['rows'])
+        for fd, violation in violations.items():
+            if violation['rows']:
+                print(f"Warning: {fd} is violated by {violation['rows']} rows, e.g. {violation['samples']}")
+
+    # The values themselves are in outputl.txt; echoing every row would dominate large runs
+    print(f"Parsed {parsed_data.row_count} rows: {', '.join(parsed_data.keys())}")
+    composite_keys = None
+    if job.get('keys'):
+        composite_keys = [key.split(',') if isinstance(key, str) else key for key in job['keys']]
+        composite_keys = [[attr.strip() for attr in key] for key in composite_keys]
+
+    choice = job['normal_form']
+    mvd_dependencies = []
+    if choice in ["4NF", "5NF"] and job.get('mvds'):
+        with recorder.stage('parse_mvd_dependencies') as stage:
+            mvd_dependencies = cache.cached(cache.key('mvds', [job['mvds']]),  #path of mutlivalue dependency file
+                                            lambda: parse_mvd_dependencies(job['mvds']))
+            stage['dependencies'] = len(mvd_dependencies)
+        print(f"Multi-valued dependencies: {mvd_dependencies}")
+    join_dependencies = []
+    jd_path = _join_dependencies_path(job)
+    if choice == "5NF" and os.path.exists(jd_path):
+        join_dependencies = parse_join_dependencies(jd_path)
+
+    with recorder.stage('candidate_keys', attributes=len(parsed_data)) as stage:
+        def compile_schema():
+            schema = Schema(parsed_data.keys(), functional_dependencies, mvd_dependencies, join_dependencies,
+                            composite_keys)
+            schema.candidate_keys
+            return schema
+        # Discovered FDs come from the data, so the data file is part of their schema's key
+        schema = cache.cached(cache.key('schema', [fd_path or data_path, jd_path], list(parsed_data.keys()),
+                                        mvd_dependencies, composite_keys, functional_dependencies), compile_schema)
+        stage['keys'] = len(schema.candidate_keys)
+    print(f"Candidate keys: {schema.candidate_keys}")
+    result = Normalizer(job.get('naming') or TABLE_NAMING, job.get('table_prefix') or TABLE_PREFIX).normalize(
+        parsed_data, schema, choice, recorder)
+    print_result(result)
+    written = result.write(output_dir, job.get('data_format') or DATA_FORMAT,
+                           sqlite_path=job.get('sqlite') or SQLITE_OUTPUT_PATH, recorder=recorder)
+    for kind, path in written.items():
+        print(f"{kind.capitalize()} written to {path}")
+    if result.sqlite_report:
+        print(result.sqlite_report)
+    parsed_output_path = os.path.join(output_dir, PARSED_OUTPUT_PATH)
+    with recorder.stage('write_to_text_file', rows=parsed_data.row_count):
+        write_to_text_file(parsed_data, parsed_output_path)
+    print(f"Parsed Data has been written to {parsed_output_path}")
+    return result
+
+class IncrementalState:
+    """
+    The analysis an incremental job keeps in its output directory between runs.
+
+    The rows, projections and FD indexes grow with the data, so they are not
+    pickled with the rest: each save appends only what was added since the
+    last one (new dictionary values and codes, new projection rows, new index
+    entries) as one frame to a journal next to the state file, and load
+    replays the frames. The journal is rewritten in full only when the state
+    is new or a projection or index was dropped. The state file records how
+    many journal bytes belong to it, so a save that was cut short is ignored.
+
+    Attributes:
+        fingerprint (dict): file_fingerprint of the CSV as last read.
+        dataset (ColumnStore): Every row read so far.
+        functional_dependencies (list): The FDs in use, declared or discovered.
+        discovered (bool): True when the FDs were mined from the data.
+        indexes (dict): "X -> Y" mapped to (first rhs codes per lhs codes, violating rows and samples).
+        schema_key (str): schema_fingerprint of the dependencies and keys.
+        candidate_keys (list): The candidate keys of that schema.
+        plan_key (tuple): What the stored plan was made for.
+        plan (tuple): Normalizer.plan's (satisfied, decomposition, applied).
+        verification (dict): The plan's verification report.
+        projections (dict): (key, attributes) mapped to (distinct row codes, ColumnStore).
+        written (dict): The data format, DDL and per-table row counts of the files last written.
+    """
+    # Attributes kept in the journal rather than the state file
+    JOURNALED = ('dataset', 'projections', 'indexes', 'saved')
+
+    def __init__(self):
+        self.fingerprint = None
+        self.dataset = None
+        self.functional_dependencies = []
+        self.discovered = False
+        self.indexes = {}
+        self.schema_key = None
+        self.candidate_keys = None
+        self.plan_key = None
+        self.plan = None
+        self.verification = None
+        self.projections = {}
+        self.written = None
+        self.journal = None
+        # What the journal holds: rows and dictionary sizes per column, rows per projection, entries per index
+        self.saved = None
+
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items() if name not in self.JOURNALED}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read the state saved at path and replay its journal, or start afresh when either cannot be read.
+        """
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            if not isinstance(state, cls) or state.journal is None:
+                return cls()
+            name, size = state.journal
+            with open(os.path.join(os.path.dirname(path), name), 'rb') as file:
+                journal = io.BytesIO(file.read(size))
+            state.dataset, state.projections, state.indexes = None, {}, {}
+            while journal.tell() < size:
+                state._replay(pickle.load(journal))
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError, ValueError):
+            return cls()
+        for signature, (seen, table) in state.projections.items():
+            codes = [column.codes for column in table.values()]
+            seen.update(codes[0] if len(codes) == 1 else zip(*codes))
+        state.saved = state._sizes()
+        return state
+
+    def _replay(self, frame):
+        if self.dataset is None:
+            self.dataset = ColumnStore((attr, EncodedColumn()) for attr in frame['columns'])
+        for attr, (values, codes) in frame['columns'].items():
+            column = self.dataset[attr]
+            for value in values:
+                column.lookup[value] = len(column.dictionary)
+                column.dictionary.append(value)
+            column.codes.extend(codes)
+        for signature, codes in frame['projections'].items():
+            if signature not in self.projections:
+                self.projections[signature] = (set(), ColumnStore(
+                    (attr, EncodedColumn.from_codes(array('I'), self.dataset[attr])) for attr in codes))
+            for attr, column in self.projections[signature][1].items():
+                column.codes.extend(codes[attr])
+        for name, (items, violation) in frame['indexes'].items():
+            first = self.indexes[name][0] if name in self.indexes else {}
+            first.update(items)
+            self.indexes[name] = (first, violation)
+
+    def _sizes(self):
+        return {'columns': {attr: (len(column.codes), len(column.dictionary)) for attr, column in self.dataset.items()},
+                'projections': {signature: table.row_count for signature, (_, table) in self.projections.items()},
+                'indexes': {name: len(first) for name, (first, _) in self.indexes.items()}}
+
+    def _frame(self, saved):
+        columns = {}
+        for attr, column in self.dataset.items():
+            rows, distinct = saved['columns'].get(attr, (0, 0))
+            columns[attr] = (column.dictionary[distinct:], column.codes[rows:])
+        projections = {}
+        for signature, (_, table) in self.projections.items():
+            rows = saved['projections'].get(signature, 0)
+            projections[signature] = {attr: column.codes[rows:] for attr, column in table.items()}
+        indexes = {name: (list(islice(first.items(), saved['indexes'].get(name, 0), None)), violation)
+                   for name, (first, violation) in self.indexes.items()}
+        return {'columns': columns, 'projections': projections, 'indexes': indexes}
+
+    def save(self, path):
+        """
+        Append what changed since the last save to the journal and replace the state file.
+        """
+        directory = os.path.dirname(path)
+        saved = self.saved
+        compact = (saved is None or self.journal is None or saved['columns'].keys() != self.dataset.keys()
+                   or not saved['projections'].keys() <= self.projections.keys()
+                   or not saved['indexes'].keys() <= self.indexes.keys())
+        if compact:
+            # A new journal under a new name, so the old state stays readable until it is replaced
+            name = f"{os.path.basename(path)}.{time.time_ns()}.journal"
+            empty = {'columns': {}, 'projections': {}, 'indexes': {}}
+            with open(os.path.join(directory, name), 'wb') as file:
+                pickle.dump(self._frame(empty), file, pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+        else:
+            name, size = self.journal
+            with open(os.path.join(directory, name), 'r+b') as file:
+                # Drop whatever an interrupted save left after the recorded end
+                file.truncate(size)
+                file.seek(size)
+                pickle.dump(self._frame(saved), file, pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+        self.journal = (name, size)
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            pickle.dump(self, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        # Every other journal belonged to an earlier state, including one that was rebuilt from scratch
+        prefix = os.path.basename(path) + '.'
+        for entry in os.scandir(directory or '.'):
+            if entry.name.startswith(prefix) and entry.name.endswith('.journal') and entry.name != name:
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+        self.saved = self._sizes()
+
+def _extend_projection(dataset, attributes, projection, start):
+    """
+    Add the distinct rows of dataset[start:] that a projection has not seen yet, in input order.
+    """
+    seen, table = projection
+    codes = [dataset[attr].codes[start:] if start else dataset[attr].codes for attr in attributes]
+    targets = [table[attr].codes for attr in attributes]
+    keys = codes[0] if len(codes) == 1 else zip(*codes)
+    for row, key in enumerate(keys):
+        if key not in seen:
+            seen.add(key)
+            for target, column in zip(targets, codes):
+                target.append(column[row])
+    for attr in attributes:
+        # The shared dictionaries may have grown, which can widen the column type
+        table[attr].profile = None
+
+def _update_fd_indexes(state, start):
+    """
+    Validate the rows from start on against the stored group-by index of every FD in use.
+
+    FDs without an index (new ones) are checked over every row instead. FDs
+    no longer in use lose their index.
+    """
+    model = compile_dependencies(state.functional_dependencies, state.dataset.keys())
+    columns = {attr: column.codes for attr, column in state.dataset.items()}
+    indexes = {}
+    for fd in model.fds:
+        lhs, rhs = model.names(fd.lhs), model.names(fd.rhs)
+        name = f"{', '.join(lhs)} -> {', '.join(rhs)}"
+        if not all(attr in columns for attr in lhs + rhs):
+            print(f"Skipping {name}: attribute not in dataset")
+            continue
+        first, violation = state.indexes.get(name) or ({}, {'rows': 0, 'samples': [], 'attributes': lhs + rhs})
+        resume = start if name in state.indexes else 0
+        violating, sample_rows = _count_violations(columns, lhs, rhs, 5, first, resume)
+        violation['rows'] += violating
+        violation['samples'] = (violation['samples'] + sample_rows)[:5]
+        indexes[name] = (first, violation)
+    state.indexes = indexes
+
+def run_incremental_job(job, recorder=NULL_RECORDER):
+    """
+    Bring a job's outputs up to date with its CSV and dependency files, redoing only what changed.
+
+    The analysis is kept in <output_dir>/state.pickle and its journal (see
+    IncrementalState), so saving it costs about as much as the new rows. Every
+    step is a stage of recorder. When rows were appended
+    to the CSV only those rows are parsed, validated against the stored
+    group-by index of each FD and added to the stored projections. When the
+    dependencies change, candidate keys and the decomposition are recomputed
+    from the schema, only new FDs are validated over every row and only new
+    tables are projected over every row. 4NF and 5NF decompositions depend on
+    the rows, so they are replanned whenever rows arrive. Data files are
+    appended to while the DDL stays the same and rewritten, with query.txt,
+    otherwise; the parsed-data dump (outputl.txt) is not written, as it would
+    cost a full pass.
+    A CSV that was rewritten rather than appended to is read again in full.
+
+    Returns:
+        NormalizationResult: The decomposition of the job's table.
+    """
+    output_dir = job.get('output_dir') or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    state_path = os.path.join(output_dir, INCREMENTAL_STATE_PATH)
+    with recorder.stage('load_state') as stage:
+        state = IncrementalState.load(state_path)
+        stage['rows'] = state.dataset.row_count if state.dataset is not None else 0
+    offset = appended_offset(job['data'], state.fingerprint) if state.fingerprint else None
+    with recorder.stage('parse_dataset', appended=offset is not None) as stage:
+        if offset is None:
+            state = IncrementalState()
+            state.dataset = parse_dataset(job['data'], job.get('parse_workers', PARSE_WORKERS))
+            start = 0
+        else:
+            start = state.dataset.row_count
+            for batch in stream_appended_rows(job['data'], offset, list(state.dataset.keys())):
+                for column, values in batch.items():
+                    state.dataset[column].extend(values)
+        stage['rows'] = state.dataset.row_count - start
+    state.fingerprint = file_fingerprint(job['data'])
+    dataset = state.dataset
+    new_rows = dataset.row_count - start
+    print(f"Rows: {dataset.row_count} ({new_rows} new)")
+
+    declared = parse_functional_dependencies(job['fds']) if job.get('fds') else []
+    check_dependency_attributes(dataset.keys(), declared)
+    if declared:
+        state.functional_dependencies, state.discovered = declared, False
+        with recorder.stage('validate_functional_dependencies', rows=new_rows, dependencies=len(declared)):
+            _update_fd_indexes(state, start)
+        for fd, (_, violation) in state.indexes.items():
+            if violation['rows']:
+                samples = [{attr: dataset[attr][row] for attr in violation['attributes']}
+                           for row in violation['samples']]
+                print(f"Warning: {fd} is violated by {violation['rows']} rows, e.g. {samples}")
+    elif not job.get('discover'):
+        print("Warning: no functional dependencies given; pass --discover to mine them from the data")
+        state.functional_dependencies, state.discovered = [], False
+        _update_fd_indexes(state, start)
+    else:
+        # Appended rows can only break FDs, so mined FDs stay valid until one is violated
+        if state.discovered:
+            with recorder.stage('validate_functional_dependencies', rows=new_rows):
+                _update_fd_indexes(state, start)
+        if not state.discovered or any(violation['rows'] for _, violation in state.indexes.values()):
+            with recorder.stage('discover_functional_dependencies', rows=dataset.row_count) as stage:
+                state.functional_dependencies = discover_functional_dependencies(dataset)
+                state.discovered = True
+                # Indexes kept from before are already up to date; only new FDs scan the rows
+                _update_fd_indexes(state, dataset.row_count)
+                stage['dependencies'] = len(state.functional_dependencies)
+            print(f"Discovered functional dependencies: {state.functional_dependencies}")
+
+    composite_keys = None
+    if job.get('keys'):
+        composite_keys = [key.split(',') if isinstance(key, str) else key for key in job['keys']]
+        composite_keys = [[attr.strip() for attr in key] for key in composite_keys]
+    choice = job['normal_form']
+    mvd_dependencies = parse_mvd_dependencies(job['mvds']) if choice in ["4NF", "5NF"] and job.get('mvds') else []
+    join_dependencies = []
+    jd_path = _join_dependencies_path(job)
+    if choice == "5NF" and os.path.exists(jd_path):
+        join_dependencies = parse_join_dependencies(jd_path)
+
+    schema_key = schema_fingerprint(dataset.keys(), state.functional_dependencies, mvd_dependencies,
+                                    join_dependencies, composite_keys)
+    if schema_key != state.schema_key:
+        state.schema_key, state.candidate_keys = schema_key, None
+    with recorder.stage('candidate_keys', attributes=len(dataset)) as stage:
+        schema = Schema(dataset.keys(), state.functional_dependencies, mvd_dependencies, join_dependencies,
+                        composite_keys or state.candidate_keys)
+        state.candidate_keys = schema.candidate_keys
+        stage['keys'] = len(schema.candidate_keys)
+    print(f"Candidate keys: {schema.candidate_keys}")
+
+    normalizer = Normalizer(job.get('naming') or TABLE_NAMING, job.get('table_prefix') or TABLE_PREFIX)
+    plan_key = (schema_key, choice, normalizer.naming, normalizer.table_prefix)
+    replanned = plan_key != state.plan_key or (new_rows and choice in ("1NF", "2NF", "4NF", "5NF"))
+    if replanned:
+        with recorder.stage('decompose', normal_form=choice, rows=dataset.row_count):
+            state.plan_key, state.plan = plan_key, normalizer.plan(dataset, schema, choice)
+    satisfied, decomposition, applied = state.plan
+
+    projections = {}
+    tables = []
+    with recorder.stage('project_distinct', tables=len(decomposition)) as stage:
+        for key, attributes in decomposition:
+            signature = (tuple(key), tuple(attributes))
+            projection = state.projections.get(signature)
+            if projection is None:
+                projection = (set(), ColumnStore((attr, EncodedColumn.from_codes(array('I'), dataset[attr]))
+                                                 for attr in attributes))
+                _extend_projection(dataset, attributes, projection, 0)
+            elif new_rows:
+                _extend_projection(dataset, attributes, projection, start)
+            projections[signature] = projection
+            name = table_name(key, attributes, [table.name for table in tables], normalizer.naming,
+                              normalizer.table_prefix)
+            tables.append(Table(name, key, attributes, projection[1]))
+        state.projections = projections
+        _key_columns_not_null(tables)
+        stage['rows'] = sum(table.data.row_count for table in tables)
+    with recorder.stage('create_table_query', tables=len(tables)):
+        queries = generate_1nf_queries(dataset) if choice == "1NF" and not satisfied else []
+        queries += [create_table_query(table.name, table.attributes, table.key, table.data) for table in tables]
+    if replanned:
+        state.verification = None
+        if tables:
+            with recorder.stage('verify_decomposition', tables=len(tables)):
+                state.verification = verify_decomposition(schema.attributes, {table.name: table.attributes
+                                                                             for table in tables},
+                                                          schema.model, None, applied)
+    result = NormalizationResult(dataset, choice, satisfied, tables, queries, state.verification,
+                                 schema.candidate_keys, applied)
+    print_result(result)
+
+    data_format = job.get('data_format') or DATA_FORMAT
+    sqlite_path = job.get('sqlite') or SQLITE_OUTPUT_PATH
+    data_path = os.path.join(output_dir, "data" if data_format == "csv" else DATA_OUTPUT_PATH)
+    previous = state.written
+    if (previous and previous['format'] == data_format and previous['queries'] == queries and not sqlite_path
+            and os.path.exists(data_path)):
+        # Same tables and column types: the new rows can go after the ones already written
+        appended = 0
+        with recorder.stage('write_decomposed_data', tables=len(tables), format=data_format) as stage, \
+                contextlib.ExitStack() as files:
+            script = None if data_format == "csv" else files.enter_context(
+                open(data_path, 'a', buffering=WRITE_BUFFER_SIZE))
+            for table in tables:
+                written_rows = previous['rows'][table.name]
+                if table.data.row_count == written_rows:
+                    continue
+                rows = ColumnStore((attr, EncodedColumn.from_codes(column.codes[written_rows:], column))
+                                   for attr, column in table.data.items())
+                file = script or files.enter_context(open(os.path.join(data_path, f"{table.name}.csv"), 'a',
+                                                          newline='', buffering=WRITE_BUFFER_SIZE))
+                appended += write_table_data(file, table.name, rows, data_format, header=False)
+            stage['rows'] = appended
+        print(f"Appended {appended} rows to {data_path}")
     else:
-        input_file_path = sys.argv[1]
-        parsed_data = parse_dataset(input_file_path)
+        # The DDL is rewritten along with the data, so query.txt never holds two copies of a table
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(output_dir, QUERY_OUTPUT_PATH))
+        written = result.write(output_dir, data_format, sqlite_path=sqlite_path, recorder=recorder)
+        for kind, path in written.items():
+            print(f"{kind.capitalize()} written to {path}")
+        if result.sqlite_report:
+            print(result.sqlite_report)
+    state.written = {'format': data_format, 'queries': queries,
+                     'rows': {table.name: table.data.row_count for table in tables}}
+    with recorder.stage('save_state'):
+        state.save(state_path)
+    return result
+
+def _batch_job(job):
+    """
+    Run one batch job in a pool worker, with its console output captured in <output_dir>/log.txt.
+
+    Returns:
+        dict: The number of tables produced and the seconds the job took.
+    """
+    start = time.perf_counter()
+    # The batch already keeps every core busy; a nested pool per job would only oversubscribe them
+    job = dict(job, validation_workers=1, parse_workers=1)
+    output_dir = job.get('output_dir') or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    # The query file is appended to, so a retried job starts it afresh (incremental jobs append only changed DDL)
+    query_path = os.path.join(output_dir, QUERY_OUTPUT_PATH)
+    if os.path.exists(query_path) and not job.get('incremental'):
+        os.remove(query_path)
+    with open(os.path.join(output_dir, "log.txt"), 'w') as log, contextlib.redirect_stdout(log):
+        result = run_job(job)
+    return {'tables': len(result.tables), 'seconds': time.perf_counter() - start}
 
-        functional_dependencies_file = sys.argv[2]
-        functional_dependencies = parse_functional_dependencies(functional_dependencies_file)
-        mvd_file_path = sys.argv[3]  
-        
+def isolate_outputs(jobs):
+    """
+    Give every job its own output directory: jobs sharing one get a subdirectory named after their CSV.
+    """
+    shared = Counter(job.get('output_dir') or 'normalized' for job in jobs)
+    used = set()
+    for job in jobs:
+        output_dir = job.get('output_dir') or 'normalized'
+        if shared[output_dir] > 1:
+            stem = os.path.splitext(os.path.basename(job['data']))[0]
+            candidate, suffix = os.path.join(output_dir, stem), 2
+            while candidate in used:
+                candidate, suffix = os.path.join(output_dir, f"{stem}_{suffix}"), suffix + 1
+            output_dir = candidate
+        used.add(output_dir)
+        job['output_dir'] = output_dir
+    return jobs
+
+def run_batch(jobs, workers=None, retries=None):
+    """
+    Normalize many independent tables on a process pool.
+
+    Jobs are dispatched largest CSV first so a big table does not start last
+    and leave the other workers idle. A job that raises is resubmitted up to
+    retries more times; a worker that dies takes the pool with it, so its
+    unfinished jobs are requeued on a fresh pool. Progress is printed as jobs
+    finish, followed by a summary.
+
+    Args:
+        jobs (list): Job dicts as accepted by run_job.
+        workers (int): Pool size (defaults to the CPU count).
+        retries (int): Extra attempts per failed job (defaults to BATCH_RETRIES).
+
+    Returns:
+        list: One result dict per job, in input order, with 'data', 'status',
+        'attempts', 'output_dir' and, on success, 'tables' and 'seconds' or, on failure, 'error'.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+    retries = BATCH_RETRIES if retries is None else retries
+    isolate_outputs(jobs)
+    size = lambda i: os.path.getsize(jobs[i]['data']) if os.path.exists(jobs[i]['data']) else 0
+    queue = deque(sorted(range(len(jobs)), key=size, reverse=True))
+    attempts = Counter()
+    results = {}
+    start = time.perf_counter()
+
+    def finish(i, result):
+        results[i] = dict(result, data=jobs[i]['data'], attempts=attempts[i], output_dir=jobs[i]['output_dir'])
+        detail = f"{result['tables']} tables in {result['seconds']:.2f}s" if result['status'] == 'ok' else result['error']
+        print(f"[{len(results)}/{len(jobs)}] {result['status']:6} {jobs[i]['data']}: {detail}")
+
+    while queue:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = {}
+            while queue:
+                i = queue.popleft()
+                pending[pool.submit(_batch_job, jobs[i])] = i
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    attempts[i] += 1
+                    error = future.exception()
+                    if error is None:
+                        finish(i, dict(future.result(), status='ok'))
+                    elif attempts[i] <= retries and isinstance(error, BrokenProcessPool):
+                        queue.append(i)
+                    elif attempts[i] <= retries:
+                        print(f"Retrying {jobs[i]['data']} after {error!r}")
+                        pending[pool.submit(_batch_job, jobs[i])] = i
+                    else:
+                        finish(i, {'status': 'failed', 'error': repr(error)})
+                if queue:
+                    # The pool is broken: requeue what it still held and start a new one
+                    print(f"A worker died; restarting the pool for {len(queue) + len(pending)} jobs")
+                    queue.extend(pending.values())
+                    break
+
+    elapsed = time.perf_counter() - start
+    busy = sum(result.get('seconds', 0) for result in results.values())
+    failed = sum(result['status'] != 'ok' for result in results.values())
+    print(f"Batch finished: {len(jobs) - failed} succeeded, {failed} failed in {elapsed:.2f}s"
+          f" ({busy:.2f}s of job time, {busy / elapsed if elapsed else 0:.1f}x parallelism)")
+    return [results[i] for i in range(len(jobs))]
+
+def _skewed_code(value, salt, cardinality, skew):
+    """
+    Map an integer to a code below cardinality by hashing; skew > 0 favours small codes (Zipf-like).
+    """
+    fraction = ((value * 2654435761 + salt) & 0xffffffff) / 4294967296.0
+    return int(cardinality * fraction ** (1.0 + skew))
+
+def synthetic_relation(rows, attributes=10, chains=None, mvds=1, skew=0.0, cardinality=1000, seed=0):
+    """
+    Describe a synthetic relation with known dependencies and generate its rows.
+
+    The relation's key is K1, K2 plus the MVD columns M1..Mm. Every K1 group
+    holds all combinations of 4 K2 values and 2 values per MVD column, so
+    K1 ->> Mj holds for every j; rows is rounded down to whole groups. The
+    other columns form FD chains: each chain starts at K1 or K2 (a partial
+    dependency) and every further column depends on the previous one (a
+    transitive dependency), so 2NF, 3NF, BCNF and 4NF all have work to do.
+    Values are hashed from their determinant, so the FDs hold exactly.
+
+    Args:
+        rows (int): About how many rows to generate.
+        attributes (int): The number of columns.
+        chains (int): The number of FD chains (defaults to one per 3 chain columns).
+        mvds (int): The number of MVD columns.
+        skew (float): 0 spreads chain values uniformly; larger values concentrate them.
+        cardinality (int): The number of distinct values a chain column can take.
+        seed (int): Seeds the hash salts.
+
+    Returns:
+        tuple: (column names, FD strings, MVD strings, iterator over rows as lists of strings)
+    """
+    import random
+    dependents = attributes - 2 - mvds
+    if dependents < 0:
+        raise ValueError(f"{attributes} attributes leave no room for the key and {mvds} MVD columns")
+    chains = min(chains or max(1, dependents // 3), dependents) if dependents else 0
+    generator = random.Random(seed)
+    columns = ["K1", "K2"] + [f"M{j}" for j in range(1, mvds + 1)]
+    chain_columns = []
+    functional_dependencies = []
+    for chain in range(chains):
+        length = dependents // chains + (chain < dependents % chains)
+        determinant = "K1" if chain % 2 == 0 else "K2"
+        for position in range(1, length + 1):
+            column = f"A{chain}_{position}"
+            chain_columns.append((chain, position, generator.getrandbits(32)))
+            functional_dependencies.append(f"{determinant} -> {column}")
+            columns.append(column)
+            determinant = column
+    multivalued_dependencies = [f"K1 ->> M{j}" for j in range(1, mvds + 1)]
+    group_size = 4 << mvds
+    groups = max(1, rows // group_size)
+    k2_cardinality = max(4, cardinality)
+
+    def generate():
+        # Further chain columns only see codes below cardinality, so they are looked up, not hashed
+        lookups = [[_skewed_code(value, salt, cardinality, skew) for value in range(max(cardinality, k2_cardinality))]
+                   for _, _, salt in chain_columns]
+        for group in range(groups):
+            fixed = {}
+            k2_values = [(group * 31 + i) % k2_cardinality for i in range(4)]
+            for combination in range(group_size):
+                k2 = k2_values[combination & 3]
+                row = [str(group), str(k2)]
+                for j in range(mvds):
+                    row.append(f"m{(group * 17 + j * 101 + (combination >> (2 + j) & 1)) % k2_cardinality}")
+                previous = None
+                for (chain, position, salt), lookup in zip(chain_columns, lookups):
+                    if position == 1:
+                        if chain % 2 == 0:
+                            if chain not in fixed:
+                                fixed[chain] = _skewed_code(group, salt, cardinality, skew)
+                            previous = fixed[chain]
+                        else:
+                            previous = lookup[k2]
+                    else:
+                        previous = lookup[previous]
+                    row.append(f"v{previous}")
+                yield row
+
+    return columns, functional_dependencies, multivalued_dependencies, generate()
+
+def write_synthetic_relation(directory, **parameters):
+    """
+    Write a synthetic relation as <name>.csv, <name>.fd.txt and <name>.mvd.txt, reusing earlier files.
+
+    The name is a hash of the parameters, so each relation is generated once.
+
+    Returns:
+        tuple: (CSV path, FD path, MVD path)
+    """
+    name = "relation-" + hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:12]
+    paths = tuple(os.path.join(directory, name + suffix) for suffix in (".csv", ".fd.txt", ".mvd.txt"))
+    if all(os.path.exists(path) for path in paths):
+        return paths
+    os.makedirs(directory, exist_ok=True)
+    columns, functional_dependencies, multivalued_dependencies, rows = synthetic_relation(**parameters)
+    with open(paths[0] + '.tmp', 'w', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+        csv_writer = csv.writer(file)
+        csv_writer.writerow(columns)
+        csv_writer.writerows(rows)
+    with open(paths[1], 'w') as file:
+        file.write('\n'.join(functional_dependencies) + '\n')
+    with open(paths[2], 'w') as file:
+        file.write('\n'.join(multivalued_dependencies) + '\n')
+    # The CSV is renamed last, so an interrupted run never leaves a truncated relation behind
+    os.replace(paths[0] + '.tmp', paths[0])
+    return paths
+
+def _peak_rss_kb():
+    """
+    Return the process's peak resident set size in KB, or None where the resource module is missing.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def benchmark_relation(csv_path, fd_path, mvd_path):
+    """
+    Time every normalization stage on one relation (run it in a fresh process for meaningful peak RSS).
+
+    Returns:
+        dict: Row, attribute and byte counts plus stage names mapped to seconds,
+        CPU seconds, throughput and the peak RSS so far.
+    """
+    stages = {}
+
+    def stage(name, count, unit, function, *args):
+        start, cpu = time.perf_counter(), time.process_time()
+        value = function(*args)
+        seconds = time.perf_counter() - start
+        if callable(count):
+            count = count(value)
+        stages[name] = {'seconds': seconds, 'cpu_seconds': time.process_time() - cpu,
+                        'throughput': count / seconds if seconds else None, 'unit': unit,
+                        'peak_rss_kb': _peak_rss_kb()}
+        return value
+
+    size = os.path.getsize(csv_path)
+    dataset = stage('parse_dataset', size / 1e6, 'MB/s', parse_dataset, csv_path)
+    rows, attributes = dataset.row_count, list(dataset.keys())
+    fds = stage('parse_functional_dependencies', len, 'FDs/s', parse_functional_dependencies, fd_path)
+    mvds = stage('parse_mvd_dependencies', len, 'MVDs/s', parse_mvd_dependencies, mvd_path)
+    schema = stage('compile_dependencies', len(fds), 'FDs/s', Schema, attributes, fds, mvds)
+    model = schema.model
+    stage('closure', len(attributes), 'attributes/s',
+          lambda: [model.closure_mask(1 << bit) for bit in range(len(attributes))])
+    stage('candidate_keys', len(attributes), 'attributes/s', lambda: schema.candidate_keys)
+    stage('generate_1nf_queries', len(attributes), 'attributes/s', generate_1nf_queries, dataset)
+    normalizer = Normalizer(verify=False)
+    results = {}
+    for normal_form in ("2NF", "3NF", "BCNF", "4NF"):
+        results[normal_form] = stage(f'decompose_{normal_form}', rows, 'rows/s', normalizer.normalize,
+                                     dataset, schema, normal_form)
+    tables = results["3NF"].tables
+    stage('create_table_query', len(tables), 'tables/s',
+          lambda: [create_table_query(table.name, table.attributes, table.key, table.data) for table in tables])
+    table_rows = sum(table.data.row_count for table in tables)
+    for data_format in ("insert", "csv"):
+        import tempfile
+        with tempfile.TemporaryDirectory(prefix='benchmark-') as directory:
+            stage(f'write_data_{data_format}', table_rows, 'rows/s', write_decomposed_data,
+                  {table.name: table.data for table in tables}, os.path.join(directory, "data"), data_format)
+    stage('verify_decomposition', len(tables), 'tables/s', verify_decomposition, attributes,
+          {table.name: table.attributes for table in tables}, model)
+    return {'rows': rows, 'attributes': len(attributes), 'bytes': size, 'stages': stages}
+
+def run_benchmarks(scenarios, output_path=BENCHMARK_OUTPUT_PATH, data_dir="benchmark-data"):
+    """
+    Benchmark every scenario on synthetic data and write the results as JSON.
+
+    Each scenario is a dict of synthetic_relation parameters. Relations are
+    generated once into data_dir (generation is not timed) and each scenario
+    runs in its own process, so peak RSS belongs to that scenario alone.
+
+    Returns:
+        dict: The environment (commit, Python, platform, CPUs) and one entry per scenario.
+    """
+    import platform
+    import subprocess
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    report = {'created': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+              'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+              'scenarios': []}
+    for i, parameters in enumerate(scenarios, 1):
+        print(f"[{i}/{len(scenarios)}] {parameters}")
+        paths = write_synthetic_relation(data_dir, **parameters)
+        with ProcessPoolExecutor(1) as pool:
+            result = pool.submit(benchmark_relation, *paths).result()
+        report['scenarios'].append(dict(result, parameters=parameters))
+        for name, timing in result['stages'].items():
+            print(f"  {name:30} {timing['seconds']:9.3f}s  {timing['throughput'] or 0:14,.0f} {timing['unit']:13}"
+                  f" peak {timing['peak_rss_kb'] or 0:,} KB")
+    with open(output_path, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Benchmark results written to {output_path}")
+    return report
+
+def compare_benchmarks(baseline, report):
+    """
+    Print each stage's time against a baseline report (for instance from an earlier commit).
+    """
+    key = lambda scenario: json.dumps(scenario['parameters'], sort_keys=True)
+    earlier = {key(scenario): scenario for scenario in baseline['scenarios']}
+    for scenario in report['scenarios']:
+        before = earlier.get(key(scenario))
+        if before is None:
+            continue
+        print(f"{scenario['parameters']} vs {baseline.get('commit') or 'baseline'}:")
+        for name, timing in scenario['stages'].items():
+            if name in before['stages'] and timing['seconds']:
+                speedup = before['stages'][name]['seconds'] / timing['seconds']
+                print(f"  {name:30} {before['stages'][name]['seconds']:9.3f}s -> {timing['seconds']:9.3f}s"
+                      f"  ({speedup:.2f}x)")
+
+# Scenario sets for --benchmark; a JSON file with a list of synthetic_relation parameter dicts works too
+BENCHMARK_PRESETS = {
+    'quick': [dict(rows=rows, attributes=10) for rows in (1000, 10000, 100000)]
+             + [dict(rows=10000, attributes=50)],
+    'full': [dict(rows=rows, attributes=20) for rows in (1000, 10000, 100000, 1000000, 10000000)]
+            + [dict(rows=10000, attributes=attributes) for attributes in (10, 50, 100, 250, 500)]
+            + [dict(rows=100000, attributes=20, skew=skew) for skew in (1.0, 3.0)]
+            + [dict(rows=100000, attributes=20, mvds=mvds, chains=chains) for mvds, chains in ((3, 2), (1, 8))],
+}
 
-        # Print the parsed data for demonstration
-        for column, values in parsed_data.items():
-            print(f"{column}: {', '.join(values)}")
-        composite_keys = []
-        composite_keys = get_composite_keys()
+def main(argv=None):
+    parser = build_argument_parser()
+    args = parser.parse_args(argv)
+    options = {field: value for field, value in (
+        ('normal_form', args.normal_form), ('naming', args.naming), ('table_prefix', args.table_prefix),
+        ('output_dir', args.output_dir), ('data_format', args.data_format), ('sqlite', args.sqlite),
+        ('keys', args.keys), ('jds', args.jd), ('incremental', args.incremental or None),
+        ('report', args.report), ('profile', args.profile), ('cache', args.cache or None),
+        ('discover', args.discover or None))
+        if value is not None}
 
+    if args.serve:
+        host, _, port = args.serve.rpartition(':')
+        cache_bytes = args.cache_mb << 20 if args.cache_mb else SERVICE_CACHE_BYTES
+        normalizer = Normalizer(args.naming or TABLE_NAMING, args.table_prefix or TABLE_PREFIX)
+        return serve(NormalizationService(cache_bytes, normalizer), host or "127.0.0.1", int(port))
+    if args.benchmark:
+        if args.benchmark in BENCHMARK_PRESETS:
+            scenarios = BENCHMARK_PRESETS[args.benchmark]
+        else:
+            with open(args.benchmark, 'r') as file:
+                scenarios = json.load(file)
+        output_dir = args.output_dir or '.'
+        os.makedirs(output_dir, exist_ok=True)
+        report = run_benchmarks(scenarios, os.path.join(output_dir, BENCHMARK_OUTPUT_PATH),
+                                os.path.join(output_dir, "benchmark-data"))
+        if args.benchmark_baseline:
+            with open(args.benchmark_baseline, 'r') as file:
+                compare_benchmarks(json.load(file), report)
+        return report
+    if args.job:
+        jobs = [dict(job, **options) for job in load_job_file(args.job)]
+    elif args.directory:
+        if not os.path.isdir(args.directory):
+            print(f"Error: {args.directory} is not a directory.")
+            sys.exit(1)
+        jobs = directory_jobs(args.directory, options)
+    elif args.dataset and (args.functional_dependencies or args.discover):
+        jobs = [dict(options, data=args.dataset, fds=args.functional_dependencies, mvds=args.mvd)]
+    else:
+        parser.error("give a dataset and its functional dependencies (or --discover), --job or --directory")
+    if not jobs:
+        print(f"Error: no tables to normalize in {args.directory or args.job}.")
+        sys.exit(1)
+
+    if args.check:
+        violated = False
+        try:
+            for job in jobs:
+                report = check_job(job)
+                violated |= any(violation['rows'] for violation in report['violations'].values())
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if violated else 0)
+    if any(not job.get('normal_form') for job in jobs):
+        if not sys.stdin.isatty():
+            parser.error("--normal-form is required when not running interactively")
+        # Asked once; every job without its own normal form gets the answer
         choice = input("Enter the highest normal form to reach (1NF, 2NF, 3NF, BCNF, 4NF, 5NF:")
-        while(choice not in ["1NF","2NF","3NF","BCNF","4NF","5NF"]):
+        while(choice not in NORMAL_FORMS):
             print("Entered normal form is invalid, please enter a valid normal form")
             choice = input("Enter the highest normal form to reach (1NF, 2NF, 3NF, BCNF, 4NF, 5NF:")
-        mvd_dependencies=[]
-        if choice in ["4NF","5NF"]:
-            mvd_dependencies = parse_mvd_dependencies(mvd_file_path)  #path of mutlivalue dependency file
-            print('MULTI-VALUED DEPENDENCIES')
-            print(mvd_dependencies)
-            print('\n')
-        
-        decomposition = get_normal_form_choice(parsed_data, functional_dependencies,choice,mvd_dependencies)
-        # Print the generated queries
-        
-
-        #highest_normal_form = find_highest_normal_form(parsed_data, functional_dependencies)
-
-        output_file_path = "outputl.txt"  # Replace with the desired output file path
-        #output_query_path = "query.txt"
-        write_to_text_file(parsed_data, output_file_path)
-
-        print(f"Parsed Data has been written to {output_file_path}")
-        #print(f"Highest Normal Form: {highest_normal_form}\n")
+        for job in jobs:
+            job['normal_form'] = job.get('normal_form') or choice
+    if len(jobs) > 1 or args.workers:
+        results = run_batch(jobs, args.workers, args.retries)
+        sys.exit(1 if any(result['status'] != 'ok' for result in results) else 0)
+    try:
+        run_job(jobs[0])
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
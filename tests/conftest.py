@@ -0,0 +1,109 @@
+import csv
+import importlib.util
+import os
+import random
+import sys
+from itertools import combinations
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The script's file name is not a valid module name, so it is loaded by path
+spec = importlib.util.spec_from_file_location("parser_projectf", os.path.join(REPO, "parser-Projectf.py"))
+parser_projectf = importlib.util.module_from_spec(spec)
+sys.modules["parser_projectf"] = parser_projectf
+spec.loader.exec_module(parser_projectf)
+
+
+def random_schema(seed, max_attributes=6, max_fds=6, unknown=()):
+    """
+    A random relation and FDs over it; names in unknown may also appear in the FDs.
+    """
+    rng = random.Random(seed)
+    attributes = [f"A{i}" for i in range(rng.randint(2, max_attributes))]
+    names = attributes + list(unknown)
+    fds = []
+    for _ in range(rng.randint(0, max_fds)):
+        lhs = rng.sample(names, rng.randint(1, min(3, len(names))))
+        rhs = rng.sample(names, rng.randint(1, 2))
+        fds.append(f"{', '.join(lhs)} -> {', '.join(rhs)}")
+    return attributes, fds
+
+
+def subsets(attributes):
+    for size in range(len(attributes) + 1):
+        for subset in combinations(attributes, size):
+            yield frozenset(subset)
+
+
+def brute_closure(attributes, fds):
+    closed = set(attributes)
+    parsed = [parser_projectf.parse_fd(fd) for fd in fds]
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in parsed:
+            if closed.issuperset(lhs) and not closed.issuperset(rhs):
+                closed.update(rhs)
+                changed = True
+    return closed
+
+
+def brute_keys(attributes, fds):
+    superkeys = [subset for subset in subsets(attributes) if brute_closure(subset, fds) >= set(attributes)]
+    return {key for key in superkeys if not any(other < key for other in superkeys)}
+
+
+def random_rows(seed, max_attributes=5, max_rows=12):
+    rng = random.Random(seed)
+    attributes = [f"A{i}" for i in range(rng.randint(2, max_attributes))]
+    domains = [rng.randint(1, 4) for _ in attributes]
+    rows = [tuple(str(rng.randrange(domain)) for domain in domains) for _ in range(rng.randint(1, max_rows))]
+    return attributes, rows
+
+
+def dataset(attributes, rows):
+    columns = {attr: [row[i] for row in rows] for i, attr in enumerate(attributes)}
+    return parser_projectf.ColumnStore.from_batches([columns])
+
+
+def natural_join(attributes, tables):
+    """Join projections given as (attributes, set of tuples) pairs and return the rows over all attributes."""
+    joined = [{}]
+    for table_attributes, table_rows in tables:
+        joined = [dict(partial, **dict(zip(table_attributes, row))) for partial in joined for row in table_rows
+                  if all(partial.get(attr, value) == value for attr, value in zip(table_attributes, row))]
+    return {tuple(row[attr] for attr in attributes) for row in joined}
+
+
+def projection(attributes, rows, table):
+    positions = [attributes.index(attr) for attr in table]
+    return {tuple(row[i] for i in positions) for row in rows}
+
+
+# A small employee table whose values need quoting, escaping and NULL handling in every output format
+EMPLOYEE_HEADER = ["EmpID", "Name", "Dept", "DeptHead", "Phone", "Salary"]
+EMPLOYEE_ROWS = [
+    ["1", "O'Brien, Pat", "Sales", "Kim", "555-0100", "52000.75"],
+    ["2", "Lee \"Ace\"", "Sales", "Kim", "", "48000"],
+    ["3", "Multi\nLine", "", "Nobody", "555-0101", "51000"],
+    ["4", "Ng", "", "Nobody", "", "47000.25"],
+    ["5", "Back\\slash", "R&D", "Ola", "555-0102", "60000"],
+]
+EMPLOYEE_FDS = ["EmpID -> Name, Dept, Phone, Salary", "Dept -> DeptHead"]
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+
+
+def rows_of(store):
+    return list(zip(*(list(store[attr]) for attr in store.keys())))
+
+
+def normalize_employees(normal_form, attributes=EMPLOYEE_HEADER, rows=EMPLOYEE_ROWS, fds=EMPLOYEE_FDS):
+    store = parser_projectf.ColumnStore.from_batches([{attr: [row[i] for row in rows] for i, attr in enumerate(attributes)}])
+    return parser_projectf.Normalizer().normalize(store, parser_projectf.Schema(attributes, fds), normal_form)
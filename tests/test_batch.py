@@ -0,0 +1,66 @@
+"""
+Batch runs: results in input order, separate outputs, retried failures and a requeue after a worker dies.
+"""
+import os
+
+import pytest
+
+import parser_projectf as pp
+
+RUN_JOB = pp.run_job
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    jobs = []
+    for name, rows in (("small", 2), ("large", 40), ("medium", 10)):
+        (tmp_path / f"{name}.csv").write_text("A,B,C\n" + "".join(f"{i},{i % 3},{i % 3}\n" for i in range(rows)))
+        (tmp_path / f"{name}.fd.txt").write_text("A -> B\nB -> C\n")
+        jobs.append({'data': str(tmp_path / f"{name}.csv"), 'fds': str(tmp_path / f"{name}.fd.txt"),
+                     'normal_form': "3NF", 'output_dir': str(tmp_path / "out")})
+    return jobs
+
+
+def fail_once(tmp_path, failure):
+    """A run_job that fails its first call on small.csv in the way given, then runs normally."""
+    marker = str(tmp_path / "failed")
+
+    def run_job(job):
+        if job['data'].endswith("small.csv") and not os.path.exists(marker):
+            open(marker, 'w').close()
+            failure()
+        return RUN_JOB(job)
+    return run_job
+
+
+def test_results_keep_the_input_order_and_separate_outputs(jobs):
+    results = pp.run_batch(jobs, workers=2, retries=0)
+    assert [result['data'] for result in results] == [job['data'] for job in jobs]
+    assert all(result['status'] == 'ok' and result['attempts'] == 1 and result['tables'] == 2 for result in results)
+    assert len({result['output_dir'] for result in results}) == len(jobs)
+    assert all(os.path.isfile(os.path.join(result['output_dir'], "log.txt")) for result in results)
+
+
+def test_a_failing_job_is_retried_then_reported(jobs):
+    os.remove(jobs[0]['fds'])
+    results = pp.run_batch(jobs, workers=2, retries=2)
+    assert results[0]['status'] == 'failed' and results[0]['attempts'] == 3
+    assert "FileNotFoundError" in results[0]['error']
+    assert [result['status'] for result in results[1:]] == ['ok', 'ok']
+
+
+def test_a_transient_failure_succeeds_on_retry(jobs, tmp_path, monkeypatch):
+    def fail():
+        raise OSError("disk hiccup")
+    monkeypatch.setattr(pp, "run_job", fail_once(tmp_path, fail))
+    results = pp.run_batch(jobs, workers=2, retries=1)
+    assert results[0]['status'] == 'ok' and results[0]['attempts'] == 2
+    assert all(result['status'] == 'ok' for result in results)
+
+
+def test_jobs_of_a_dead_worker_are_requeued(jobs, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(pp, "run_job", fail_once(tmp_path, lambda: os._exit(1)))
+    results = pp.run_batch(jobs, workers=2, retries=1)
+    assert "restarting the pool" in capsys.readouterr().out
+    assert all(result['status'] == 'ok' for result in results)
+    assert results[0]['attempts'] == 2
@@ -0,0 +1,42 @@
+"""
+BCNF decomposition and violation checks against the definition on small random schemas.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import brute_closure, random_schema, subsets
+
+SEEDS = range(200)
+
+
+def is_bcnf_by_definition(relation, fds):
+    """Every subset of the relation determines, within it, only itself or the whole relation."""
+    for subset in subsets(sorted(relation)):
+        determined = brute_closure(subset, fds) & relation
+        if determined != subset and determined != relation:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bcnf_decomposition_is_lossless_and_in_bcnf(seed):
+    attributes, fds = random_schema(seed)
+    tables = pp.bcnf_decomposition(fds, attributes)
+    components = {f"t{i}": table for i, (_, table) in enumerate(tables)}
+    report = pp.verify_decomposition(attributes, components, pp.compile_dependencies(fds, attributes))
+    assert report['lossless']
+    assert set().union(*components.values()) == set(attributes)
+    for key, table in tables:
+        assert is_bcnf_by_definition(set(table), fds), table
+        assert brute_closure(key, fds) >= set(table)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bcnf_violation_agrees_with_the_definition(seed):
+    attributes, fds = random_schema(seed)
+    model = pp.compile_dependencies(fds, attributes)
+    lhs = pp.bcnf_violation(model, model.mask(attributes))
+    assert (lhs is None) == is_bcnf_by_definition(set(attributes), fds)
+    if lhs is not None:
+        determined = brute_closure(model.names(lhs), fds)
+        assert not determined >= set(attributes) and determined - set(model.names(lhs))
@@ -0,0 +1,41 @@
+"""
+Decomposed table data written as CSV files and INSERT scripts, read back and rejoined.
+"""
+import csv
+import sqlite3
+
+import pytest
+
+from conftest import EMPLOYEE_HEADER, EMPLOYEE_ROWS, normalize_employees, rows_of
+
+
+@pytest.mark.parametrize("normal_form", ["2NF", "3NF", "BCNF"])
+def test_csv_output_rejoins_to_the_input(tmp_path, normal_form):
+    result = normalize_employees(normal_form)
+    result.write(str(tmp_path), data_format="csv")
+    joined = [{}]
+    for table in result.tables:
+        with open(tmp_path / "data" / f"{table.name}.csv", newline='') as file:
+            reader = csv.reader(file)
+            assert next(reader) == table.attributes
+            table_rows = [dict(zip(table.attributes, row)) for row in reader]
+        assert len(table_rows) == table.data.row_count
+        joined = [dict(partial, **row) for partial in joined for row in table_rows
+                  if all(partial.get(attr, value) == value for attr, value in row.items())]
+    assert {tuple(row[attr] for attr in EMPLOYEE_HEADER) for row in joined} == {tuple(row) for row in EMPLOYEE_ROWS}
+
+
+@pytest.mark.parametrize("normal_form", ["2NF", "3NF", "BCNF"])
+def test_insert_script_loads_into_sqlite(tmp_path, normal_form):
+    result = normalize_employees(normal_form)
+    written = result.write(str(tmp_path), data_format="insert")
+    connection = sqlite3.connect(":memory:")
+    connection.executescript('\n'.join(result.queries))
+    with open(written['data']) as file:
+        connection.executescript(file.read())
+    for table in result.tables:
+        loaded = connection.execute(f"SELECT {', '.join(table.attributes)} FROM {table.name}").fetchall()
+        assert all(row[table.attributes.index(attr)] is not None for row in loaded for attr in table.key)
+        expected = set(rows_of(table.data))
+        assert {tuple('' if value is None else str(value) for value in row) for row in loaded} == expected
+    connection.close()
@@ -0,0 +1,39 @@
+"""
+Candidate keys against the brute-force minimal superkeys.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import brute_keys, random_schema
+
+SEEDS = range(200)
+
+
+@pytest.mark.parametrize("unknown", [(), ("X0", "X1")])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_candidate_keys_are_the_minimal_superkeys(seed, unknown):
+    attributes, fds = random_schema(seed, unknown=unknown)
+    keys = pp.find_candidate_keys(fds, attributes)
+    assert {frozenset(key) for key in keys} == brute_keys(attributes, fds)
+    assert [len(key) for key in keys] == sorted(len(key) for key in keys)
+
+
+@pytest.mark.parametrize("fds, attributes, keys", [
+    (["C -> B"], ["A", "B"], [["A", "B"]]),
+    (["A -> C", "C -> B"], ["A", "B"], [["A"]]),
+    ([], ["A", "B"], [["A", "B"]]),
+    (["A -> B", "B -> A"], ["A", "B"], [["A"], ["B"]]),
+])
+def test_candidate_keys_of_small_schemas(fds, attributes, keys):
+    assert pp.find_candidate_keys(fds, attributes) == keys
+
+
+def test_limit_stops_after_the_first_keys():
+    assert pp.find_candidate_keys(["A -> B", "B -> A"], ["A", "B"], limit=1) == [["A"]]
+
+
+def test_decompositions_survive_fds_that_never_fire():
+    assert (["A", "B"], ["A", "B"]) in pp.synthesize_3nf(["C -> B"], ["A", "B"])
+    tables = pp.second_nf_decomposition(pp.compile_dependencies(["C -> B"], ["A", "B"]), ["A", "B"],
+                                        pp.find_candidate_keys(["C -> B"], ["A", "B"]))
+    assert any(set(table) == {"A", "B"} for _, table in tables)
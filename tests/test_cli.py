@@ -0,0 +1,62 @@
+"""
+The command line's error handling and the run helpers around it.
+"""
+import os
+
+import pytest
+
+import parser_projectf as pp
+
+
+def test_empty_directory_exits_with_an_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main(["--directory", str(tmp_path), "--normal-form", "3NF"])
+    assert exit_info.value.code == 1
+    assert "Error:" in capsys.readouterr().out
+
+
+def test_missing_data_file_exits_with_an_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main([str(tmp_path / "missing.csv"), str(tmp_path / "fd.txt"), "--normal-form", "3NF",
+                 "--output-dir", str(tmp_path)])
+    assert exit_info.value.code == 1
+    assert "missing.csv" in capsys.readouterr().out
+
+
+def test_missing_fd_file_exits_instead_of_running_without_fds(tmp_path, capsys):
+    (tmp_path / "t.csv").write_text("A,B\n1,2\n")
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main([str(tmp_path / "t.csv"), str(tmp_path / "typo_fds.txt"), "-n", "3NF", "-o", str(tmp_path / "out")])
+    assert exit_info.value.code == 1
+    assert "typo_fds.txt" in capsys.readouterr().out
+    assert not (tmp_path / "out").exists()
+
+
+def test_fd_on_a_missing_column_exits_with_an_error(tmp_path, capsys):
+    (tmp_path / "t.csv").write_text("A,B\n1,2\n")
+    (tmp_path / "fd.txt").write_text("A -> B\nC -> B\n")
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main([str(tmp_path / "t.csv"), str(tmp_path / "fd.txt"), "-n", "3NF", "-o", str(tmp_path / "out")])
+    assert exit_info.value.code == 1
+    assert "Error: Unknown attributes: C" in capsys.readouterr().out
+
+
+def test_normal_form_is_asked_once_for_a_directory(tmp_path, monkeypatch):
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.csv").write_text("A,B\n1,2\n2,2\n")
+        (tmp_path / f"{name}.fd.txt").write_text("A -> B\n")
+    prompts = []
+    monkeypatch.setattr(pp.sys.stdin, "isatty", lambda: True, raising=False)
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "3NF")
+    monkeypatch.setattr(pp, "run_batch", lambda jobs, workers, retries: [
+        {'status': 'ok' if job['normal_form'] == "3NF" else 'failed'} for job in jobs])
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main(["--directory", str(tmp_path), "-o", str(tmp_path / "out")])
+    assert exit_info.value.code == 0
+    assert len(prompts) == 1
+
+
+def test_join_dependencies_default_next_to_the_inputs():
+    assert pp._join_dependencies_path({'data': "in/t.csv", 'fds': "deps/t.fd.txt"}) == os.path.join("deps", "jd.txt")
+    assert pp._join_dependencies_path({'data': "in/t.csv"}) == os.path.join("in", "jd.txt")
+    assert pp._join_dependencies_path({'data': "in/t.csv", 'jds': "j.txt"}) == "j.txt"
@@ -0,0 +1,17 @@
+"""
+Attribute closure against a brute-force fixpoint on small random schemas.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import brute_closure, random_schema, subsets
+
+SEEDS = range(200)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_closure_matches_fixpoint(seed):
+    attributes, fds = random_schema(seed)
+    model = pp.compile_dependencies(fds, attributes)
+    for subset in subsets(attributes):
+        assert model.closure(subset) == brute_closure(subset, fds)
@@ -0,0 +1,98 @@
+"""
+Streaming CSV input: what the readers keep, and the bounded-memory check over it.
+"""
+import csv
+
+import pytest
+
+import parser_projectf as pp
+
+HEADER = ["EmpID", "Name", "Dept"]
+ROWS = [
+    ["1", "O'Brien, Pat", "Sales"],
+    ["2", "Lee \"Ace\"", ""],
+    ["3", "Multi\nLine", "R&D"],
+    ["", "", ""],
+    ["5", "Back\\slash", "Sales"],
+]
+
+
+def write_csv(path, rows, header=HEADER):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def rows_of(store):
+    return list(zip(*(list(store[attr]) for attr in store.keys())))
+
+
+def test_parse_dataset_reads_what_csv_writes(tmp_path):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, ROWS)
+    with open(path, 'a', newline='') as file:
+        file.write("\n6,Short\n")
+    store = pp.parse_dataset(path, workers=1)
+    assert list(store.keys()) == HEADER
+    assert rows_of(store) == [tuple(row) for row in ROWS] + [("6", "Short", "")]
+
+
+@pytest.mark.parametrize("text", ["A,B\n1,2\n,\n3,4\n", "A,B\n1,2\n\n3,4\n\n", "A,B\r\n,\r\n\r\n,\r\n"])
+def test_readers_keep_the_rows_dict_reader_keeps(tmp_path, text):
+    path = tmp_path / "input.csv"
+    path.write_bytes(text.encode())
+    with open(path, newline='') as file:
+        expected = [(row['A'], row['B']) for row in csv.DictReader(file)]
+    assert rows_of(pp.parse_dataset(str(path), workers=1)) == expected
+    assert rows_of(pp.parse_dataset_parallel(str(path), workers=2, chunk_bytes=4)) == expected
+    header = len(text.split('\n', 1)[0]) + 1
+    appended = list(pp.stream_appended_rows(str(path), header, ["A", "B"]))
+    assert [row for batch in appended for row in zip(batch["A"], batch["B"])] == expected
+
+
+def test_batches_are_bounded(tmp_path):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, ROWS * 10)
+    batches = list(pp.stream_dataset(path, batch_size=7))
+    assert all(len(batch["EmpID"]) <= 7 for batch in batches)
+    assert sum(len(batch["EmpID"]) for batch in batches) == len(ROWS) * 10
+
+
+def test_header_only_file_keeps_its_columns(tmp_path):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, [])
+    store = pp.parse_dataset(path, workers=1)
+    assert list(store.keys()) == HEADER and store.row_count == 0
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 1000])
+def test_scan_matches_the_loaded_table(tmp_path, batch_size):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, ROWS + [["1", "Other", "Sales"], ["2", "Lee \"Ace\"", "HR"]])
+    fds = ["EmpID -> Name", "EmpID -> Dept"]
+    report = pp.scan_dataset(path, fds, batch_size)
+    store = pp.parse_dataset(path, workers=1)
+    assert report['rows'] == store.row_count
+    assert report['columns'] == HEADER
+    assert report['is_1nf'] == pp.check_1nf(store)
+    assert report['data_types'] == {attr: pp.profile_column(store[attr]).sql_type for attr in HEADER}
+    violations = pp.validate_functional_dependencies(store, fds, workers=1)
+    assert {fd: violation['rows'] for fd, violation in report['violations'].items()} == {
+        fd: violation['rows'] for fd, violation in violations.items()}
+    assert report['violations']["EmpID -> Name"]['samples'] == [6]
+
+
+def test_check_reports_violations_and_exits_non_zero(tmp_path, capsys):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, ROWS + [["1", "Other", "Sales"]])
+    (tmp_path / "fd.txt").write_text("EmpID -> Name\n")
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main([path, str(tmp_path / "fd.txt"), "--check"])
+    assert exit_info.value.code == 1
+    output = capsys.readouterr().out
+    assert "Scanned 6 rows" in output and "EmpID -> Name is violated by 1 rows" in output
+    (tmp_path / "fd.txt").write_text("EmpID, Name -> Dept\n")
+    with pytest.raises(SystemExit) as exit_info:
+        pp.main([path, str(tmp_path / "fd.txt"), "--check"])
+    assert exit_info.value.code == 0
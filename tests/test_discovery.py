@@ -0,0 +1,87 @@
+"""
+FD discovery against an exhaustive search of small random tables.
+"""
+from itertools import combinations
+
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, random_rows
+
+SEEDS = range(60)
+
+
+def holds(attributes, rows, lhs, rhs):
+    positions = [attributes.index(attr) for attr in lhs]
+    target = attributes.index(rhs)
+    seen = {}
+    for row in rows:
+        if seen.setdefault(tuple(row[i] for i in positions), row[target]) != row[target]:
+            return False
+    return True
+
+
+def brute_minimal_fds(attributes, rows):
+    """Every minimal FD with a non-empty left-hand side; constant columns only have the empty one."""
+    found = set()
+    for rhs in attributes:
+        others = [attr for attr in attributes if attr != rhs]
+        for size in range(len(others) + 1):
+            for lhs in combinations(others, size):
+                if any(found_lhs <= set(lhs) for found_lhs, found_rhs in found if found_rhs == rhs):
+                    continue
+                if holds(attributes, rows, lhs, rhs):
+                    found.add((frozenset(lhs), rhs))
+    return {(lhs, rhs) for lhs, rhs in found if lhs}
+
+
+def parsed(fds):
+    result = set()
+    for fd in fds:
+        lhs, rhs = pp.parse_fd(fd)
+        assert len(rhs) == 1
+        result.add((frozenset(lhs), rhs[0]))
+    return result
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_discovery_finds_exactly_the_minimal_fds(seed):
+    attributes, rows = random_rows(seed)
+    discovered = pp.discover_functional_dependencies(dataset(attributes, rows), max_lhs=None)
+    assert parsed(discovered) == brute_minimal_fds(attributes, rows)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_discovery_respects_max_lhs(seed):
+    attributes, rows = random_rows(seed)
+    bounded = pp.discover_functional_dependencies(dataset(attributes, rows), max_lhs=1)
+    assert parsed(bounded) == {fd for fd in brute_minimal_fds(attributes, rows) if len(fd[0]) <= 1}
+
+
+def test_approximate_fds_tolerate_a_few_violations():
+    rows = [(str(i % 5), str(i % 5)) for i in range(100)] + [("0", "9")]
+    store = dataset(["A", "B"], rows)
+    assert "A -> B" not in pp.discover_functional_dependencies(store)
+    assert "A -> B" in pp.discover_functional_dependencies(store, max_error=0.02)
+
+
+@pytest.mark.parametrize("rows", [[("1", "2"), ("1", "3")], [("1", "2")]])
+def test_constant_columns_get_no_empty_key(tmp_path, rows):
+    store = dataset(["X", "Y"], rows)
+    fds = pp.discover_functional_dependencies(store)
+    assert all(pp.parse_fd(fd)[0] for fd in fds)
+    result = pp.Normalizer().normalize(store, pp.Schema(["X", "Y"], fds), "3NF")
+    assert all(table.key and table.name for table in result.tables)
+    assert not any("PRIMARY KEY ()" in query for query in result.queries)
+    result.write(str(tmp_path), sqlite_path=str(tmp_path / "out.db"))
+    assert result.sqlite_report['lossless']
+
+
+def test_command_line_only_discovers_when_asked(tmp_path, capsys):
+    (tmp_path / "t.csv").write_text("X,Y\n1,2\n2,3\n3,3\n")
+    (tmp_path / "fd.txt").write_text("")
+    arguments = [str(tmp_path / "t.csv"), str(tmp_path / "fd.txt"), "-n", "3NF", "-o", str(tmp_path / "out")]
+    pp.main(arguments)
+    assert "pass --discover" in capsys.readouterr().out
+    pp.main(arguments + ["--discover"])
+    assert "Discovered functional dependencies: ['X -> Y']" in capsys.readouterr().out
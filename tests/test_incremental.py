@@ -0,0 +1,106 @@
+"""
+Incremental runs against full runs of the same inputs: appended rows, a rewritten CSV and changed FDs.
+"""
+import glob
+import os
+import sqlite3
+
+import pytest
+
+import parser_projectf as pp
+
+HEADER = "StudentID,Name,Course,Professor,Email\n"
+ROWS = ["1,Ann,Math,Smith,smith@x", "2,Bob,Math,Smith,smith@x", "1,Ann,Art,Jones,jones@x"]
+MORE = ["3,Cy,Art,Jones,jones@x", "4,Di,Bio,Lee,lee@x"]
+FDS = "StudentID -> Name\nCourse -> Professor\nProfessor -> Email\n"
+
+
+@pytest.fixture
+def job(tmp_path):
+    (tmp_path / "t.csv").write_text(HEADER + "\n".join(ROWS) + "\n")
+    (tmp_path / "fd.txt").write_text(FDS)
+    return {'data': str(tmp_path / "t.csv"), 'fds': str(tmp_path / "fd.txt"), 'normal_form': "3NF",
+            'output_dir': str(tmp_path / "out"), 'incremental': True}
+
+
+def table_rows(result):
+    return {table.name: set(zip(*(list(column) for column in table.data.values()))) for table in result.tables}
+
+
+def full_run(job):
+    dataset = pp.parse_dataset(job['data'], workers=1)
+    schema = pp.Schema(list(dataset.keys()), pp.parse_functional_dependencies(job['fds']))
+    return pp.Normalizer().normalize(dataset, schema, job['normal_form'])
+
+
+def check_outputs(job, result):
+    """The output directory holds one journal, one copy of the DDL and exactly the full run's rows."""
+    output_dir = job['output_dir']
+    assert len(glob.glob(os.path.join(output_dir, "state.pickle.*.journal"))) == 1
+    with open(os.path.join(output_dir, "query.txt")) as file:
+        assert file.read().count("CREATE TABLE") == len(result.tables)
+    connection = sqlite3.connect(":memory:")
+    connection.executescript('\n'.join(result.queries))
+    with open(os.path.join(output_dir, "data.sql")) as file:
+        connection.executescript(file.read())
+    loaded = {table.name: {tuple(str(value) for value in row) for row in connection.execute(
+        f"SELECT {', '.join(table.attributes)} FROM {table.name}")} for table in result.tables}
+    connection.close()
+    assert loaded == table_rows(full_run(job))
+
+
+def test_first_run_matches_a_full_run(job):
+    result = pp.run_incremental_job(job)
+    assert table_rows(result) == table_rows(full_run(job))
+    check_outputs(job, result)
+
+
+def test_appended_rows_are_appended(job, capsys):
+    pp.run_incremental_job(job)
+    with open(job['data'], 'a') as file:
+        file.write("\n".join(MORE) + "\n")
+    capsys.readouterr()
+    result = pp.run_incremental_job(job)
+    output = capsys.readouterr().out
+    assert "Rows: 5 (2 new)" in output and "Appended" in output
+    assert table_rows(result) == table_rows(full_run(job))
+    check_outputs(job, result)
+
+
+def test_rewritten_csv_is_read_again_without_leaving_old_journals(job):
+    pp.run_incremental_job(job)
+    for rows in (MORE, ROWS[:1] + MORE, ROWS):
+        with open(job['data'], 'w') as file:
+            file.write(HEADER + "\n".join(rows) + "\n")
+        result = pp.run_incremental_job(job)
+        assert table_rows(result) == table_rows(full_run(job))
+        check_outputs(job, result)
+
+
+def test_changed_fds_replan_the_tables(job):
+    pp.run_incremental_job(job)
+    with open(job['fds'], 'w') as file:
+        file.write("StudentID -> Name\nCourse -> Professor, Email\n")
+    result = pp.run_incremental_job(job)
+    assert table_rows(result) == table_rows(full_run(job))
+    check_outputs(job, result)
+
+
+def test_unreadable_state_starts_afresh(job):
+    pp.run_incremental_job(job)
+    with open(os.path.join(job['output_dir'], "state.pickle"), 'wb') as file:
+        file.write(b"not a pickle")
+    result = pp.run_incremental_job(job)
+    check_outputs(job, result)
+
+
+def test_state_survives_a_reload(job):
+    pp.run_incremental_job(job)
+    with open(job['data'], 'a') as file:
+        file.write("\n".join(MORE) + "\n")
+    pp.run_incremental_job(job)
+    state = pp.IncrementalState.load(os.path.join(job['output_dir'], "state.pickle"))
+    assert state.dataset.row_count == len(ROWS) + len(MORE)
+    assert [list(column) for column in state.dataset.values()] == [
+        list(column) for column in pp.parse_dataset(job['data'], workers=1).values()]
+    assert set(state.indexes) == {"StudentID -> Name", "Course -> Professor", "Professor -> Email"}
@@ -0,0 +1,48 @@
+"""
+Join dependencies: join_dependency_holds against a natural join, and 5NF on the agent/company/product table.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, natural_join, projection, random_rows
+
+SEEDS = range(100)
+ATTRIBUTES = ["Agent", "Company", "Product"]
+ROWS = [
+    ("Smith", "Ford", "car"),
+    ("Smith", "Ford", "truck"),
+    ("Smith", "GM", "car"),
+    ("Smith", "GM", "truck"),
+    ("Jones", "Ford", "car"),
+]
+COMPONENTS = [["Agent", "Company"], ["Company", "Product"], ["Agent", "Product"]]
+
+
+def test_agents_sell_what_their_companies_make():
+    assert pp.join_dependency_holds(dataset(ATTRIBUTES, ROWS), COMPONENTS)
+
+
+def test_a_missing_sale_breaks_the_join_dependency():
+    store = dataset(ATTRIBUTES, [row for row in ROWS if row != ("Smith", "Ford", "car")])
+    assert not pp.join_dependency_holds(store, COMPONENTS)
+    assert pp.join_dependency_holds(store, [["Agent", "Company"], ATTRIBUTES])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_join_dependency_holds_matches_the_join(seed):
+    attributes, rows = random_rows(seed)
+    components = [attributes[:2], attributes[1:]] if len(attributes) > 2 else [attributes[:1], attributes[1:]]
+    if len(attributes) > 3:
+        components.append([attributes[0], attributes[-1]])
+    projections = [(component, projection(attributes, rows, component)) for component in components]
+    joined = natural_join(attributes, projections)
+    assert pp.join_dependency_holds(dataset(attributes, rows), components) == (joined == set(rows))
+
+
+def test_5nf_splits_the_table_into_its_three_projections():
+    tables, applied = pp.fifth_nf_decomposition(dataset(ATTRIBUTES, ROWS), [])
+    assert sorted(sorted(table) for _, table in tables) == sorted(sorted(component) for component in COMPONENTS)
+    assert applied
+    broken = dataset(ATTRIBUTES, ROWS[1:])
+    tables, applied = pp.fifth_nf_decomposition(broken, [])
+    assert [sorted(table) for _, table in tables] == [sorted(ATTRIBUTES)] and not applied
@@ -0,0 +1,40 @@
+"""
+Minimal cover and 3NF synthesis against brute-force closures on small random schemas.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import brute_closure, random_schema, subsets
+
+SEEDS = range(200)
+
+
+def cover_strings(model, cover):
+    return [f"{', '.join(model.names(fd.lhs))} -> {', '.join(model.names(fd.rhs))}" for fd in cover]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_minimal_cover_is_equivalent_and_minimal(seed):
+    attributes, fds = random_schema(seed)
+    model = pp.compile_dependencies(fds, attributes)
+    cover = cover_strings(model, pp.minimal_cover(model))
+    for subset in subsets(attributes):
+        assert brute_closure(subset, cover) == brute_closure(subset, fds)
+    for i, fd in enumerate(cover):
+        lhs, rhs = pp.parse_fd(fd)
+        assert len(rhs) == 1 and rhs[0] not in lhs
+        rest = cover[:i] + cover[i + 1:]
+        assert rhs[0] not in brute_closure(lhs, rest), f"{fd} is redundant"
+        for attr in lhs:
+            assert rhs[0] not in brute_closure(set(lhs) - {attr}, cover), f"{attr} is extraneous in {fd}"
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_3nf_synthesis_is_lossless_and_dependency_preserving(seed):
+    attributes, fds = random_schema(seed)
+    tables = pp.synthesize_3nf(fds, attributes)
+    components = {f"t{i}": table for i, (_, table) in enumerate(tables)}
+    report = pp.verify_decomposition(attributes, components, pp.compile_dependencies(fds, attributes))
+    assert report['lossless']
+    assert report['dependency_preserving']
+    assert set().union(*components.values()) == set(attributes)
@@ -0,0 +1,55 @@
+"""
+Multivalued dependencies: mvd_holds against the definition, and 4NF on the classic many-to-many table.
+"""
+from itertools import product
+
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, random_rows
+
+SEEDS = range(100)
+COURSES = {"Math": (["Smith", "Jones"], ["Algebra", "Calculus", "Proofs"]), "Art": (["Lee"], ["Color", "Form"])}
+ATTRIBUTES = ["Course", "Teacher", "Book"]
+ROWS = [(course, teacher, book) for course, (teachers, books) in COURSES.items()
+        for teacher, book in product(teachers, books)]
+
+
+def holds_by_definition(attributes, rows, lhs, rhs):
+    """For every two rows agreeing on lhs, the row taking lhs + rhs from the first and the rest from the second exists."""
+    present = set(rows)
+    take_first = [attr in lhs or attr in rhs for attr in attributes]
+    for first, second in product(rows, repeat=2):
+        if all(first[i] == second[i] for i, attr in enumerate(attributes) if attr in lhs):
+            if tuple(a if first_side else b for a, b, first_side in zip(first, second, take_first)) not in present:
+                return False
+    return True
+
+
+def test_teachers_and_books_are_independent_per_course():
+    store = dataset(ATTRIBUTES, ROWS)
+    assert pp.mvd_holds(store, ["Course"], ["Teacher"], ["Book"])
+    assert pp.mvd_holds(store, ["Course"], ["Book"], ["Teacher"])
+
+
+def test_a_missing_combination_breaks_the_mvd():
+    store = dataset(ATTRIBUTES, [row for row in ROWS if row != ("Math", "Jones", "Proofs")])
+    assert not pp.mvd_holds(store, ["Course"], ["Teacher"], ["Book"])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_mvd_holds_matches_the_definition(seed):
+    attributes, rows = random_rows(seed)
+    store = dataset(attributes, rows)
+    lhs, rhs = attributes[:1], attributes[1:2]
+    rest = attributes[2:]
+    assert pp.mvd_holds(store, lhs, rhs, rest) == holds_by_definition(attributes, rows, lhs, rhs)
+
+
+def test_4nf_splits_the_many_to_many_table():
+    store = dataset(ATTRIBUTES, ROWS)
+    model = pp.compile_dependencies([], ATTRIBUTES, ["Course ->> Teacher"])
+    tables = pp.fourth_nf_decomposition(store, model)
+    assert sorted(sorted(table) for _, table in tables) == [["Book", "Course"], ["Course", "Teacher"]]
+    broken = dataset(ATTRIBUTES, ROWS[1:])
+    assert [sorted(table) for _, table in pp.fourth_nf_decomposition(broken, model)] == [sorted(ATTRIBUTES)]
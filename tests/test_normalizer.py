@@ -0,0 +1,35 @@
+"""
+The example table through every normal form: a lossless decomposition that loads into SQLite.
+"""
+import os
+
+import pytest
+
+import parser_projectf as pp
+from conftest import REPO, normalize_employees
+
+
+@pytest.mark.parametrize("normal_form", pp.NORMAL_FORMS)
+def test_example_table_decomposes_losslessly(tmp_path, normal_form):
+    store = pp.parse_dataset(os.path.join(REPO, "exampleInputTable.csv"), workers=1)
+    fds = pp.parse_functional_dependencies(os.path.join(REPO, "functional_dependencies.txt"))
+    mvds = pp.parse_mvd_dependencies(os.path.join(REPO, "mvd.txt")) if normal_form in ("4NF", "5NF") else ()
+    result = pp.Normalizer().normalize(store, pp.Schema(list(store.keys()), fds, mvds), normal_form)
+    if not result.tables:
+        return
+    assert result.verification['lossless']
+    result.write(str(tmp_path), sqlite_path=str(tmp_path / "out.db"))
+    assert result.sqlite_report['lossless']
+
+
+def test_runs_are_independent_and_write_nothing_until_asked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = pp.parse_dataset(os.path.join(REPO, "exampleInputTable.csv"), workers=1)
+    schema = pp.Schema.from_files(list(store.keys()), os.path.join(REPO, "functional_dependencies.txt"))
+    normalizer = pp.Normalizer()
+    first = normalizer.normalize(store, schema, "BCNF")
+    normalize_employees("3NF")
+    again = normalizer.normalize(store, schema, "BCNF")
+    assert again.queries == first.queries
+    assert [table.attributes for table in again.tables] == [table.attributes for table in first.tables]
+    assert os.listdir(tmp_path) == []
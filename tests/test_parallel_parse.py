@@ -0,0 +1,30 @@
+"""
+The memory-mapped parallel CSV reader against the serial one, with chunks cut inside quoted fields.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import EMPLOYEE_HEADER, EMPLOYEE_ROWS, rows_of, write_csv
+
+
+@pytest.mark.parametrize("chunk_bytes", [5, 64, 256, 1 << 20])
+def test_parallel_parse_matches_serial(tmp_path, chunk_bytes):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, EMPLOYEE_HEADER, EMPLOYEE_ROWS * 40)
+    serial = pp.parse_dataset(path, workers=1)
+    parallel = pp.parse_dataset_parallel(path, workers=2, chunk_bytes=chunk_bytes)
+    assert list(parallel.keys()) == list(serial.keys())
+    assert rows_of(parallel) == rows_of(serial)
+
+
+def test_large_files_take_the_parallel_reader(tmp_path, monkeypatch):
+    path = str(tmp_path / "input.csv")
+    write_csv(path, EMPLOYEE_HEADER, EMPLOYEE_ROWS)
+    calls = []
+    monkeypatch.setattr(pp, "parse_dataset_parallel", lambda file_path, workers: calls.append(workers))
+    pp.parse_dataset(path, workers=2)
+    assert calls == []
+    monkeypatch.setattr(pp, "PARALLEL_PARSE_BYTES", 1)
+    pp.parse_dataset(path, workers=2)
+    pp.parse_dataset(path, workers=1)
+    assert calls == [2]
@@ -0,0 +1,51 @@
+"""
+The on-disk parse cache: who may write its entries, what keys them and what a cached run reuses.
+"""
+import os
+
+import parser_projectf as pp
+from conftest import REPO
+
+
+def test_parse_cache_only_reads_private_entries(tmp_path):
+    cache = pp.ParseCache(str(tmp_path / "cache"))
+    key = cache.key('test', [])
+    cache.put(key, [1, 2])
+    assert cache.get(key) == [1, 2]
+    os.chmod(os.path.join(cache.directory, key + '.pickle'), 0o666)
+    assert cache.get(key) is None
+    os.chmod(os.path.join(cache.directory, key + '.pickle'), 0o600)
+    os.chmod(cache.directory, 0o777)
+    assert cache.get(key) is None
+
+
+def test_parse_cache_is_keyed_by_the_inputs(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("A\n1\n")
+    first = pp.ParseCache.key('profiles', [str(path)], 100)
+    assert pp.ParseCache.key('profiles', [str(path)], None) != first
+    path.write_text("A\n12\n")
+    assert pp.ParseCache.key('profiles', [str(path)], 100) != first
+
+
+def test_old_entries_are_pruned(tmp_path):
+    cache = pp.ParseCache(str(tmp_path / "cache"), max_entries=3)
+    for i in range(5):
+        cache.put(f"key{i}", i)
+        os.utime(os.path.join(cache.directory, f"key{i}.pickle"), ns=(i * 10**9, i * 10**9))
+    assert sorted(os.listdir(cache.directory)) == ["key2.pickle", "key3.pickle", "key4.pickle"]
+
+
+def test_a_cached_run_matches_a_fresh_one(tmp_path, monkeypatch):
+    job = {'data': os.path.join(REPO, "exampleInputTable.csv"), 'fds': os.path.join(REPO, "functional_dependencies.txt"),
+           'normal_form': "BCNF", 'output_dir': str(tmp_path / "out"), 'cache': True,
+           'cache_dir': str(tmp_path / "cache")}
+    first = pp.run_job(job)
+    entries = sorted(os.listdir(tmp_path / "cache"))
+    assert entries
+    def parse_again(path):
+        raise AssertionError("the cached FDs were parsed again")
+    monkeypatch.setattr(pp, "parse_functional_dependencies", parse_again)
+    again = pp.run_job(job)
+    assert again.queries == first.queries
+    assert sorted(os.listdir(tmp_path / "cache")) == entries
@@ -0,0 +1,54 @@
+"""
+Column typing: the tightest SQL type over every value, nullability and the cached profile of an encoded column.
+"""
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset
+
+
+@pytest.mark.parametrize("values, sql_type", [
+    (["1", "-20", "+300"], "INT"),
+    (["1", str(2**31)], "BIGINT"),
+    ([str(-2**63), "7"], "BIGINT"),
+    (["1", str(2**63)], "DECIMAL(19,0)"),
+    (["12", "3.5", "-0.125"], "DECIMAL(5,3)"),
+    (["2023-01-31", "1/1/2023", "12/30/2023"], "DATE"),
+    (["2023-02-30"], "VARCHAR(10)"),
+    (["1/1/2023", "5"], "VARCHAR(8)"),
+    (["5", "1/1/2023"], "VARCHAR(8)"),
+    (["007", "12"], "VARCHAR(3)"),
+    (["0", "0.5"], "DECIMAL(2,1)"),
+    (["1", "abc", "2"], "VARCHAR(3)"),
+    (["", "NULL"], "VARCHAR(255)"),
+])
+def test_profile_is_the_tightest_type_of_all_values(values, sql_type):
+    assert pp.ColumnProfile(values).sql_type == sql_type
+    assert pp.ColumnProfile(reversed(values)).sql_type == sql_type
+
+
+def test_one_odd_value_widens_the_whole_column():
+    values = [str(i) for i in range(1000)] + ["n/a"]
+    assert pp.profile_column(values).sql_type == "VARCHAR(3)"
+
+
+def test_null_markers_make_a_column_nullable():
+    profile = pp.ColumnProfile(["1", "", "2"])
+    assert profile.nullable and profile.sql_type == "INT"
+    assert not pp.ColumnProfile(["1", "2"]).nullable
+    assert pp.column_definition("A", ["1", ""]) == "A INT"
+    assert pp.column_definition("A", ["1", "2"]) == "A INT NOT NULL"
+
+
+def test_key_columns_keep_null_markers_as_text():
+    key = pp.ColumnProfile(["1", "", "NULL"]).not_null()
+    assert not key.nullable and key.sql_type == "VARCHAR(4)"
+    assert pp.ColumnProfile(["1", "2"]).not_null().sql_type == "INT"
+
+
+def test_encoded_columns_are_profiled_once_from_their_dictionary():
+    column = dataset(["A"], [("1",), ("2",), ("1",)])["A"]
+    profile = pp.profile_column(column)
+    assert profile.sql_type == "INT" and pp.profile_column(column) is profile
+    column.extend(["x"])
+    assert pp.profile_column(column).sql_type == "VARCHAR(1)"
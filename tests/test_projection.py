@@ -0,0 +1,23 @@
+"""
+Distinct projections of small random tables against a set of projected tuples.
+"""
+import random
+
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, projection, random_rows
+
+SEEDS = range(60)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_project_distinct_matches_set_projection(seed):
+    attributes, rows = random_rows(seed)
+    rng = random.Random(seed)
+    table = rng.sample(attributes, rng.randint(1, len(attributes)))
+    projected = pp.project_distinct(dataset(attributes, rows), table)
+    assert list(projected.keys()) == table
+    projected_rows = list(zip(*(list(projected[attr]) for attr in table)))
+    assert len(projected_rows) == len(set(projected_rows))
+    assert set(projected_rows) == projection(attributes, rows, table)
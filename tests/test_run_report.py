@@ -0,0 +1,43 @@
+"""
+Stage timing and the JSON run report.
+"""
+import json
+import os
+
+import pytest
+
+import parser_projectf as pp
+from conftest import REPO
+
+
+def test_stage_recorder_reports_while_running():
+    recorder = pp.StageRecorder(trace_memory=False)
+    assert recorder.report() == {'stages': []}
+    with recorder:
+        with recorder.stage('work', rows=3):
+            pass
+        running = recorder.report()
+    assert [stage['name'] for stage in running['stages']] == ['work']
+    assert running['seconds'] <= recorder.report()['seconds']
+
+
+@pytest.mark.parametrize("profile", [False, True])
+def test_run_report_times_every_stage(tmp_path, profile):
+    job = {'data': os.path.join(REPO, "exampleInputTable.csv"), 'fds': os.path.join(REPO, "functional_dependencies.txt"),
+           'normal_form': "3NF", 'output_dir': str(tmp_path), 'report': True, 'profile': profile, 'trace_memory': False}
+    pp.run_job(job)
+    with open(tmp_path / pp.RUN_REPORT_PATH) as file:
+        report = json.load(file)
+    assert report['normal_form'] == "3NF" and report['stages']
+    assert all(stage['seconds'] >= 0 and 'peak_bytes' not in stage for stage in report['stages'])
+    assert report['seconds'] >= sum(stage['seconds'] for stage in report['stages'])
+    assert ('profile' in report) == profile
+    if profile:
+        assert report['profile']['functions'] and os.path.isfile(report['profile']['path'])
+
+
+def test_runs_without_a_report_record_nothing(tmp_path):
+    job = {'data': os.path.join(REPO, "exampleInputTable.csv"), 'fds': os.path.join(REPO, "functional_dependencies.txt"),
+           'normal_form': "3NF", 'output_dir': str(tmp_path)}
+    pp.run_job(job)
+    assert not os.path.exists(tmp_path / pp.RUN_REPORT_PATH)
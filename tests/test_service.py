@@ -0,0 +1,116 @@
+"""
+The normalization service, called directly and over HTTP.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import parser_projectf as pp
+from conftest import REPO
+
+ATTRIBUTES = ["StudentID", "FirstName", "Course", "Professor", "ProfessorEmail"]
+FDS = ["StudentID -> FirstName", "Course -> Professor", "Professor -> ProfessorEmail"]
+REQUEST = {'attributes': ATTRIBUTES, 'functional_dependencies': FDS}
+
+
+@pytest.fixture(scope="module")
+def url():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    threading.Thread(target=pp.serve, args=(pp.NormalizationService(1 << 20), "127.0.0.1", port),
+                     daemon=True).start()
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/stats")
+            break
+        except OSError:
+            time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def post(url, path, body):
+    request = urllib.request.Request(url + path, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_analyze_reports_keys_cover_and_normal_form():
+    analysis = pp.NormalizationService().analyze(REQUEST)
+    assert analysis['candidate_keys'] == [["StudentID", "Course"]]
+    assert analysis['normal_form'] == "1NF"
+    assert "Course -> Professor" in analysis['minimal_cover']
+
+
+def test_equivalent_requests_share_cached_analysis():
+    service = pp.NormalizationService()
+    first = service.normalize(dict(REQUEST, normal_form="3NF"))
+    second = service.normalize(dict(REQUEST, normal_form="3NF", functional_dependencies=FDS[::-1]))
+    assert first == second
+    assert service.stats()['hits'] >= 1
+
+
+def test_normalize_plans_tables_without_data():
+    result = pp.NormalizationService().normalize(dict(REQUEST, normal_form="BCNF"))
+    assert sorted(sorted(table['attributes']) for table in result['tables']) == [
+        ["Course", "Professor"], ["Course", "StudentID"], ["FirstName", "StudentID"], ["Professor", "ProfessorEmail"]]
+
+
+def test_normalize_with_data_verifies_the_decomposition():
+    request = {'attributes': ["StudentID", "FirstName", "LastName", "Course", "Professor", "ProfessorEmail",
+                              "CourseStart", "CourseEnd"],
+               'functional_dependencies': pp.parse_functional_dependencies(
+                   os.path.join(REPO, "functional_dependencies.txt")),
+               'normal_form': "3NF", 'data': os.path.join(REPO, "exampleInputTable.csv")}
+    result = pp.NormalizationService().normalize(request)
+    assert result['verification']['lossless']
+    assert all(table['rows'] > 0 for table in result['tables'])
+
+
+@pytest.mark.parametrize("extra", [
+    {'functional_dependencies': FDS + ["Foo -> Bar"]},
+    {'multivalued_dependencies': ["Course ->> Room"]},
+    {'candidate_keys': [["StudentID", "Term"]]},
+])
+def test_schema_rejects_unknown_attributes(extra):
+    with pytest.raises(ValueError, match="Unknown attributes"):
+        pp.NormalizationService().normalize(dict(REQUEST, **extra))
+
+
+def test_closure_rejects_unknown_attributes():
+    service = pp.NormalizationService()
+    assert service.closure(dict(REQUEST, closure_of=["Course"]))['closure'] == [
+        "Course", "Professor", "ProfessorEmail"]
+    with pytest.raises(ValueError):
+        service.closure(dict(REQUEST, closure_of=["Course", "Nope"]))
+
+
+def test_http_routes(url):
+    status, body = post(url, "/normalize", dict(REQUEST, normal_form="3NF"))
+    assert status == 200 and len(body['tables']) == 4
+    status, body = post(url, "/closure", dict(REQUEST, closure_of=["StudentID"]))
+    assert status == 200 and body['closure'] == ["StudentID", "FirstName"]
+    assert post(url, "/nowhere", {})[0] == 404
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/normalize", dict(REQUEST, functional_dependencies=FDS + ["Foo -> Bar"])),
+    ("/normalize", dict(REQUEST, functional_dependencies=["A -> B -> C"])),
+    ("/normalize", dict(REQUEST, normal_form="6NF")),
+    ("/normalize", dict(REQUEST, normal_form="4NF")),
+    ("/closure", dict(REQUEST, closure_of=["Nope"])),
+    ("/analyze", {}),
+])
+def test_http_errors_are_client_errors(url, path, body):
+    status, response = post(url, path, body)
+    assert status == 400
+    assert response['error']
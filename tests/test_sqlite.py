@@ -0,0 +1,16 @@
+"""
+Decompositions loaded into SQLite and rejoined there, empty values included.
+"""
+import pytest
+
+from conftest import EMPLOYEE_ROWS, normalize_employees
+
+
+@pytest.mark.parametrize("normal_form", ["2NF", "3NF", "BCNF"])
+def test_sqlite_rejoin_is_lossless_with_empty_values(tmp_path, normal_form):
+    result = normalize_employees(normal_form)
+    result.write(str(tmp_path), sqlite_path=str(tmp_path / "out.db"))
+    report = result.sqlite_report
+    assert report['lossless']
+    assert report['joined_rows'] == report['source_rows'] == len(EMPLOYEE_ROWS)
+    assert report['rows'] == sum(table.data.row_count for table in result.tables)
@@ -0,0 +1,34 @@
+"""
+FD validation: the process pool against the in-process check, and when the pool is used at all.
+"""
+import concurrent.futures
+
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, random_rows
+
+SEEDS = range(20)
+
+
+def fds_of(attributes):
+    return [f"{lhs} -> {rhs}" for lhs in attributes for rhs in attributes if lhs != rhs] + [
+        f"{', '.join(attributes[:2])} -> {attributes[-1]}"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_pool_matches_the_in_process_check(seed, monkeypatch):
+    attributes, rows = random_rows(seed, max_rows=40)
+    store = dataset(attributes, rows)
+    expected = pp.validate_functional_dependencies(store, fds_of(attributes), workers=1)
+    monkeypatch.setattr(pp, "PARALLEL_VALIDATION_ROWS", 0)
+    assert pp.validate_functional_dependencies(store, fds_of(attributes), workers=2) == expected
+
+
+def test_small_tables_do_not_start_a_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_pool)
+    store = dataset(["A", "B"], [("1", "x"), ("1", "y"), ("2", "z")])
+    violations = pp.validate_functional_dependencies(store, ["A -> B", "B -> A"], workers=4)
+    assert violations["A -> B"]['rows'] == 1 and violations["B -> A"]['rows'] == 0
@@ -0,0 +1,50 @@
+"""
+Lossless-join and dependency-preservation checks: the chase on textbook decompositions and a natural join of random tables.
+"""
+import json
+
+import pytest
+
+import parser_projectf as pp
+from conftest import dataset, natural_join, projection, random_rows
+
+SEEDS = range(60)
+
+
+@pytest.mark.parametrize("normal_form", ["3NF", "BCNF"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_decomposition_of_discovered_fds_rejoins_to_the_table(seed, normal_form):
+    attributes, rows = random_rows(seed)
+    fds = pp.discover_functional_dependencies(dataset(attributes, rows), max_lhs=None)
+    if normal_form == "3NF":
+        tables = pp.synthesize_3nf(fds, attributes)
+    else:
+        tables = pp.bcnf_decomposition(fds, attributes)
+    projections = [(table, projection(attributes, rows, table)) for _, table in tables]
+    assert natural_join(attributes, projections) == set(rows)
+
+
+@pytest.mark.parametrize("components, lossless", [
+    ([["A", "B"], ["A", "C"]], True),
+    ([["A", "B"], ["B", "C"]], False),
+    ([["A", "B"], ["A", "C"], ["B", "C"]], True),
+    ([["A"], ["B", "C"]], False),
+])
+def test_chase_decides_the_lossless_join(components, lossless):
+    assert pp.chase_lossless_join(["A", "B", "C"], components, ["A -> B"])[0] is lossless
+
+
+def test_chase_uses_join_dependencies():
+    components = [["A", "B"], ["B", "C"], ["A", "C"]]
+    assert not pp.chase_lossless_join(["A", "B", "C"], components, [])[0]
+    assert pp.chase_lossless_join(["A", "B", "C"], components, [], join_dependencies=[components])[0]
+
+
+def test_report_names_the_lost_dependencies(tmp_path):
+    path = str(tmp_path / "verification.json")
+    report = pp.verify_decomposition(["A", "B", "C"], {"cb": ["C", "B"], "ac": ["A", "C"]}, ["A, B -> C", "C -> B"],
+                                     report_path=path)
+    assert report['lossless'] and not report['dependency_preserving']
+    assert report['lost_dependencies'] == ["A, B -> C"]
+    with open(path) as file:
+        assert json.load(file)['tables'] == {"cb": ["C", "B"], "ac": ["A", "C"]}